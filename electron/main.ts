@@ -1,4 +1,6 @@
 import { app, BrowserWindow, ipcMain, Menu } from 'electron';
+import fs from 'fs';
+import os from 'os';
 import path from 'path';
 import { PythonManager } from './python/manager';
 
@@ -63,13 +65,72 @@ const setupIPC = () => {
     return pythonManager?.sendRequest('get_snapshots', { catalog, table });
   });
 
-  ipcMain.handle('catalog:getFiles', async (_event, catalog: string, table: string) => {
-    return pythonManager?.sendRequest('get_files', { catalog, table });
+  // query: offset, limit, sortBy, descending and filters — passed through to get_files
+  ipcMain.handle('catalog:getFiles', async (_event, catalog: string, table: string, query?: Record<string, unknown>) => {
+    return pythonManager?.sendRequest('get_files', { catalog, table, ...query });
+  });
+
+  ipcMain.handle('catalog:tableHealth', async (_event, catalog: string, table: string, targetFileSize?: number) => {
+    return pythonManager?.sendRequest('table_health', { catalog, table, targetFileSize });
+  });
+
+  ipcMain.handle('catalog:invalidateTable', async (_event, catalog: string, table?: string) => {
+    return pythonManager?.sendRequest('invalidate_table', { catalog, table });
+  });
+
+  // Re-crawl a catalog's namespace/table tree; changes arrive as 'catalog:changed'
+  ipcMain.handle('catalog:crawl', async (_event, catalog: string) => {
+    return pythonManager?.sendRequest('crawl_catalog', { catalog });
+  });
+
+  // Cancel an in-flight request started with a caller-supplied requestId
+  ipcMain.handle('python:cancel', async (_event, requestId: string) => {
+    return pythonManager?.cancelRequest(requestId);
   });
 
   // SQL operations
-  ipcMain.handle('sql:execute', async (_event, catalog: string, query: string) => {
-    return pythonManager?.sendRequest('execute_sql', { catalog, query });
+  // options: resultFormat, cursor, pageSize — passed through to execute_sql
+  ipcMain.handle('sql:execute', async (_event, catalog: string, query: string, requestId?: string, options?: Record<string, unknown>) => {
+    return pythonManager?.sendRequest('execute_sql', { ...options, catalog, query }, requestId);
+  });
+
+  // Server-side result cursors (execute_sql with cursor: true)
+  ipcMain.handle('sql:fetchRows', async (_event, cursor: string, offset: number, limit: number) => {
+    return pythonManager?.sendRequest('fetch_rows', { cursor, offset, limit });
+  });
+
+  ipcMain.handle('sql:sortResult', async (_event, cursor: string, keys: { column: string; descending?: boolean }[], limit?: number) => {
+    return pythonManager?.sendRequest('sort_result', { cursor, keys, limit });
+  });
+
+  ipcMain.handle('sql:filterResult', async (_event, cursor: string, expr: string, limit?: number) => {
+    return pythonManager?.sendRequest('filter_result', { cursor, expr, limit });
+  });
+
+  ipcMain.handle('sql:closeCursor', async (_event, cursor: string) => {
+    return pythonManager?.sendRequest('close_cursor', { cursor });
+  });
+
+  ipcMain.handle('sql:cacheStatus', async () => {
+    return pythonManager?.sendRequest('cache_status', {});
+  });
+
+  ipcMain.handle('sql:cacheClear', async (_event, target?: 'tables' | 'results' | 'all') => {
+    return pythonManager?.sendRequest('cache_clear', { target });
+  });
+
+  // Read an Arrow IPC result written by `execute_sql` with resultFormat "arrow",
+  // then release the backend's side-channel file
+  ipcMain.handle('sql:readArrowResult', async (_event, handle: string) => {
+    if (!/^[0-9a-f]{32}$/.test(handle)) {
+      throw new Error(`Invalid result handle: ${handle}`);
+    }
+    const filePath = path.join(os.homedir(), '.icetop', 'results', `${handle}.arrows`);
+    try {
+      return new Uint8Array(await fs.promises.readFile(filePath));
+    } finally {
+      await pythonManager?.sendRequest('release_result', { handle }).catch(() => {});
+    }
   });
 
   ipcMain.handle('sql:getHistory', async () => {
@@ -77,8 +138,8 @@ const setupIPC = () => {
   });
 
   // Chat operations
-  ipcMain.handle('chat:send', async (_event, catalog: string, message: string, sessionId: string) => {
-    return pythonManager?.sendRequest('chat', { catalog, message, sessionId });
+  ipcMain.handle('chat:send', async (_event, catalog: string, message: string, sessionId: string, requestId?: string) => {
+    return pythonManager?.sendRequest('chat', { catalog, message, sessionId }, requestId);
   });
 
   ipcMain.handle('chat:reset', async (_event, sessionId?: string) => {
@@ -90,8 +151,8 @@ const setupIPC = () => {
   });
 
   // Notebook operations
-  ipcMain.handle('notebook:executeCell', async (_event, catalog: string, code: string) => {
-    return pythonManager?.sendRequest('execute_cell', { catalog, code });
+  ipcMain.handle('notebook:executeCell', async (_event, catalog: string, code: string, requestId?: string) => {
+    return pythonManager?.sendRequest('execute_cell', { catalog, code }, requestId);
   });
 
   ipcMain.handle('notebook:listPackages', async () => {
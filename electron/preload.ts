@@ -12,17 +12,46 @@ contextBridge.exposeInMainWorld('icetop', {
       ipcRenderer.invoke('catalog:describeTable', catalog, table),
     getSnapshots: (catalog: string, table: string) =>
       ipcRenderer.invoke('catalog:getSnapshots', catalog, table),
-    getFiles: (catalog: string, table: string) =>
-      ipcRenderer.invoke('catalog:getFiles', catalog, table),
+    getFiles: (catalog: string, table: string, query?: Record<string, unknown>) =>
+      ipcRenderer.invoke('catalog:getFiles', catalog, table, query),
+    tableHealth: (catalog: string, table: string, targetFileSize?: number) =>
+      ipcRenderer.invoke('catalog:tableHealth', catalog, table, targetFileSize),
+    invalidateTable: (catalog: string, table?: string) =>
+      ipcRenderer.invoke('catalog:invalidateTable', catalog, table),
+    crawl: (catalog: string) => ipcRenderer.invoke('catalog:crawl', catalog),
+    // Namespaces whose children changed in a background crawl ("" = catalog root)
+    onChanged: (callback: (params: any) => void) => {
+      const handler = (_event: any, params: any) => callback(params);
+      ipcRenderer.on('catalog:changed', handler);
+      return () => ipcRenderer.removeListener('catalog:changed', handler);
+    },
   },
   sql: {
-    execute: (catalog: string, query: string) =>
-      ipcRenderer.invoke('sql:execute', catalog, query),
+    execute: (catalog: string, query: string, requestId?: string, options?: Record<string, unknown>) =>
+      ipcRenderer.invoke('sql:execute', catalog, query, requestId, options),
+    cancel: (requestId: string) => ipcRenderer.invoke('python:cancel', requestId),
+    readArrowResult: (handle: string) => ipcRenderer.invoke('sql:readArrowResult', handle),
     getHistory: () => ipcRenderer.invoke('sql:getHistory'),
+    fetchRows: (cursor: string, offset: number, limit: number) =>
+      ipcRenderer.invoke('sql:fetchRows', cursor, offset, limit),
+    sortResult: (cursor: string, keys: { column: string; descending?: boolean }[], limit?: number) =>
+      ipcRenderer.invoke('sql:sortResult', cursor, keys, limit),
+    filterResult: (cursor: string, expr: string, limit?: number) =>
+      ipcRenderer.invoke('sql:filterResult', cursor, expr, limit),
+    closeCursor: (cursor: string) => ipcRenderer.invoke('sql:closeCursor', cursor),
+    cacheStatus: () => ipcRenderer.invoke('sql:cacheStatus'),
+    cacheClear: (target?: 'tables' | 'results' | 'all') => ipcRenderer.invoke('sql:cacheClear', target),
+    // Row batches of an execute_sql call made with `stream: true`
+    onBatch: (callback: (params: any) => void) => {
+      const handler = (_event: any, params: any) => callback(params);
+      ipcRenderer.on('sql:batch', handler);
+      return () => ipcRenderer.removeListener('sql:batch', handler);
+    },
   },
   chat: {
-    send: (catalog: string, message: string, sessionId: string) =>
-      ipcRenderer.invoke('chat:send', catalog, message, sessionId),
+    send: (catalog: string, message: string, sessionId: string, requestId?: string) =>
+      ipcRenderer.invoke('chat:send', catalog, message, sessionId, requestId),
+    cancel: (requestId: string) => ipcRenderer.invoke('python:cancel', requestId),
     reset: (sessionId?: string) => ipcRenderer.invoke('chat:reset', sessionId),
     reload: () => ipcRenderer.invoke('chat:reload'),
     onProgress: (callback: (params: any) => void) => {
@@ -32,8 +61,9 @@ contextBridge.exposeInMainWorld('icetop', {
     },
   },
   notebook: {
-    executeCell: (catalog: string, code: string) =>
-      ipcRenderer.invoke('notebook:executeCell', catalog, code),
+    executeCell: (catalog: string, code: string, requestId?: string) =>
+      ipcRenderer.invoke('notebook:executeCell', catalog, code, requestId),
+    cancel: (requestId: string) => ipcRenderer.invoke('python:cancel', requestId),
     listPackages: () => ipcRenderer.invoke('notebook:listPackages'),
   },
   settings: {
@@ -1,5 +1,6 @@
 import { spawn, ChildProcess } from 'child_process';
 import path from 'path';
+import { StringDecoder } from 'string_decoder';
 import { v4 as uuidv4 } from 'uuid';
 
 type NotificationHandler = (notification: string, params: any) => void;
@@ -13,7 +14,10 @@ interface PendingRequest {
 export class PythonManager {
   private process: ChildProcess | null = null;
   private pendingRequests: Map<string, PendingRequest> = new Map();
-  private buffer: string = '';
+  // stdout chunks received since the last complete line; joined only once a
+  // newline arrives so a multi-megabyte response isn't re-concatenated per chunk
+  private pendingChunks: string[] = [];
+  private decoder: StringDecoder = new StringDecoder('utf8');
   private restartCount: number = 0;
   private maxRestarts: number = 3;
   private requestTimeoutMs: number = 60000; // 1 minute for long queries
@@ -59,9 +63,16 @@ export class PythonManager {
       });
     }
 
+    this.pendingChunks = [];
+    this.decoder = new StringDecoder('utf8');
     this.process.stdout?.on('data', (data: Buffer) => {
-      this.buffer += data.toString();
-      this.processBuffer();
+      // StringDecoder keeps multi-byte UTF-8 sequences intact across chunk boundaries
+      const text = this.decoder.write(data);
+      this.pendingChunks.push(text);
+      if (text.includes('\n')) {
+        const remainder = this.processBuffer(this.pendingChunks.join(''));
+        this.pendingChunks = remainder ? [remainder] : [];
+      }
     });
 
     this.process.stderr?.on('data', (data: Buffer) => {
@@ -96,17 +107,18 @@ export class PythonManager {
     this.rejectAll('Application shutting down');
   }
 
-  async sendRequest(method: string, params: Record<string, any>): Promise<any> {
+  async sendRequest(method: string, params: Record<string, any>, id: string = uuidv4()): Promise<any> {
     if (!this.process || !this.process.stdin) {
       throw new Error('Python backend is not running');
     }
 
-    const id = uuidv4();
     const request = JSON.stringify({ id, method, params }) + '\n';
 
     return new Promise((resolve, reject) => {
       const timeout = setTimeout(() => {
         this.pendingRequests.delete(id);
+        // Stop the backend from burning CPU on a result nobody will read
+        this.cancelRequest(id).catch(() => {});
         reject(new Error(`Request timeout: ${method}`));
       }, this.requestTimeoutMs);
 
@@ -115,9 +127,14 @@ export class PythonManager {
     });
   }
 
-  private processBuffer(): void {
-    const lines = this.buffer.split('\n');
-    this.buffer = lines.pop() || '';
+  async cancelRequest(id: string): Promise<boolean> {
+    const result = await this.sendRequest('cancel', { requestId: id });
+    return !!result?.cancelled;
+  }
+
+  private processBuffer(buffer: string): string {
+    const lines = buffer.split('\n');
+    const remainder = lines.pop() || '';
 
     for (const line of lines) {
       if (!line.trim()) continue;
@@ -145,6 +162,7 @@ export class PythonManager {
         console.error('[Python] Failed to parse response:', line);
       }
     }
+    return remainder;
   }
 
   private rejectAll(reason: string): void {
@@ -0,0 +1 @@
+# benchmarks package — offline harness driving Server.handle_request
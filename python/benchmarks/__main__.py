@@ -0,0 +1,73 @@
+"""
+Offline benchmark suite for the IceTop backend.
+
+    python -m benchmarks run --scale small --out base.json
+    python -m benchmarks run --scale small --out new.json
+    python -m benchmarks compare base.json new.json --threshold 0.1
+
+Run from the python/ directory. Exits non-zero when `compare` finds a
+regression beyond the threshold.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.dataset import SCALES
+from benchmarks.runner import DEFAULT_HOME, compare, format_report, run, run_scenario_in_process
+from benchmarks.scenarios import SCENARIOS
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="build the local catalog and run scenarios")
+    run_p.add_argument("--scale", choices=sorted(SCALES), default="small")
+    run_p.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                       help="scenario to run (repeatable; default: all)")
+    run_p.add_argument("--iterations", type=int, default=5)
+    run_p.add_argument("--warmup", type=int, default=1)
+    run_p.add_argument("--home", type=Path, default=DEFAULT_HOME,
+                       help="where bench datasets are built and reused")
+    run_p.add_argument("--rebuild", action="store_true", help="rebuild the dataset")
+    run_p.add_argument("--out", type=Path, help="write the JSON report here")
+
+    cmp_p = sub.add_parser("compare", help="compare two JSON reports")
+    cmp_p.add_argument("base", type=Path)
+    cmp_p.add_argument("new", type=Path)
+    cmp_p.add_argument("--threshold", type=float, default=0.10,
+                       help="relative worsening that counts as a regression")
+
+    # Internal: one scenario inside a fresh process (used by `run`)
+    one_p = sub.add_parser("_scenario")
+    one_p.add_argument("name", choices=sorted(SCENARIOS))
+    one_p.add_argument("--iterations", type=int, default=5)
+    one_p.add_argument("--warmup", type=int, default=1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "_scenario":
+        print(json.dumps(run_scenario_in_process(args.name, args.iterations, args.warmup)))
+        return 0
+
+    if args.command == "compare":
+        table, regressions = compare(
+            json.loads(args.base.read_text()), json.loads(args.new.read_text()), args.threshold
+        )
+        print(table)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        return 0
+
+    report = run(args.scale, args.scenario or list(SCENARIOS), args.iterations, args.warmup,
+                 home=args.home, rebuild=args.rebuild)
+    print(format_report(report))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
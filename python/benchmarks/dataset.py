@@ -0,0 +1,135 @@
+"""
+Synthetic benchmark catalog — a local PyIceberg SQL catalog (sqlite plus a
+local warehouse directory) with tables shaped like the ones that hurt:
+
+- events:      fact table, partitioned by day, joined against users
+- users:       small dimension table
+- wide:        many columns, few rows
+- small_files: one snapshot spread over many tiny files
+- snapshots:   long history of small appends
+
+Everything lives under one bench home directory. The backend runs with
+HOME pointed there, so ~/.pyiceberg.yaml and ~/.icetop are the bench's own.
+"""
+import datetime
+import json
+import shutil
+from pathlib import Path
+
+import pyarrow as pa
+
+# IceFrame always loads its catalog under this name, and PyIceberg's SQL
+# catalog scopes its rows by catalog name — the builder must match it.
+ICEFRAME_CATALOG_NAME = "iceframe"
+
+BENCH_CATALOG = "bench"
+NAMESPACE = "bench"
+
+SCALES = {
+    "small": {
+        "events_rows": 200_000, "event_days": 10, "users": 1_000,
+        "wide_rows": 5_000, "wide_cols": 200,
+        "small_files": 200, "snapshots": 100,
+    },
+    "medium": {
+        "events_rows": 2_000_000, "event_days": 30, "users": 10_000,
+        "wide_rows": 50_000, "wide_cols": 400,
+        "small_files": 1_000, "snapshots": 300,
+    },
+    "large": {
+        "events_rows": 20_000_000, "event_days": 90, "users": 100_000,
+        "wide_rows": 200_000, "wide_cols": 800,
+        "small_files": 5_000, "snapshots": 1_000,
+    },
+}
+
+_SPEC_FILE = "dataset.json"
+
+
+def _events(rows: int, days: int, users: int, offset: int = 0) -> pa.Table:
+    start = datetime.date(2026, 1, 1)
+    ids = range(offset, offset + rows)
+    return pa.table({
+        "event_id": pa.array(ids, pa.int64()),
+        "user_id": pa.array([i % users for i in ids], pa.int64()),
+        "event_date": pa.array([start + datetime.timedelta(days=i % days) for i in ids], pa.date32()),
+        "event_ts": pa.array(
+            [datetime.datetime(2026, 1, 1) + datetime.timedelta(seconds=i * 7) for i in ids],
+            pa.timestamp("us"),
+        ),
+        "kind": pa.array([("view", "click", "buy", "share")[i % 4] for i in ids], pa.string()),
+        "amount": pa.array([(i % 10_000) / 100 for i in ids], pa.float64()),
+    })
+
+
+def _build_table(catalog, name: str, data: pa.Table, partition_by: str | None = None):
+    identifier = f"{NAMESPACE}.{name}"
+    if catalog.table_exists(identifier):
+        catalog.drop_table(identifier)
+    table = catalog.create_table(identifier, schema=data.schema)
+    if partition_by:
+        with table.update_spec() as spec:
+            spec.add_identity(partition_by)
+    return table
+
+
+def build_dataset(home: Path, scale: str = "small", rebuild: bool = False) -> dict:
+    """Create (or reuse) the bench catalog under `home`; returns the dataset spec."""
+    from pyiceberg.catalog.sql import SqlCatalog
+
+    spec = {"scale": scale, **SCALES[scale]}
+    spec_path = home / _SPEC_FILE
+    if not rebuild and spec_path.exists() and json.loads(spec_path.read_text()) == spec:
+        return spec
+
+    if home.exists():
+        shutil.rmtree(home)
+    warehouse = home / "warehouse"
+    warehouse.mkdir(parents=True)
+    uri = f"sqlite:///{home / 'catalog.db'}"
+    catalog = SqlCatalog(ICEFRAME_CATALOG_NAME, uri=uri, warehouse=f"file://{warehouse}")
+    catalog.create_namespace(NAMESPACE)
+
+    events = _build_table(catalog, "events", _events(0, 1, 1), partition_by="event_date")
+    batch = 500_000
+    for offset in range(0, spec["events_rows"], batch):
+        rows = min(batch, spec["events_rows"] - offset)
+        events.append(_events(rows, spec["event_days"], spec["users"], offset))
+
+    users = pa.table({
+        "user_id": pa.array(range(spec["users"]), pa.int64()),
+        "country": pa.array([("US", "DE", "BR", "IN", "JP")[i % 5] for i in range(spec["users"])], pa.string()),
+        "signup_date": pa.array(
+            [datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 365) for i in range(spec["users"])],
+            pa.date32(),
+        ),
+    })
+    _build_table(catalog, "users", users).append(users)
+
+    wide = pa.table({
+        f"c{i:04d}": pa.array([(r * (i + 1)) % 1_000 for r in range(spec["wide_rows"])], pa.int64())
+        for i in range(spec["wide_cols"])
+    })
+    _build_table(catalog, "wide", wide).append(wide)
+
+    # One file per shard value, all in a single snapshot
+    shards = spec["small_files"]
+    small = pa.table({
+        "shard": pa.array([i % shards for i in range(shards * 10)], pa.int32()),
+        "value": pa.array(range(shards * 10), pa.int64()),
+    })
+    _build_table(catalog, "small_files", small, partition_by="shard").append(small)
+
+    history = _build_table(catalog, "snapshots", _events(0, 1, 1))
+    for i in range(spec["snapshots"]):
+        history.append(_events(10, 1, 10, offset=i * 10))
+
+    (home / ".pyiceberg.yaml").write_text(
+        "catalog:\n"
+        f"  {BENCH_CATALOG}:\n"
+        "    type: sql\n"
+        f"    uri: {uri}\n"
+        f"    warehouse: file://{warehouse}\n"
+    )
+    spec_path.write_text(json.dumps(spec))
+    return spec
@@ -0,0 +1,170 @@
+"""
+Benchmark runner — each scenario runs in a fresh backend process so import
+costs, caches and peak RSS don't leak from one scenario into the next.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.dataset import build_dataset
+from benchmarks.scenarios import SCENARIOS
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_HOME = Path(tempfile.gettempdir()) / "icetop-bench"
+
+
+def run_scenario_in_process(name: str, iterations: int, warmup: int) -> dict:
+    """Replay one scenario against an in-process Server (HOME is the bench home)."""
+    from handlers.metrics import peak_rss_bytes, percentile
+    from server import Server
+
+    requests = SCENARIOS[name]()
+    with open(os.devnull, "w") as devnull:
+        server = Server(stream=devnull)
+        server.handle_request({"id": "warm", "method": "ping", "params": {}})
+
+        def replay(record: bool, timings: list[float], errors: list[str]) -> int:
+            sent = 0
+            for method, params in requests:
+                start = time.perf_counter()
+                response = server.handle_request({"id": sent, "method": method, "params": params})
+                # Encoding is part of what the app pays for, so it's inside the timing
+                size = server.writer.write(response)
+                elapsed = (time.perf_counter() - start) * 1000
+                sent += 1
+                if record:
+                    timings.append(elapsed)
+                    sizes.append(size)
+                    if "error" in response and len(errors) < 5:
+                        errors.append(f"{method}: {response['error']['message']}")
+            return sent
+
+        sizes: list[int] = []
+        for _ in range(warmup):
+            replay(False, [], [])
+        server.metrics.reset()
+        rss_before = peak_rss_bytes()
+
+        timings: list[float] = []
+        errors: list[str] = []
+        start = time.perf_counter()
+        total = sum(replay(True, timings, errors) for _ in range(iterations))
+        wall_s = time.perf_counter() - start
+        rss_after = peak_rss_bytes()
+
+        phases = {
+            method: {phase: summary["p50Ms"] for phase, summary in stats["phases"].items()}
+            for method, stats in server.metrics.snapshot()["methods"].items()
+        }
+
+    ordered = sorted(timings)
+    return {
+        "requests": total,
+        "errors": errors,
+        "wallSeconds": round(wall_s, 3),
+        "throughputRps": round(total / wall_s, 2) if wall_s else None,
+        "p50Ms": percentile(ordered, 50),
+        "p95Ms": percentile(ordered, 95),
+        "p99Ms": percentile(ordered, 99),
+        "maxMs": round(ordered[-1], 2) if ordered else None,
+        "responseBytes": sum(sizes),
+        "peakRssBytes": rss_after,
+        "peakRssGrowthBytes": rss_after - rss_before if rss_before is not None else None,
+        "phaseP50Ms": phases,
+    }
+
+
+def _run_subprocess(home: Path, name: str, iterations: int, warmup: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks", "_scenario", name,
+         "--iterations", str(iterations), "--warmup", str(warmup)],
+        cwd=PYTHON_DIR,
+        env={**os.environ, "HOME": str(home), "USERPROFILE": str(home)},
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return {"failed": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "exit code " + str(proc.returncode)}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(scale: str, scenarios: list[str], iterations: int, warmup: int,
+        home: Path = DEFAULT_HOME, rebuild: bool = False) -> dict:
+    bench_home = home / scale
+    print(f"[bench] Preparing '{scale}' dataset in {bench_home}", file=sys.stderr)
+    spec = build_dataset(bench_home, scale, rebuild=rebuild)
+
+    import polars
+    import pyiceberg
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "polars": polars.__version__,
+            "pyiceberg": pyiceberg.__version__,
+            "iterations": iterations,
+            "warmup": warmup,
+            "dataset": spec,
+        },
+        "scenarios": {},
+    }
+    for name in scenarios:
+        print(f"[bench] Running {name}…", file=sys.stderr)
+        report["scenarios"][name] = _run_subprocess(bench_home, name, iterations, warmup)
+    return report
+
+
+# ── Reporting ──
+
+_COMPARED = [
+    # (metric, higher_is_better)
+    ("p50Ms", False),
+    ("p95Ms", False),
+    ("throughputRps", True),
+    ("peakRssBytes", False),
+]
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'scenario':<16}{'reqs':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak RSS MB':>13}"]
+    for name, result in report["scenarios"].items():
+        if "failed" in result:
+            lines.append(f"{name:<16}  FAILED: {result['failed']}")
+            continue
+        lines.append(
+            f"{name:<16}{result['requests']:>6}{result['throughputRps']:>10}"
+            f"{result['p50Ms']:>10}{result['p95Ms']:>10}{result['p99Ms']:>10}"
+            f"{(result['peakRssBytes'] or 0) / 2**20:>13.1f}"
+        )
+        for error in result["errors"]:
+            lines.append(f"{'':<16}  error: {error}")
+    return "\n".join(lines)
+
+
+def compare(base: dict, new: dict, threshold: float) -> tuple[str, list[str]]:
+    """Compare two reports; a metric regresses when it worsens by more than `threshold`."""
+    lines = [f"{'scenario':<16}{'metric':<16}{'base':>14}{'new':>14}{'change':>10}"]
+    regressions = []
+    for name, new_result in new["scenarios"].items():
+        base_result = base["scenarios"].get(name)
+        if not base_result or "failed" in base_result or "failed" in new_result:
+            continue
+        for metric, higher_is_better in _COMPARED:
+            before, after = base_result.get(metric), new_result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name}.{metric}")
+            lines.append(f"{name:<16}{metric:<16}{before:>14}{after:>14}{change:>+10.1%}{flag}")
+    return "\n".join(lines), regressions
@@ -0,0 +1,78 @@
+"""
+Benchmark scenarios — realistic RPC workloads, replayed through
+Server.handle_request exactly as the Electron app would send them.
+"""
+from benchmarks.dataset import BENCH_CATALOG, NAMESPACE
+
+TABLES = ["events", "users", "wide", "small_files", "snapshots"]
+
+
+def _sidebar_crawl() -> list[tuple[str, dict]]:
+    requests = [
+        ("list_catalogs", {}),
+        ("list_namespaces", {"catalog": BENCH_CATALOG}),
+        ("list_children", {"catalog": BENCH_CATALOG, "namespace": NAMESPACE}),
+    ]
+    # Clicking through every table: schema tab, then snapshots tab
+    for table in TABLES:
+        requests.append(("describe_table", {"catalog": BENCH_CATALOG, "table": f"{NAMESPACE}.{table}"}))
+        requests.append(("get_snapshots", {"catalog": BENCH_CATALOG, "table": f"{NAMESPACE}.{table}"}))
+    return requests
+
+
+def _describe_table() -> list[tuple[str, dict]]:
+    return [
+        ("describe_table", {"catalog": BENCH_CATALOG, "table": f"{NAMESPACE}.{table}"})
+        for table in TABLES
+    ]
+
+
+def _get_files() -> list[tuple[str, dict]]:
+    return [
+        ("get_files", {"catalog": BENCH_CATALOG, "table": f"{NAMESPACE}.{table}"})
+        for table in ("events", "small_files", "snapshots")
+    ]
+
+
+def _sql(query: str) -> tuple[str, dict]:
+    return ("execute_sql", {"catalog": BENCH_CATALOG, "query": query})
+
+
+def _execute_sql() -> list[tuple[str, dict]]:
+    events = f"{BENCH_CATALOG}.{NAMESPACE}.events"
+    users = f"{BENCH_CATALOG}.{NAMESPACE}.users"
+    return [
+        _sql(f"SELECT count(*) AS n FROM {events}"),
+        _sql(f"SELECT * FROM {events} WHERE event_date = '2026-01-03' LIMIT 100"),
+        _sql(f"SELECT kind, sum(amount) AS total FROM {events} GROUP BY kind"),
+        _sql(
+            f"SELECT u.country, count(*) AS n, avg(e.amount) AS avg_amount "
+            f"FROM {events} e JOIN {users} u ON e.user_id = u.user_id "
+            f"GROUP BY u.country ORDER BY n DESC"
+        ),
+        _sql(f"SELECT c0000, c0001, c0199 FROM {BENCH_CATALOG}.{NAMESPACE}.wide WHERE c0000 < 100"),
+        _sql(f"SELECT shard, count(*) AS n FROM {BENCH_CATALOG}.{NAMESPACE}.small_files GROUP BY shard"),
+    ]
+
+
+def _large_result() -> list[tuple[str, dict]]:
+    return [_sql(f"SELECT * FROM {BENCH_CATALOG}.{NAMESPACE}.events LIMIT 100000")]
+
+
+def _notebook() -> list[tuple[str, dict]]:
+    cells = [
+        f'_ = ice.read_table("{NAMESPACE}.users")',
+        f'_ = ice.read_table("{NAMESPACE}.events", limit=10000)',
+        "print(_.group_by('kind').len())",
+    ]
+    return [("execute_cell", {"catalog": BENCH_CATALOG, "code": code}) for code in cells]
+
+
+SCENARIOS = {
+    "sidebar_crawl": _sidebar_crawl,
+    "describe_table": _describe_table,
+    "get_files": _get_files,
+    "execute_sql": _execute_sql,
+    "large_result": _large_result,
+    "notebook": _notebook,
+}
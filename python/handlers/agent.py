@@ -7,7 +7,11 @@ import os
 from pathlib import Path
 from typing import Any
 
+from handlers.context import RequestCancelled, check_cancelled
 from handlers.iceframe_loader import get_iceframe
+from handlers.metrics import phase
+from handlers.results import to_columnar
+from handlers.table_metadata import load_table
 
 CONFIG_PATH = Path.home() / ".icetop" / "config.json"
 
@@ -138,6 +142,7 @@ Guidelines:
 - Use describe_table to see column names and types before writing SQL.
 - Use read_table for simple data retrieval. Use query_sql for complex analytics.
 - For read_table, always set a reasonable limit (50 unless the user asks for more).
+- Data results are columnar: `data[i]` holds every value of `columns[i]`.
 - Present data in clean, readable markdown tables.
 - When showing query results, include the SQL you ran.
 - Be concise in your explanations.
@@ -186,12 +191,10 @@ def _list_namespaces_recursive(ice, parent=None) -> list[str]:
     return result
 
 
-def execute_tool(ice, tool_name: str, args: dict, progress_cb=None) -> str:
-    """Execute a tool and return the result as a JSON string."""
-    if progress_cb:
-        progress_cb({"type": "tool_start", "tool": tool_name, "args": args})
-
+def _run_tool(catalog: str, tool_name: str, args: dict) -> str:
+    """Run one tool; errors come back as a JSON error for the model to read."""
     try:
+        ice = get_iceframe(catalog)
         if tool_name == "list_namespaces":
             parent = args.get("parent")
             ns_list = _list_namespaces_recursive(ice, parent)
@@ -204,7 +207,7 @@ def execute_tool(ice, tool_name: str, args: dict, progress_cb=None) -> str:
 
         elif tool_name == "describe_table":
             table_name = args["table"]
-            tbl = ice.get_table(table_name)
+            tbl = load_table(catalog, table_name)
             schema = tbl.schema()
             columns = [
                 {"name": f.name, "type": str(f.field_type), "required": f.required, "doc": f.doc}
@@ -220,28 +223,16 @@ def execute_tool(ice, tool_name: str, args: dict, progress_cb=None) -> str:
             filter_expr = args.get("filter_expr")
             limit = min(args.get("limit", 50), 200)
             df = ice.read_table(table_name, columns=columns, filter_expr=filter_expr, limit=limit)
-            import datetime, decimal
-            rows = df.to_dicts()
-            # Sanitize non-serializable types
-            for row in rows:
-                for k, v in row.items():
-                    if isinstance(v, (datetime.date, datetime.datetime)):
-                        row[k] = v.isoformat()
-                    elif isinstance(v, decimal.Decimal):
-                        row[k] = float(v)
-                    elif isinstance(v, bytes):
-                        row[k] = v.decode('utf-8', errors='replace')
-            result = json.dumps({"columns": df.columns, "rows": rows, "rowCount": len(df)})
+            result = json.dumps({**to_columnar(df), "rowCount": df.height})
 
         elif tool_name == "query_sql":
             sql = args["sql"]
             df = ice.query_datafusion(sql)
-            rows = df.to_dicts()
-            result = json.dumps({"columns": df.columns, "rows": rows[:200], "rowCount": len(rows)})
+            result = json.dumps({**to_columnar(df.head(200)), "rowCount": df.height})
 
         elif tool_name == "get_snapshots":
             table_name = args["table"]
-            tbl = ice.get_table(table_name)
+            tbl = load_table(catalog, table_name)
             snapshots = []
             for snap in tbl.metadata.snapshots:
                 snapshots.append({
@@ -253,7 +244,7 @@ def execute_tool(ice, tool_name: str, args: dict, progress_cb=None) -> str:
 
         elif tool_name == "get_table_stats":
             table_name = args["table"]
-            tbl = ice.get_table(table_name)
+            tbl = load_table(catalog, table_name)
             current = tbl.current_snapshot()
             stats = {
                 "table": table_name,
@@ -274,6 +265,18 @@ def execute_tool(ice, tool_name: str, args: dict, progress_cb=None) -> str:
     except Exception as e:
         result = json.dumps({"error": str(e)})
 
+    return result
+
+
+def execute_tool(catalog: str, tool_name: str, args: dict, progress_cb=None) -> str:
+    """Execute a tool and return the result as a JSON string."""
+    check_cancelled()
+    if progress_cb:
+        progress_cb({"type": "tool_start", "tool": tool_name, "args": args})
+
+    with phase(f"tool:{tool_name}"):
+        result = _run_tool(catalog, tool_name, args)
+
     if progress_cb:
         progress_cb({"type": "tool_done", "tool": tool_name})
 
@@ -315,6 +318,23 @@ def _get_config() -> dict:
     return config
 
 
+# Import name of each provider's SDK, for background prewarming
+_PROVIDER_SDK_MODULES = {
+    "openai": "openai",
+    "anthropic": "anthropic",
+    "gemini": "google.generativeai",
+    "google": "google.generativeai",
+}
+
+
+def provider_sdk_module() -> str | None:
+    """The SDK module the configured provider will import on its first chat turn."""
+    config = _get_config()
+    if not config["apiKey"]:
+        return None
+    return _PROVIDER_SDK_MODULES.get(config["provider"])
+
+
 def _openai_tools():
     """Convert tool defs to OpenAI format."""
     return [
@@ -330,7 +350,7 @@ def _openai_tools():
     ]
 
 
-def _run_openai(ice, messages: list, config: dict, progress_cb=None) -> str:
+def _run_openai(catalog: str, messages: list, config: dict, progress_cb=None) -> str:
     """Run the agent loop using OpenAI's API."""
     from openai import OpenAI
 
@@ -341,12 +361,14 @@ def _run_openai(ice, messages: list, config: dict, progress_cb=None) -> str:
         progress_cb({"type": "thinking", "message": "Thinking..."})
 
     while True:
-        response = client.chat.completions.create(
-            model=config["model"],
-            messages=messages,
-            tools=tools,
-            tool_choice="auto",
-        )
+        check_cancelled()
+        with phase("llm"):
+            response = client.chat.completions.create(
+                model=config["model"],
+                messages=messages,
+                tools=tools,
+                tool_choice="auto",
+            )
 
         choice = response.choices[0]
         msg = choice.message
@@ -371,7 +393,7 @@ def _run_openai(ice, messages: list, config: dict, progress_cb=None) -> str:
 
             for tc in msg.tool_calls:
                 args = json.loads(tc.function.arguments)
-                result = execute_tool(ice, tc.function.name, args, progress_cb)
+                result = execute_tool(catalog, tc.function.name, args, progress_cb)
                 messages.append({
                     "role": "tool",
                     "tool_call_id": tc.id,
@@ -399,7 +421,7 @@ def _anthropic_tools():
     ]
 
 
-def _run_anthropic(ice, messages: list, config: dict, progress_cb=None) -> str:
+def _run_anthropic(catalog: str, messages: list, config: dict, progress_cb=None) -> str:
     """Run the agent loop using Anthropic's API."""
     import anthropic
 
@@ -419,13 +441,15 @@ def _run_anthropic(ice, messages: list, config: dict, progress_cb=None) -> str:
         progress_cb({"type": "thinking", "message": "Thinking..."})
 
     while True:
-        response = client.messages.create(
-            model=config["model"],
-            max_tokens=4096,
-            system=system_text,
-            messages=user_messages,
-            tools=tools,
-        )
+        check_cancelled()
+        with phase("llm"):
+            response = client.messages.create(
+                model=config["model"],
+                max_tokens=4096,
+                system=system_text,
+                messages=user_messages,
+                tools=tools,
+            )
 
         # Check if the model wants to use tools
         if response.stop_reason == "tool_use":
@@ -447,7 +471,7 @@ def _run_anthropic(ice, messages: list, config: dict, progress_cb=None) -> str:
             tool_results = []
             for block in response.content:
                 if block.type == "tool_use":
-                    result = execute_tool(ice, block.name, block.input, progress_cb)
+                    result = execute_tool(catalog, block.name, block.input, progress_cb)
                     tool_results.append({
                         "type": "tool_result",
                         "tool_use_id": block.id,
@@ -472,7 +496,7 @@ def _run_anthropic(ice, messages: list, config: dict, progress_cb=None) -> str:
         return text
 
 
-def _run_google(ice, messages: list, config: dict, progress_cb=None) -> str:
+def _run_google(catalog: str, messages: list, config: dict, progress_cb=None) -> str:
     """Run the agent loop using Google Generative AI."""
     import google.generativeai as genai
 
@@ -525,7 +549,9 @@ def _run_google(ice, messages: list, config: dict, progress_cb=None) -> str:
 
     max_iterations = 10
     for _ in range(max_iterations):
-        response = chat.send_message(last_user)
+        check_cancelled()
+        with phase("llm"):
+            response = chat.send_message(last_user)
 
         # Check for function calls
         fc = response.candidates[0].content.parts
@@ -537,7 +563,7 @@ def _run_google(ice, messages: list, config: dict, progress_cb=None) -> str:
                 if hasattr(part, "function_call") and part.function_call.name:
                     fn_name = part.function_call.name
                     fn_args = dict(part.function_call.args) if part.function_call.args else {}
-                    result = execute_tool(ice, fn_name, fn_args, progress_cb)
+                    result = execute_tool(catalog, fn_name, fn_args, progress_cb)
                     fn_responses.append(
                         genai.protos.Part(
                             function_response=genai.protos.FunctionResponse(
@@ -565,10 +591,10 @@ def _run_google(ice, messages: list, config: dict, progress_cb=None) -> str:
 class IceTopAgent:
     def __init__(self, catalog: str):
         self.catalog = catalog
-        self.ice = get_iceframe(catalog)
         self.messages: list[dict] = [{"role": "system", "content": SYSTEM_PROMPT}]
 
     def chat(self, user_message: str, progress_cb=None) -> str:
+        turn_start = len(self.messages)
         self.messages.append({"role": "user", "content": user_message})
         config = _get_config()
 
@@ -578,13 +604,17 @@ class IceTopAgent:
         provider = config["provider"]
         try:
             if provider == "openai":
-                return _run_openai(self.ice, self.messages, config, progress_cb)
+                return _run_openai(self.catalog, self.messages, config, progress_cb)
             elif provider == "anthropic":
-                return _run_anthropic(self.ice, self.messages, config, progress_cb)
+                return _run_anthropic(self.catalog, self.messages, config, progress_cb)
             elif provider in ("gemini", "google"):
-                return _run_google(self.ice, self.messages, config, progress_cb)
+                return _run_google(self.catalog, self.messages, config, progress_cb)
             else:
                 return f"⚠️ Unknown provider: {provider}. Supported: openai, anthropic, gemini."
+        except RequestCancelled:
+            # Drop the half-finished turn (dangling tool calls would break the next one)
+            del self.messages[turn_start:]
+            raise
         except Exception as e:
             error_msg = f"⚠️ AI error: {str(e)}"
             self.messages.append({"role": "assistant", "content": error_msg})
@@ -1,85 +1,69 @@
 """
 Catalog handler — wraps IceFrame catalog operations.
 """
+from handlers.catalog_tree import CatalogTree, list_level, parse_table_names
 from handlers.iceframe_loader import get_iceframe, list_catalog_names
+from handlers.metrics import phase
+from handlers.table_metadata import invalidate, load_table
+
+# Files per get_files page
+DEFAULT_FILES_PAGE = 100
+MAX_FILES_PAGE = 10_000
+
+_FILE_SORT_KEYS = ("file_path", "file_format", "record_count", "file_size_in_bytes", "partition")
 
 
 class CatalogHandler:
+    def __init__(self, notify=None):
+        self._tree = CatalogTree(notify)
+
     def list_catalogs(self, params: dict) -> list[str]:
         """Return catalog names from pyiceberg.yaml."""
         return list_catalog_names()
 
     def list_namespaces(self, params: dict) -> list[str]:
-        catalog = params["catalog"]
-        ice = get_iceframe(catalog)
-        namespaces = ice.list_namespaces()
-        return [".".join(ns) if isinstance(ns, (tuple, list)) else str(ns) for ns in namespaces]
+        return self.list_children({**params, "namespace": ""})["namespaces"]
 
     def list_tables(self, params: dict) -> list[str]:
         catalog = params["catalog"]
         namespace = params["namespace"]
         ice = get_iceframe(catalog)
         tables = ice.list_tables(namespace)
-        return self._parse_table_names(tables)
+        return parse_table_names(tables)
 
     def list_children(self, params: dict) -> dict:
-        """List both sub-namespaces and tables under a namespace.
+        """List both sub-namespaces and tables under a namespace ("" = top level).
         Iceberg catalogs support hierarchical namespaces (e.g. db.schema.table).
+        Answered from the crawled tree when it has this level (see
+        handlers/catalog_tree.py); otherwise listed live and remembered.
         """
         catalog = params["catalog"]
         namespace = params["namespace"]
+        if not params.get("refresh"):
+            level = self._tree.lookup(catalog, namespace)
+            if level is not None:
+                return level
         ice = get_iceframe(catalog)
-
-        # Get sub-namespaces
-        sub_namespaces = []
-        try:
-            children_ns = ice.list_namespaces(namespace)
-            for ns in children_ns:
-                if isinstance(ns, (tuple, list)):
-                    # Return only the leaf name (last element)
-                    sub_namespaces.append(ns[-1])
-                else:
-                    name = str(ns)
-                    # Strip parent prefix if present
-                    if name.startswith(namespace + "."):
-                        name = name[len(namespace) + 1:]
-                    sub_namespaces.append(name)
-        except Exception:
-            pass  # Some catalogs don't support nested namespaces
-
-        # Get tables
-        tables = []
         try:
-            raw_tables = ice.list_tables(namespace)
-            tables = self._parse_table_names(raw_tables)
+            level = list_level(ice, namespace)
         except Exception:
-            pass
-
-        return {"namespaces": sub_namespaces, "tables": tables}
-
-    @staticmethod
-    def _parse_table_names(tables) -> list[str]:
-        result = []
-        for t in tables:
-            if isinstance(t, (tuple, list)):
-                result.append(t[-1])
-            elif isinstance(t, str):
-                if t.startswith("(") and t.endswith(")"):
-                    parts = t.strip("()").split(",")
-                    name = parts[-1].strip().strip("'\"")
-                    result.append(name)
-                else:
-                    result.append(t)
-            else:
-                result.append(str(t))
-        return result
+            if not namespace:
+                raise
+            # Show what could be listed, but don't cache a partial level
+            return list_level(ice, namespace, tables=False)
+        self._tree.remember(catalog, namespace, level)
+        return level
+
+    def crawl_catalog(self, params: dict) -> dict:
+        """Re-crawl a catalog's tree in the background; changes arrive as `catalog:changed`."""
+        catalog = params["catalog"]
+        return {"started": self._tree.crawl(catalog), **self._tree.status(catalog)}
 
     def describe_table(self, params: dict) -> dict:
         catalog = params["catalog"]
         table = params["table"]
-        ice = get_iceframe(catalog)
-        # Use the PyIceberg catalog directly to avoid IceFrame tuple issues
-        tbl = ice.catalog.load_table(tuple(table.split(".")))
+        with phase("catalog_load"):
+            tbl = load_table(catalog, table)
         schema = tbl.schema()
         columns = [
             {
@@ -166,37 +150,95 @@ class CatalogHandler:
         result = self.describe_table(params)
         return result.get("snapshots", [])
 
-    def get_files(self, params: dict) -> list[dict]:
-        """Get data files for a table."""
+    def table_health(self, params: dict) -> dict:
+        """Compaction debt of a table: small files, deletes, partition skew, manifests, growth.
+
+        params: targetFileSize (bytes) overrides the table's write.target-file-size-bytes.
+        """
+        from handlers.table_health import table_health
+
         catalog = params["catalog"]
         table = params["table"]
-        ice = get_iceframe(catalog)
-        try:
-            tbl = ice.catalog.load_table(tuple(table.split(".")))
-            if hasattr(tbl, "inspect") and hasattr(tbl.inspect, "data_files"):
-                df = tbl.inspect.data_files()
-                if hasattr(df, "to_pandas"):
-                    df = df.to_pandas()
-                
-                # Extract relevant fields
-                files = []
-                # df is a pandas DataFrame, we can iterate over records
-                for record in df.to_dict(orient="records"):
-                    raw_part = record.get("partition", {})
-                    part_dict = {}
-                    if isinstance(raw_part, dict):
-                        for k, v in raw_part.items():
-                            part_dict[str(k)] = str(v)
-                            
-                    files.append({
-                        "file_path": str(record.get("file_path", "")),
-                        "file_format": str(record.get("file_format", "")),
-                        "record_count": int(record.get("record_count", 0)),
-                        "file_size_in_bytes": int(record.get("file_size_in_bytes", 0)),
-                        "partition": part_dict
-                    })
-                return files
-        except Exception as e:
-            print(f"Error fetching files for {table}: {e}")
-            pass
-        return []
+        target = params.get("targetFileSize")
+        if target is not None and int(target) <= 0:
+            raise ValueError(f"targetFileSize must be positive, got {target}")
+        with phase("catalog_load"):
+            tbl = load_table(catalog, table)
+        with phase("manifest_scan"):
+            return table_health(catalog, table, tbl, int(target) if target is not None else None)
+
+    def invalidate_table(self, params: dict) -> dict:
+        """Forget cached table metadata (one table, or all of a catalog's) so the next load refetches it."""
+        return {"invalidated": invalidate(params.get("catalog"), params.get("table"))}
+
+    def get_files(self, params: dict) -> dict:
+        """One page of a table's data files, sorted and filtered server-side.
+
+        params: offset, limit, sortBy (file_path | file_format | record_count |
+        file_size_in_bytes | partition), descending, and the filters
+        partition ({field: value}), pathContains, search (path or partition
+        substring, case-insensitive), minSize, maxSize (bytes).
+        `total` counts the files matching the filters.
+        """
+        import polars as pl
+
+        from handlers.data_files import file_entries
+
+        catalog = params["catalog"]
+        table = params["table"]
+        offset = max(0, int(params.get("offset") or 0))
+        limit = min(MAX_FILES_PAGE, max(1, int(params.get("limit") or DEFAULT_FILES_PAGE)))
+        sort_by = params.get("sortBy")
+        if sort_by is not None and sort_by not in _FILE_SORT_KEYS:
+            raise ValueError(f"Cannot sort files by {sort_by!r}; use one of {', '.join(_FILE_SORT_KEYS)}")
+
+        with phase("catalog_load"):
+            tbl = load_table(catalog, table)
+        with phase("manifest_scan"):
+            entries = file_entries(catalog, table, tbl)
+
+        files = pl.from_arrow(entries.table).lazy().filter(pl.col("content") == 0)
+        total_files = files.select(pl.len()).collect().item()
+        wanted = {name: str(value) for name, value in (params.get("partition") or {}).items()}
+        if wanted:
+            matching = [
+                partition_id for partition_id, values in enumerate(entries.partitions)
+                if all(values.get(name) == value for name, value in wanted.items())
+            ]
+            files = files.filter(pl.col("partition_id").is_in(matching))
+        if params.get("pathContains"):
+            files = files.filter(pl.col("file_path").str.contains(params["pathContains"], literal=True))
+        if params.get("search"):
+            needle = params["search"].lower()
+            files = files.filter(
+                pl.col("file_path").str.to_lowercase().str.contains(needle, literal=True)
+                | pl.col("partition").str.to_lowercase().str.contains(needle, literal=True)
+            )
+        if params.get("minSize") is not None:
+            files = files.filter(pl.col("file_size_in_bytes") >= int(params["minSize"]))
+        if params.get("maxSize") is not None:
+            files = files.filter(pl.col("file_size_in_bytes") <= int(params["maxSize"]))
+
+        total = files.select(pl.len()).collect().item()
+        if sort_by:
+            # Partitions sort on their typed values, not their paths
+            column = "partition_rank" if sort_by == "partition" else sort_by
+            files = files.sort(column, descending=bool(params.get("descending")), maintain_order=True)
+        page = files.slice(offset, limit).collect()
+        return {
+            "files": [
+                {
+                    "file_path": row["file_path"],
+                    "file_format": row["file_format"],
+                    "record_count": row["record_count"],
+                    "file_size_in_bytes": row["file_size_in_bytes"],
+                    "partition": entries.partitions[row["partition_id"]],
+                }
+                for row in page.iter_rows(named=True)
+            ],
+            "total": total,
+            "totalFiles": total_files,
+            "offset": offset,
+            "limit": limit,
+            "snapshotId": str(entries.snapshot_id) if entries.snapshot_id is not None else None,
+        }
@@ -0,0 +1,229 @@
+"""
+Catalog tree — each catalog's namespace/table tree, crawled in the
+background and kept on disk.
+
+list_namespaces / list_children answer from this tree when it has the
+level asked for, so expanding a sidebar node doesn't wait on the catalog.
+A crawl walks every namespace down to `catalogTree.maxDepth` levels, with up
+to `catalogTree.concurrency` levels listed at once, then diffs the new tree
+against the old one and sends a `catalog:changed` notification naming the
+namespaces whose children changed ("" is the catalog root). Crawls start when a catalog is first
+browsed, when its tree is older than `catalogTree.refreshSeconds`, and on
+crawl_catalog.
+
+Trees are stored as JSON under ~/.icetop/catalog-tree/, tagged with a hash
+of the catalog's config so editing the catalog discards them.
+"""
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from handlers.iceframe_loader import get_catalog_config, get_iceframe
+from handlers.settings import CONFIG_DIR, DEFAULT_SETTINGS, load_settings
+
+CATALOG_TREE_DIR = CONFIG_DIR / "catalog-tree"
+
+
+def parse_table_names(tables) -> list[str]:
+    """Leaf table names from whatever list_tables returned (tuples or strings)."""
+    result = []
+    for t in tables:
+        if isinstance(t, (tuple, list)):
+            result.append(t[-1])
+        elif isinstance(t, str):
+            if t.startswith("(") and t.endswith(")"):
+                parts = t.strip("()").split(",")
+                name = parts[-1].strip().strip("'\"")
+                result.append(name)
+            else:
+                result.append(t)
+        else:
+            result.append(str(t))
+    return result
+
+
+def list_level(ice, namespace: str, tables: bool = True) -> dict:
+    """Sub-namespace leaf names and table names directly under `namespace` ("" = root).
+
+    With `tables=False` only the sub-namespaces are listed.
+    """
+    if not namespace:
+        namespaces = ice.list_namespaces()
+        return {
+            "namespaces": [".".join(ns) if isinstance(ns, (tuple, list)) else str(ns) for ns in namespaces],
+            "tables": [],
+        }
+    parent = tuple(namespace.split("."))
+    sub_namespaces = []
+    try:
+        for ns in ice.list_namespaces(namespace):
+            if isinstance(ns, (tuple, list)):
+                if len(ns) <= len(parent) or tuple(ns[:len(parent)]) != parent:
+                    continue  # the namespace itself, or not below it
+                # Only the leaf name (last element)
+                sub_namespaces.append(ns[-1])
+            else:
+                name = str(ns)
+                if name.startswith(namespace + "."):
+                    name = name[len(namespace) + 1:]
+                sub_namespaces.append(name)
+    except Exception:
+        pass  # Some catalogs don't support nested namespaces
+    return {
+        "namespaces": sub_namespaces,
+        "tables": parse_table_names(ice.list_tables(namespace)) if tables else [],
+    }
+
+
+def _config_hash(catalog: str) -> str:
+    config = json.dumps(get_catalog_config(catalog), sort_keys=True, default=str)
+    return hashlib.sha256(config.encode()).hexdigest()[:16]
+
+
+def _settings() -> dict:
+    return {**DEFAULT_SETTINGS["catalogTree"], **load_settings().get("catalogTree", {})}
+
+
+class CatalogTree:
+    def __init__(self, notify=None):
+        self._notify = notify
+        self._lock = threading.Lock()
+        # catalog -> {"configHash", "crawledAt", "levels": {namespace: level}}
+        self._trees: dict[str, dict] = {}
+        self._crawling: set[str] = set()
+
+    @staticmethod
+    def _path(catalog: str):
+        safe_name = re.sub(r"[^\w.-]", "_", catalog)
+        return CATALOG_TREE_DIR / f"{safe_name}.json"
+
+    def _tree(self, catalog: str) -> dict:
+        """The catalog's tree, read from disk on first use. Call with the lock held."""
+        config_hash = _config_hash(catalog)
+        tree = self._trees.get(catalog)
+        if tree is None or tree["configHash"] != config_hash:
+            tree = {"configHash": config_hash, "crawledAt": None, "levels": {}}
+            try:
+                saved = json.loads(self._path(catalog).read_text())
+                if saved.get("configHash") == config_hash:
+                    tree = saved
+            except (OSError, ValueError):
+                pass
+            self._trees[catalog] = tree
+        return tree
+
+    def _save(self, catalog: str, tree: dict):
+        try:
+            CATALOG_TREE_DIR.mkdir(parents=True, exist_ok=True)
+            path = self._path(catalog)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(tree))
+            tmp.replace(path)
+        except OSError as e:
+            print(f"[CatalogTree] Could not save tree of '{catalog}': {e}", file=sys.stderr)
+
+    def lookup(self, catalog: str, namespace: str) -> dict | None:
+        """The cached level, or None if it hasn't been listed yet. Refreshes stale trees."""
+        with self._lock:
+            tree = self._tree(catalog)
+            level = tree["levels"].get(namespace)
+            crawled_at = tree["crawledAt"]
+        refresh_s = float(_settings()["refreshSeconds"])
+        if crawled_at is None or (refresh_s > 0 and time.time() - crawled_at > refresh_s):
+            self.crawl(catalog)
+        return level
+
+    def remember(self, catalog: str, namespace: str, level: dict):
+        """Store a level listed live (before the first crawl reached it)."""
+        with self._lock:
+            tree = self._tree(catalog)
+            tree["levels"][namespace] = level
+            snapshot = json.loads(json.dumps(tree))
+        self._save(catalog, snapshot)
+
+    def crawl(self, catalog: str) -> bool:
+        """Start a background crawl of `catalog`; False if one is already running or crawling is off."""
+        if not _settings()["crawl"]:
+            return False
+        with self._lock:
+            if catalog in self._crawling:
+                return False
+            self._crawling.add(catalog)
+        threading.Thread(target=self._crawl, args=(catalog,), name=f"crawl-{catalog}", daemon=True).start()
+        return True
+
+    def _crawl(self, catalog: str):
+        started = time.perf_counter()
+        try:
+            ice = get_iceframe(catalog)
+            settings = _settings()
+            max_depth = max(1, int(settings["maxDepth"]))
+            levels, failed = {}, set()
+            with ThreadPoolExecutor(max_workers=max(1, int(settings["concurrency"])),
+                                    thread_name_prefix=f"crawl-{catalog}") as pool:
+                pending = {pool.submit(list_level, ice, ""): ""}
+                # Guards against catalogs that list a namespace under itself
+                # or under an ancestor, which would otherwise never finish
+                visited = {()}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        namespace = pending.pop(future)
+                        try:
+                            level = future.result()
+                        except Exception as e:
+                            print(f"[CatalogTree] Could not list '{catalog}.{namespace}': {e}", file=sys.stderr)
+                            failed.add(namespace)
+                            continue
+                        levels[namespace] = level
+                        parent = tuple(namespace.split(".")) if namespace else ()
+                        for child in level["namespaces"]:
+                            fqn = f"{namespace}.{child}" if namespace else child
+                            path = tuple(fqn.split("."))
+                            if not child or "" in path[len(parent):] or path in visited:
+                                continue
+                            visited.add(path)
+                            if len(path) > max_depth:
+                                print(f"[CatalogTree] Not crawling '{catalog}.{fqn}': deeper than "
+                                      f"catalogTree.maxDepth ({max_depth})", file=sys.stderr)
+                                continue
+                            pending[pool.submit(list_level, ice, fqn)] = fqn
+
+            with self._lock:
+                tree = self._tree(catalog)
+                old = tree["levels"]
+                # Keep what we knew below levels that failed to list this time
+                for namespace, level in old.items():
+                    if namespace not in levels and any(
+                        namespace == f or namespace.startswith(f + ".") or not f for f in failed
+                    ):
+                        levels[namespace] = level
+                changed = sorted(ns for ns in set(old) | set(levels) if old.get(ns) != levels.get(ns))
+                tree["levels"] = levels
+                tree["crawledAt"] = time.time()
+                snapshot = json.loads(json.dumps(tree))
+            self._save(catalog, snapshot)
+            print(f"[CatalogTree] Crawled '{catalog}': {len(levels)} namespaces, {len(changed)} changed, "
+                  f"{int((time.perf_counter() - started) * 1000)}ms", file=sys.stderr)
+            if changed and self._notify:
+                self._notify("catalog:changed", {"catalog": catalog, "namespaces": changed})
+        except Exception as e:
+            print(f"[CatalogTree] Crawl of '{catalog}' failed: {e}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self._crawling.discard(catalog)
+
+    def status(self, catalog: str) -> dict:
+        with self._lock:
+            tree = self._tree(catalog)
+            return {
+                "catalog": catalog,
+                "crawling": catalog in self._crawling,
+                "crawledAt": tree["crawledAt"],
+                "namespaces": len(tree["levels"]),
+                "tables": sum(len(level["tables"]) for level in tree["levels"].values()),
+            }
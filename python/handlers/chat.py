@@ -1,49 +1,53 @@
 """
 Chat handler — manages AI chat sessions with streaming progress notifications.
 """
-import json
-import sys
+import threading
 from handlers.agent import IceTopAgent
 
 
 class ChatHandler:
-    def __init__(self):
+    def __init__(self, notify=None):
+        # notify(notification, params) writes through the server's serialized writer
+        self._notify = notify
         # sessions: { session_id: IceTopAgent }
         self._sessions: dict[str, IceTopAgent] = {}
+        # One turn at a time per session — the agent's message list isn't thread-safe
+        self._session_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
 
     def send(self, params: dict) -> str:
         catalog = params["catalog"]
         message = params["message"]
         session_id = params.get("sessionId", "default")
 
-        if session_id not in self._sessions:
-            self._sessions[session_id] = IceTopAgent(catalog)
-
-        agent = self._sessions[session_id]
+        with self._lock:
+            if session_id not in self._sessions:
+                self._sessions[session_id] = IceTopAgent(catalog)
+            agent = self._sessions[session_id]
+            session_lock = self._session_locks.setdefault(session_id, threading.Lock())
 
         def progress_cb(event: dict):
-            """Write a JSON-RPC notification (no id) to stdout for progress events."""
-            notification = {
-                "notification": "chat:progress",
-                "params": {
-                    "sessionId": session_id,
-                    **event,
-                },
-            }
-            sys.stdout.write(json.dumps(notification) + "\n")
-            sys.stdout.flush()
-
-        return agent.chat(message, progress_cb=progress_cb)
+            """Emit a chat:progress notification for progress events."""
+            if self._notify:
+                self._notify("chat:progress", {"sessionId": session_id, **event})
+
+        with session_lock:
+            return agent.chat(message, progress_cb=progress_cb)
 
     def reset(self, params: dict) -> dict:
         session_id = params.get("sessionId")
-        if session_id and session_id in self._sessions:
-            del self._sessions[session_id]
-        else:
-            self._sessions.clear()
+        with self._lock:
+            if session_id and session_id in self._sessions:
+                del self._sessions[session_id]
+                self._session_locks.pop(session_id, None)
+            else:
+                self._sessions.clear()
+                self._session_locks.clear()
         return {"status": "ok"}
 
     def reload(self, params: dict) -> dict:
         """Clear all sessions so new credentials are picked up."""
-        self._sessions.clear()
+        with self._lock:
+            self._sessions.clear()
+            self._session_locks.clear()
         return {"status": "ok"}
@@ -0,0 +1,121 @@
+"""
+Request context — per-request state shared between the server and handlers.
+
+The server binds a RequestContext to the worker thread for the duration of
+each request. Handlers never receive it as an argument; they call
+check_cancelled() at safe points (between record batches, between agent
+tool calls) or current_request() when they need more. Sub-phase timings
+(handlers/metrics.py) accumulate here too.
+"""
+import contextvars
+import ctypes
+import threading
+from contextlib import contextmanager
+
+
+class RequestCancelled(BaseException):
+    """Raised inside a handler when its request was cancelled via the `cancel` RPC.
+
+    Derives from BaseException (like KeyboardInterrupt) so that the many
+    broad `except Exception` blocks in handlers and user notebook code
+    don't swallow it.
+    """
+
+
+class RequestContext:
+    def __init__(self, request_id, method: str):
+        self.request_id = request_id
+        self.method = method
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._interrupt_thread: int | None = None
+        # Sub-phase name -> wall-clock milliseconds during which it ran. A phase
+        # running on several threads at once (parallel table loads) counts
+        # once; different phases may still overlap each other.
+        self.phases: dict[str, float] = {}
+        self._phase_depth: dict[str, int] = {}
+        self._phase_since: dict[str, float] = {}
+        # Metrics sample recorded by the server once the handler returns
+        self.sample: dict | None = None
+
+    def enter_phase(self, name: str, now: float):
+        with self._lock:
+            depth = self._phase_depth.get(name, 0)
+            if depth == 0:
+                self._phase_since[name] = now
+            self._phase_depth[name] = depth + 1
+
+    def exit_phase(self, name: str, now: float):
+        with self._lock:
+            depth = self._phase_depth.get(name, 0) - 1
+            self._phase_depth[name] = max(0, depth)
+            if depth == 0:
+                elapsed = (now - self._phase_since.pop(name)) * 1000
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Mark the request cancelled; interrupt the worker if it runs arbitrary code."""
+        with self._lock:
+            self._cancelled.set()
+            if self._interrupt_thread is not None:
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                    ctypes.c_ulong(self._interrupt_thread), ctypes.py_object(RequestCancelled)
+                )
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to `timeout` seconds; return True if the request was cancelled."""
+        return self._cancelled.wait(timeout)
+
+    def check(self):
+        if self.cancelled:
+            raise RequestCancelled(f"Request {self.request_id} was cancelled")
+
+    @contextmanager
+    def interruptible(self):
+        """Let cancel() raise RequestCancelled asynchronously inside this block.
+
+        Used for code we can't instrument (notebook cells). The exception is
+        delivered between bytecodes, so a long-running C call finishes first.
+        """
+        with self._lock:
+            self.check()
+            self._interrupt_thread = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._interrupt_thread is not None and self.cancelled:
+                    # Drop an exception that was scheduled but not yet delivered
+                    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                        ctypes.c_ulong(self._interrupt_thread), None
+                    )
+                self._interrupt_thread = None
+            self.check()
+
+
+_current: contextvars.ContextVar[RequestContext | None] = contextvars.ContextVar(
+    "icetop_request", default=None
+)
+
+
+def bind_request(context: RequestContext) -> contextvars.Token:
+    return _current.set(context)
+
+
+def unbind_request(token: contextvars.Token):
+    _current.reset(token)
+
+
+def current_request() -> RequestContext | None:
+    return _current.get()
+
+
+def check_cancelled():
+    """Raise RequestCancelled if the request running on this thread was cancelled."""
+    context = _current.get()
+    if context is not None:
+        context.check()
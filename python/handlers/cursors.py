@@ -0,0 +1,115 @@
+"""
+Result cursors — query results held server-side and paged to the renderer.
+
+`execute_sql` with `cursor: true` keeps the result DataFrame here and
+returns only the first page plus a cursor id. The grid then pages, sorts
+and filters through fetch_rows / sort_result / filter_result, which run
+vectorized in Polars on the held frame instead of re-running the query.
+
+Cursors are dropped by close_cursor, or after `cache.cursorIdleSeconds`
+without access. At most `cache.maxCursors` are open; opening one more
+evicts the least recently used.
+"""
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import polars as pl
+
+from handlers.settings import DEFAULT_SETTINGS, load_settings
+
+DEFAULT_PAGE_SIZE = 500
+
+# How often the background sweeper looks for idle cursors
+_SWEEP_INTERVAL_S = 30
+
+
+class ResultCursor:
+    def __init__(self, df: pl.DataFrame, query: str):
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.base = df
+        self.view = df
+        self.sort: list[dict] = []
+        self.filter: str | None = None
+        self.last_access = time.monotonic()
+        self.lock = threading.Lock()
+
+    def refresh_view(self):
+        """Recompute `view` from the base frame, the filter and the sort keys."""
+        lf = self.base.lazy()
+        if self.filter:
+            lf = lf.filter(pl.sql_expr(self.filter))
+        if self.sort:
+            lf = lf.sort(
+                [key["column"] for key in self.sort],
+                descending=[bool(key.get("descending")) for key in self.sort],
+                nulls_last=True,
+                maintain_order=True,
+            )
+        self.view = lf.collect()
+
+    def describe(self) -> dict:
+        return {
+            "cursor": self.id,
+            "totalRows": self.view.height,
+            "baseRows": self.base.height,
+            "sort": self.sort,
+            "filter": self.filter,
+        }
+
+
+class CursorStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cursors: OrderedDict[str, ResultCursor] = OrderedDict()
+        self._stop = threading.Event()
+        self._sweeper: threading.Thread | None = None
+
+    @staticmethod
+    def _settings() -> dict:
+        return load_settings().get("cache", {})
+
+    def open(self, df: pl.DataFrame, query: str) -> ResultCursor:
+        cursor = ResultCursor(df, query)
+        max_cursors = int(self._settings().get("maxCursors", DEFAULT_SETTINGS["cache"]["maxCursors"]))
+        with self._lock:
+            self._cursors[cursor.id] = cursor
+            while len(self._cursors) > max(1, max_cursors):
+                evicted, _ = self._cursors.popitem(last=False)
+                print(f"[Cursors] Evicted cursor {evicted} (limit {max_cursors})", file=sys.stderr)
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(target=self._sweep_loop, name="cursor-sweeper", daemon=True)
+                self._sweeper.start()
+        return cursor
+
+    def get(self, cursor_id: str) -> ResultCursor:
+        with self._lock:
+            cursor = self._cursors.get(cursor_id)
+            if cursor is None:
+                raise ValueError(f"Unknown or expired cursor: {cursor_id}")
+            self._cursors.move_to_end(cursor_id)
+            cursor.last_access = time.monotonic()
+            return cursor
+
+    def close(self, cursor_id: str) -> bool:
+        with self._lock:
+            return self._cursors.pop(cursor_id, None) is not None
+
+    def sweep(self) -> int:
+        """Drop cursors idle for longer than the configured timeout."""
+        idle_s = float(self._settings().get("cursorIdleSeconds", DEFAULT_SETTINGS["cache"]["cursorIdleSeconds"]))
+        cutoff = time.monotonic() - idle_s
+        with self._lock:
+            expired = [cid for cid, c in self._cursors.items() if c.last_access < cutoff]
+            for cid in expired:
+                del self._cursors[cid]
+        if expired:
+            print(f"[Cursors] Expired {len(expired)} idle cursor(s)", file=sys.stderr)
+        return len(expired)
+
+    def _sweep_loop(self):
+        while not self._stop.wait(_SWEEP_INTERVAL_S):
+            self.sweep()
@@ -0,0 +1,186 @@
+"""
+Data files — every live file of a table snapshot as one Arrow table.
+
+get_files pages, sorts and filters this table instead of building
+`tbl.inspect.data_files()`, which decodes per-column metrics and readable
+bounds for every file and is far too slow for tables with millions of
+files. Only what the listings need is kept, one column each:
+
+    content, file_path, file_format, spec_id, partition_id, partition_rank,
+    partition, record_count, file_size_in_bytes
+
+`partition` is the Hive-style "field=value/..." path of the file's
+partition; `partition_id` indexes FileEntries.partitions, which holds each
+distinct partition once as a {field: value} dict. `partition_rank` orders
+partitions by spec and then by their typed values (nulls first), so
+shard=99 sorts before shard=199. Delete files are included
+(content 1 = position, 2 = equality deletes).
+
+Manifests are read concurrently, each interning its own partitions; the
+ids are merged once all are read. Results are kept per (catalog, table,
+snapshot) up to _MAX_CACHED_BYTES, so paging through a listing reads the
+manifests once.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pyarrow as pa
+
+# Manifests read at once
+_MANIFEST_WORKERS = 8
+
+# Listings kept for paging; least recently used are dropped first
+_MAX_CACHED_BYTES = 512 << 20
+
+_SCHEMA = pa.schema([
+    ("content", pa.int8()),
+    ("file_path", pa.string()),
+    ("file_format", pa.string()),
+    ("spec_id", pa.int32()),
+    ("partition_id", pa.int32()),
+    ("partition_rank", pa.int32()),
+    ("partition", pa.string()),
+    ("record_count", pa.int64()),
+    ("file_size_in_bytes", pa.int64()),
+])
+
+
+@dataclass
+class FileEntries:
+    snapshot_id: int | None
+    table: pa.Table
+    partitions: list[dict]
+
+
+_lock = threading.Lock()
+_cache: OrderedDict[tuple, FileEntries] = OrderedDict()
+
+
+class _Partitions:
+    """Interns partition values: one id, path and dict per distinct partition."""
+
+    def __init__(self, tbl):
+        self._schema = tbl.schema()
+        self._specs = tbl.metadata.specs()
+        self._types: dict[int, list] = {}
+        self._ids: dict[tuple, int] = {}
+        self._keys: list[tuple] = []
+        self.paths: list[str] = []
+        self.values: list[dict] = []
+
+    def _field_types(self, spec_id: int) -> list:
+        if spec_id not in self._types:
+            try:
+                self._types[spec_id] = [f.field_type for f in self._specs[spec_id].partition_type(self._schema).fields]
+            except Exception:
+                self._types[spec_id] = []  # spec refers to columns no longer in the schema
+        return self._types[spec_id]
+
+    def intern(self, key: tuple) -> int:
+        """Id of the (spec_id, raw values) partition `key`."""
+        partition_id = self._ids.get(key)
+        if partition_id is not None:
+            return partition_id
+        spec_id, raw = key
+        types = self._field_types(spec_id)
+        values = {}
+        for pos, field in enumerate(self._specs[spec_id].fields):
+            value = raw[pos]
+            try:
+                values[field.name] = field.transform.to_human_string(types[pos], value)
+            except Exception:
+                values[field.name] = "null" if value is None else str(value)
+        partition_id = self._ids[key] = len(self.values)
+        self._keys.append(key)
+        self.values.append(values)
+        self.paths.append("/".join(f"{name}={value}" for name, value in values.items()))
+        return partition_id
+
+    def ranks(self) -> list[int]:
+        """Each partition's position when ordered by spec and typed values, nulls first."""
+        def typed(partition_id: int) -> tuple:
+            spec_id, raw = self._keys[partition_id]
+            return spec_id, tuple((value is not None, value) for value in raw)
+
+        try:
+            order = sorted(range(len(self._keys)), key=typed)
+        except TypeError:
+            order = sorted(range(len(self.paths)), key=self.paths.__getitem__)  # values that don't compare
+        ranks = [0] * len(order)
+        for rank, partition_id in enumerate(order):
+            ranks[partition_id] = rank
+        return ranks
+
+
+def _read_manifest(tbl, manifest) -> tuple[dict, list[tuple]]:
+    """One manifest's columns, with partition ids local to it, and the partition key of each local id."""
+    files = [entry.data_file for entry in manifest.fetch_manifest_entry(tbl.io, discard_deleted=True)]
+    specs = tbl.metadata.specs()
+    local: dict[tuple, int] = {}
+    partition_ids = []
+    for data_file in files:
+        width = len(specs[data_file.spec_id].fields)
+        key = (data_file.spec_id, tuple(data_file.partition[pos] for pos in range(width)))
+        partition_ids.append(local.setdefault(key, len(local)))
+    columns = {
+        "content": [int(f.content) for f in files],
+        "file_path": [f.file_path for f in files],
+        "file_format": [str(f.file_format.value) for f in files],
+        "spec_id": [f.spec_id for f in files],
+        "partition_id": partition_ids,
+        "record_count": [f.record_count for f in files],
+        "file_size_in_bytes": [f.file_size_in_bytes for f in files],
+    }
+    return columns, list(local)
+
+
+def _build(tbl, snapshot) -> FileEntries:
+    manifests = snapshot.manifests(tbl.io) if snapshot is not None else []
+    with ThreadPoolExecutor(max_workers=_MANIFEST_WORKERS, thread_name_prefix="manifests") as pool:
+        parts = list(pool.map(lambda m: _read_manifest(tbl, m), manifests))
+
+    # Map each manifest's local partition ids onto the table-wide ones
+    partitions = _Partitions(tbl)
+    partition_ids = []
+    for part, keys in parts:
+        remap = pa.array([partitions.intern(key) for key in keys], type=pa.int32())
+        partition_ids.append(remap.take(pa.array(part["partition_id"], type=pa.int32())))
+    ranks = pa.array(partitions.ranks(), type=pa.int32())
+    paths = pa.array(partitions.paths, type=pa.string())
+
+    columns = {
+        "partition_id": pa.chunked_array(partition_ids, type=pa.int32()),
+        "partition_rank": pa.chunked_array([ranks.take(ids) for ids in partition_ids], type=pa.int32()),
+        "partition": pa.chunked_array([paths.take(ids) for ids in partition_ids], type=pa.string()),
+    }
+    for field in _SCHEMA:
+        if field.name not in columns:
+            columns[field.name] = pa.chunked_array(
+                [pa.array(part[field.name], type=field.type) for part, _ in parts], type=field.type,
+            )
+    table = pa.table({name: columns[name] for name in _SCHEMA.names}, schema=_SCHEMA)
+    snapshot_id = snapshot.snapshot_id if snapshot is not None else None
+    return FileEntries(snapshot_id, table.combine_chunks(), partitions.values)
+
+
+def file_entries(catalog: str, ref: str, tbl) -> FileEntries:
+    """All live files of `tbl`'s current snapshot, from the cache when already listed."""
+    snapshot = tbl.current_snapshot()
+    key = (catalog, ref, snapshot.snapshot_id if snapshot is not None else None)
+    with _lock:
+        entries = _cache.get(key)
+        if entries is not None:
+            _cache.move_to_end(key)
+            return entries
+
+    entries = _build(tbl, snapshot)
+    with _lock:
+        _cache[key] = entries
+        # A table's older snapshots won't be paged again
+        for old in [k for k in _cache if k[:2] == key[:2] and k != key]:
+            del _cache[old]
+        while len(_cache) > 1 and sum(e.table.nbytes for e in _cache.values()) > _MAX_CACHED_BYTES:
+            _cache.popitem(last=False)
+    return entries
@@ -0,0 +1,158 @@
+"""
+Disk table cache — scanned Iceberg data kept across restarts.
+
+Opt-in with settings `cache.diskCache`. Every scan the in-memory table
+cache stores (see handlers/table_cache.py) is also written as an
+uncompressed Arrow IPC file under ~/.icetop/cache/, named after the table,
+its snapshot/schema and the scan's pushdown. Files are written on a
+background thread, so storing a scan doesn't delay the query that read it.
+A later session that misses in memory memory-maps the file instead of
+downloading the data again.
+
+The directory is held to `cache.diskCacheBytes`, least recently used files
+first (reads bump a file's mtime). Writing a table's new snapshot deletes
+the files of its older ones.
+"""
+import hashlib
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+
+from handlers.settings import CONFIG_DIR, DEFAULT_SETTINGS, load_settings
+
+DISK_CACHE_DIR = CONFIG_DIR / "cache"
+
+
+def _digest(text: str, length: int) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:length]
+
+
+def _file_name(key: tuple) -> str:
+    """`<table>-<snapshot/schema>-<scan>.arrow` for a handlers.table_cache.scan_key.
+
+    Each part is a hex digest, so the name splits on "-" whatever the ids are.
+    """
+    catalog, ref, snapshot_id, schema_id = key[:4]
+    return (f"{_digest(f'{catalog}.{ref}', 16)}-{_digest(f'{snapshot_id}/{schema_id}', 16)}"
+            f"-{_digest(repr(key), 24)}.arrow")
+
+
+def _size(path: Path) -> int:
+    """Size of a cache file, 0 if it was evicted meanwhile."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+class DiskCache:
+    def __init__(self, directory: Path = DISK_CACHE_DIR):
+        self._dir = directory
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+        self.hits = 0
+
+    @staticmethod
+    def _settings() -> dict:
+        return {**DEFAULT_SETTINGS["cache"], **load_settings().get("cache", {})}
+
+    @property
+    def enabled(self) -> bool:
+        settings = self._settings()
+        return bool(settings["diskCache"]) and int(settings["diskCacheBytes"]) > 0
+
+    def get(self, key: tuple) -> pl.DataFrame | None:
+        if not self.enabled:
+            return None
+        path = self._dir / _file_name(key)
+        try:
+            # Not closed here: the table's buffers point into the mapping, which
+            # stays alive as long as they do
+            source = pa.memory_map(str(path))
+            table = pa.ipc.open_file(source).read_all()
+            path.touch()
+        except (OSError, pa.ArrowInvalid):
+            return None
+        with self._lock:
+            self.hits += 1
+        return pl.from_arrow(table)
+
+    def put(self, key: tuple, df: pl.DataFrame) -> bool:
+        """Queue `df` to be written under `key`; returns False if disabled or it doesn't fit."""
+        if not self.enabled:
+            return False
+        budget = int(self._settings()["diskCacheBytes"])
+        if df.estimated_size() > budget:
+            return False
+        self._writer.submit(self._write, key, df, budget)
+        return True
+
+    def _write(self, key: tuple, df: pl.DataFrame, budget: int):
+        name = _file_name(key)
+        table_prefix, version = name.split("-")[:2]
+        path = self._dir / name
+        # Unique temp name: the slow write happens outside the lock
+        tmp = self._dir / f"{name}.{uuid.uuid4().hex}.tmp"
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            df.write_ipc(tmp, compression="uncompressed")
+            with self._lock:
+                # A table that moved to a new snapshot/schema never hits its old files again
+                for old in self._dir.glob(f"{table_prefix}-*.arrow"):
+                    if old.name.split("-")[1] != version:
+                        old.unlink(missing_ok=True)
+                tmp.replace(path)
+                self._trim(budget, keep=path)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            print(f"[DiskCache] Could not write {name}: {e}", file=sys.stderr)
+
+    def _trim(self, budget: int, keep: Path | None = None):
+        files = sorted(self._dir.glob("*.arrow"), key=_mtime)
+        total = sum(_size(p) for p in files)
+        for old in files:
+            if total <= budget:
+                break
+            if old == keep:
+                continue
+            try:
+                size = old.stat().st_size
+                old.unlink()
+            except OSError:
+                continue  # still mapped elsewhere (Windows) — try again next time
+            total -= size
+
+    def clear(self) -> int:
+        """Delete every cached file; returns how many were removed."""
+        removed = 0
+        with self._lock:
+            for path in self._dir.glob("*.arrow"):
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def stats(self) -> dict:
+        files = list(self._dir.glob("*.arrow")) if self._dir.exists() else []
+        return {
+            "enabled": self.enabled,
+            "directory": str(self._dir),
+            "files": len(files),
+            "bytesOnDisk": sum(_size(p) for p in files),
+            "budgetBytes": int(self._settings()["diskCacheBytes"]),
+            "hits": self.hits,
+        }
@@ -1,49 +1,118 @@
 """
 Shared utility: loads catalog configs from ~/.pyiceberg.yaml
 and creates IceFrame instances.
+
+IceFrame (and with it PyIceberg and Polars) is imported on first use, so
+reading catalog names stays cheap during backend startup.
+
+The parsed YAML is cached and re-read only when the file's mtime or size
+changes (and re-parsed only when its content hash does). IceFrame instances
+remember the catalog config they were built from: editing one catalog
+rebuilds just that instance on next use, and removing it drops it.
 """
+import copy
+import hashlib
+import sys
+import threading
 import yaml
 from pathlib import Path
-from iceframe import IceFrame
-
-# ── Monkey-patch PyIceberg to tolerate unknown HTTP methods ──
-# Dremio's REST catalog returns endpoints with PUT/PATCH which PyIceberg's
-# HttpMethod enum doesn't include — crashing ConfigResponse validation.
-# We patch Endpoint.from_string to silently skip unknown methods.
-try:
-    from pyiceberg.catalog.rest import Endpoint, HttpMethod
-
-    _orig_from_string = Endpoint.from_string.__func__
-
-    @classmethod
-    def _safe_from_string(cls, endpoint: str):
-        elements = endpoint.strip().split(None, 1)
-        if len(elements) != 2:
-            raise ValueError(f"Invalid endpoint: {endpoint}")
-        method_str = elements[0].upper()
-        try:
-            HttpMethod(method_str)
-        except ValueError:
-            # Unknown HTTP method (e.g. PUT from Dremio) — use GET as fallback
-            # so the endpoint parses without crashing Pydantic validation
-            method_str = "GET"
-        return cls(http_method=HttpMethod(method_str), path=elements[1])
-
-    Endpoint.from_string = _safe_from_string
-except Exception:
-    pass  # If import paths change, silently continue
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from iceframe import IceFrame
 
 _CONFIG_PATH = Path.home() / ".pyiceberg.yaml"
-_instances: dict[str, IceFrame] = {}
+_iceframe_lock = threading.Lock()
+_iceframe_cls = None
+
+# (mtime_ns, size) and content hash of the parsed file, and what it held
+_config_lock = threading.Lock()
+_config_cache: tuple[tuple | None, str | None, dict] | None = None
+
+# catalog name -> (config it was built from, instance); per-catalog build
+# locks let two catalogs connect at once while requests for the same one wait
+_instances_lock = threading.Lock()
+_instances: dict[str, tuple[dict, "IceFrame"]] = {}
+_build_locks: dict[str, threading.Lock] = {}
+
+
+def _patch_pyiceberg_endpoints():
+    """Monkey-patch PyIceberg to tolerate unknown HTTP methods.
+
+    Dremio's REST catalog returns endpoints with PUT/PATCH which PyIceberg's
+    HttpMethod enum doesn't include — crashing ConfigResponse validation.
+    We patch Endpoint.from_string to silently skip unknown methods.
+    """
+    try:
+        from pyiceberg.catalog.rest import Endpoint, HttpMethod
+
+        @classmethod
+        def _safe_from_string(cls, endpoint: str):
+            elements = endpoint.strip().split(None, 1)
+            if len(elements) != 2:
+                raise ValueError(f"Invalid endpoint: {endpoint}")
+            method_str = elements[0].upper()
+            try:
+                HttpMethod(method_str)
+            except ValueError:
+                # Unknown HTTP method (e.g. PUT from Dremio) — use GET as fallback
+                # so the endpoint parses without crashing Pydantic validation
+                method_str = "GET"
+            return cls(http_method=HttpMethod(method_str), path=elements[1])
+
+        Endpoint.from_string = _safe_from_string
+    except Exception:
+        pass  # If import paths change, silently continue
+
+
+def ensure_iceframe():
+    """Import IceFrame and apply the PyIceberg patch (once). Returns the IceFrame class."""
+    global _iceframe_cls
+    with _iceframe_lock:
+        if _iceframe_cls is None:
+            from iceframe import IceFrame
+            _patch_pyiceberg_endpoints()
+            _iceframe_cls = IceFrame
+    return _iceframe_cls
 
 
 def load_pyiceberg_config() -> dict:
-    """Read ~/.pyiceberg.yaml and return the full config dict."""
-    if _CONFIG_PATH.exists():
-        with open(_CONFIG_PATH) as f:
-            return yaml.safe_load(f) or {}
-    return {}
+    """Return the parsed ~/.pyiceberg.yaml (cached; callers must not mutate it)."""
+    global _config_cache
+    try:
+        stat = _CONFIG_PATH.stat()
+        file_key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+    with _config_lock:
+        if _config_cache is not None and _config_cache[0] == file_key:
+            return _config_cache[2]
+        previous = _config_cache
+
+    config, digest = {}, None
+    if file_key is not None:
+        try:
+            raw = _CONFIG_PATH.read_bytes()
+        except OSError:
+            raw = b""
+        digest = hashlib.sha256(raw).hexdigest()
+        if previous is not None and previous[1] == digest:
+            config = previous[2]  # touched but unchanged
+        else:
+            config = yaml.safe_load(raw) or {}
+
+    with _config_lock:
+        _config_cache = (file_key, digest, config)
+    if previous is None or previous[2] is not config:
+        _drop_removed_catalogs(config)
+    return config
+
+
+def _drop_removed_catalogs(config: dict):
+    catalogs = config.get("catalog", {})
+    with _instances_lock:
+        for name in [n for n in _instances if n not in catalogs]:
+            del _instances[name]
 
 
 def list_catalog_names() -> list[str]:
@@ -61,15 +130,30 @@ def get_catalog_config(catalog_name: str) -> dict:
     return catalogs[catalog_name]
 
 
-def get_iceframe(catalog_name: str) -> IceFrame:
-    """Get or create a cached IceFrame instance for the given catalog."""
-    if catalog_name not in _instances:
-        catalog_config = get_catalog_config(catalog_name)
-        _instances[catalog_name] = IceFrame(catalog_config)
-    return _instances[catalog_name]
+def get_iceframe(catalog_name: str) -> "IceFrame":
+    """Get the IceFrame instance for a catalog, (re)building it if its config changed."""
+    catalog_config = get_catalog_config(catalog_name)
+    with _instances_lock:
+        entry = _instances.get(catalog_name)
+        if entry is not None and entry[0] == catalog_config:
+            return entry[1]
+        build_lock = _build_locks.setdefault(catalog_name, threading.Lock())
+    with build_lock:
+        with _instances_lock:
+            entry = _instances.get(catalog_name)
+            if entry is not None and entry[0] == catalog_config:
+                return entry[1]  # built by the request we waited for
+        if entry is not None:
+            print(f"[IceFrame] Config of catalog '{catalog_name}' changed; reconnecting", file=sys.stderr)
+        built_from = copy.deepcopy(catalog_config)
+        instance = ensure_iceframe()(copy.deepcopy(catalog_config))
+        with _instances_lock:
+            _instances[catalog_name] = (built_from, instance)
+        return instance
 
 
 def clear_instances():
     """Clear all cached IceFrame instances."""
-    _instances.clear()
+    with _instances_lock:
+        _instances.clear()
 
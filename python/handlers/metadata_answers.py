@@ -0,0 +1,273 @@
+"""
+Metadata answers — COUNT/MIN/MAX queries answered from Iceberg manifests.
+
+Queries of the shape
+
+    SELECT count(*), count(col), min(col), max(col), <partition cols>
+    FROM one_table
+    [WHERE <conditions on identity partition columns>]
+    [GROUP BY <identity partition cols>]
+
+don't need a single data file opened: manifests carry per-file record
+counts, null counts and lower/upper bounds. answer_from_metadata() computes
+the result from those and returns None — so execute_sql falls back to a
+normal scan — whenever that isn't exact:
+
+- delete files in the planned scan (counts and bounds ignore deletes)
+- a WHERE condition that wasn't pushed down, or files it only partly
+  matches (non-trivial residual)
+- missing stats (metrics mode "none"/"counts", old writers)
+- min/max on types whose stored bounds may be truncated or skip NaN
+  (strings, binary, floats)
+
+Output column names and dtypes come from running the query on an empty
+frame, so the answer is indistinguishable from Polars' own.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import polars as pl
+import pyarrow as pa
+from pyiceberg.conversions import from_bytes
+from pyiceberg.expressions import AlwaysTrue
+from pyiceberg.transforms import IdentityTransform
+from pyiceberg.types import (
+    DateType,
+    DecimalType,
+    IntegerType,
+    LongType,
+    TimestampType,
+    TimestamptzType,
+    TimeType,
+)
+
+from handlers.pushdown import ScanPushdown, Token, read_dotted, tokenize
+
+_AGGREGATES = ("count", "min", "max")
+
+# Iceberg stores exact (untruncated, NaN-free) bounds for these
+_BOUND_TYPES = (IntegerType, LongType, DateType, TimeType, TimestampType, TimestamptzType, DecimalType)
+
+# Anything beyond a plain filtered/grouped aggregate over one table
+_UNSUPPORTED = {
+    "join", "union", "intersect", "except", "with", "distinct", "having", "order",
+    "limit", "offset", "qualify", "over", "window", "fetch",
+}
+
+
+@dataclass
+class _Item:
+    kind: str  # "group", "count", "count_col", "min", "max"
+    column: str | None = None
+
+
+@dataclass
+class _Shape:
+    items: list[_Item] = field(default_factory=list)
+    group_by: list[str] = field(default_factory=list)
+
+
+def _split_commas(tokens: list[Token]) -> list[list[Token]]:
+    parts, current, depth = [], [], 0
+    for token in tokens:
+        if token.value == "(":
+            depth += 1
+        elif token.value == ")":
+            depth -= 1
+        elif token.value == "," and depth == 0:
+            parts.append(current)
+            current = []
+            continue
+        current.append(token)
+    parts.append(current)
+    return parts
+
+
+def _strip_alias(tokens: list[Token]) -> list[Token]:
+    if len(tokens) >= 3 and tokens[-2].is_word("as"):
+        return tokens[:-2]
+    if len(tokens) >= 2 and tokens[-1].kind in ("ident", "qident") and tokens[-2].value in (")", "*") \
+            or len(tokens) == 2 and tokens[-1].kind in ("ident", "qident"):
+        return tokens[:-1]
+    return tokens
+
+
+def _parse_item(tokens: list[Token]) -> _Item | None:
+    tokens = _strip_alias(tokens)
+    if not tokens:
+        return None
+    if tokens[0].is_word(*_AGGREGATES) and len(tokens) >= 4 and tokens[1].value == "(" and tokens[-1].value == ")":
+        func = tokens[0].value.lower()
+        inner = tokens[2:-1]
+        if func == "count" and len(inner) == 1 and (inner[0].value == "*" or inner[0].value == "1"):
+            return _Item("count")
+        column, end = read_dotted(inner, 0)
+        if not column or end != len(inner):
+            return None
+        return _Item("count_col" if func == "count" else func, column[-1])
+    column, end = read_dotted(tokens, 0)
+    if column and end == len(tokens):
+        return _Item("group", column[-1])
+    return None
+
+
+def _parse_shape(sql: str) -> _Shape | None:
+    tokens = [t for t in tokenize(sql) if t.value != ";"]
+    words = [t.value.lower() for t in tokens if t.kind == "ident"]
+    if not tokens or not tokens[0].is_word("select") or words.count("select") != 1:
+        return None
+    if _UNSUPPORTED & set(words):
+        return None
+    depth = 0
+    from_at = None
+    for i, token in enumerate(tokens):
+        depth += token.value == "("
+        depth -= token.value == ")"
+        if depth == 0 and token.is_word("from"):
+            from_at = i
+            break
+    if from_at is None:
+        return None
+
+    shape = _Shape()
+    for part in _split_commas(tokens[1:from_at]):
+        item = _parse_item(part)
+        if item is None:
+            return None
+        shape.items.append(item)
+
+    # FROM <ref> [[AS] alias] — then only WHERE and GROUP BY may follow
+    _, i = read_dotted(tokens, from_at + 1)
+    if i < len(tokens) and tokens[i].is_word("as"):
+        i += 1
+    if i < len(tokens) and tokens[i].kind in ("ident", "qident") and not tokens[i].is_word("where", "group"):
+        i += 1
+    rest = tokens[i:]
+    group_at = next((j for j, t in enumerate(rest) if t.is_word("group")), None)
+    if group_at is not None:
+        if group_at + 1 >= len(rest) or not rest[group_at + 1].is_word("by"):
+            return None
+        for part in _split_commas(rest[group_at + 2:]):
+            column, end = read_dotted(part, 0)
+            if not column or end != len(part):
+                return None
+            shape.group_by.append(column[-1])
+        rest = rest[:group_at]
+    if rest and not rest[0].is_word("where"):
+        return None
+
+    grouped = {item.column.lower() for item in shape.items if item.kind == "group"}
+    if grouped != {column.lower() for column in shape.group_by}:
+        return None
+    if not any(item.kind != "group" for item in shape.items):
+        return None
+    return shape
+
+
+def _to_arrow(values: list, iceberg_type) -> pa.Array:
+    """Iceberg's internal representation (days, micros, ...) as an Arrow array."""
+    if isinstance(iceberg_type, DateType):
+        return pa.array(values, pa.int32()).cast(pa.date32())
+    if isinstance(iceberg_type, TimeType):
+        return pa.array(values, pa.int64()).cast(pa.time64("us"))
+    if isinstance(iceberg_type, TimestamptzType):
+        return pa.array(values, pa.int64()).cast(pa.timestamp("us", tz="UTC"))
+    if isinstance(iceberg_type, TimestampType):
+        return pa.array(values, pa.int64()).cast(pa.timestamp("us"))
+    if isinstance(iceberg_type, DecimalType):
+        return pa.array(values, pa.decimal128(iceberg_type.precision, iceberg_type.scale))
+    return pa.array(values)
+
+
+def answer_from_metadata(sql: str, tbl, pushdown: ScanPushdown, where_conjuncts: int | None,
+                         output_schema: Callable[[], pl.Schema]) -> pl.DataFrame | None:
+    """Answer `sql` over the single table `tbl` from manifest stats, or return None.
+
+    Args:
+        sql: the catalog-stripped query
+        tbl: the pyiceberg Table it reads
+        pushdown: the table's pushdown plan; every WHERE condition must be in it
+        where_conjuncts: QueryPushdown.where_conjuncts for the query
+        output_schema: returns the schema Polars would produce for the query
+    """
+    shape = _parse_shape(sql)
+    if shape is None or where_conjuncts is None or len(pushdown.filters) != where_conjuncts:
+        return None
+    schema = tbl.schema()
+    fields = {}
+    for item in shape.items:
+        if item.column is None:
+            continue
+        matches = [f for f in schema.fields if f.name.lower() == item.column.lower()]
+        if len(matches) != 1:
+            return None
+        if item.kind in ("min", "max") and not isinstance(matches[0].field_type, _BOUND_TYPES):
+            return None
+        fields[item.column.lower()] = matches[0]
+
+    snapshot = tbl.current_snapshot()
+    if snapshot is not None and int((snapshot.summary or {}).get("total-delete-files") or 0) > 0:
+        return None
+    tasks = list(tbl.scan(row_filter=pushdown.row_filter).plan_files()) if snapshot is not None else []
+
+    specs = tbl.metadata.specs()
+    groups: dict[tuple, dict] = {}
+    for task in tasks:
+        if task.delete_files or task.residual != AlwaysTrue():
+            return None
+        data_file = task.file
+        spec = specs[data_file.spec_id]
+        key = []
+        for column in shape.group_by:
+            position = next(
+                (p for p, pf in enumerate(spec.fields)
+                 if pf.source_id == fields[column.lower()].field_id and isinstance(pf.transform, IdentityTransform)),
+                None,
+            )
+            if position is None:
+                return None
+            key.append(data_file.partition[position])
+        acc = groups.setdefault(tuple(key), {})
+        for index, item in enumerate(shape.items):
+            if item.kind == "group":
+                continue
+            if item.kind == "count":
+                acc[index] = acc.get(index, 0) + data_file.record_count
+                continue
+            field_id = fields[item.column.lower()].field_id
+            nulls = (data_file.null_value_counts or {}).get(field_id)
+            if nulls is None:
+                return None
+            if item.kind == "count_col":
+                acc[index] = acc.get(index, 0) + data_file.record_count - nulls
+                continue
+            acc.setdefault(index, None)
+            if data_file.record_count - nulls == 0:
+                continue  # all null in this file: no bound, nothing to contribute
+            bounds = data_file.lower_bounds if item.kind == "min" else data_file.upper_bounds
+            raw = (bounds or {}).get(field_id)
+            if raw is None:
+                return None
+            value = from_bytes(fields[item.column.lower()].field_type, raw)
+            current = acc[index]
+            if current is None or (value < current if item.kind == "min" else value > current):
+                acc[index] = value
+
+    if not shape.group_by and not groups:
+        groups[()] = {}  # an ungrouped aggregate always yields one row
+    keys = sorted(groups, key=lambda k: tuple((v is None, v) for v in k))
+    columns = []
+    for index, item in enumerate(shape.items):
+        if item.kind == "group":
+            position = [c.lower() for c in shape.group_by].index(item.column.lower())
+            columns.append(_to_arrow([k[position] for k in keys], fields[item.column.lower()].field_type))
+        elif item.kind in ("count", "count_col"):
+            columns.append(pa.array([groups[k].get(index, 0) for k in keys], pa.int64()))
+        else:
+            columns.append(_to_arrow([groups[k].get(index) for k in keys], fields[item.column.lower()].field_type))
+
+    target = output_schema()
+    if len(target) != len(columns):
+        return None
+    df = pl.from_arrow(pa.table(columns, names=list(target.names())))
+    return df.cast(dict(target.items()))
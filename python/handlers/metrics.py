@@ -0,0 +1,210 @@
+"""
+Metrics — per-method latency, error and resource accounting.
+
+The server records one sample per request. Handlers add sub-phase timings
+with `with phase("scan"): ...`; phases attach to the request bound to the
+current thread (see handlers/context.py), so handlers never pass anything
+around. Everything is readable through the `get_metrics` RPC and can be
+appended to a rolling JSONL file under ~/.icetop/.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from handlers.context import current_request
+from handlers.settings import CONFIG_DIR, load_settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRICS_LOG_PATH = CONFIG_DIR / "metrics.jsonl"
+
+# Latency samples kept per method/phase for percentiles
+_RESERVOIR_SIZE = 2048
+
+# ru_maxrss is kilobytes on Linux, bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # Windows
+    _PAGE_SIZE = None
+
+
+@contextmanager
+def phase(name: str):
+    """Time a sub-phase of the current request (no-op outside a request).
+
+    Phases record wall time: the same phase running on parallel workers of
+    one request is counted once, not summed.
+    """
+    context = current_request()
+    if context is None:
+        yield
+        return
+    context.enter_phase(name, time.perf_counter())
+    try:
+        yield
+    finally:
+        context.exit_phase(name, time.perf_counter())
+
+
+def peak_rss_bytes() -> int | None:
+    """High-water mark of this process's resident set size (process-wide, never drops)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+def current_rss_bytes() -> int | None:
+    """This process's resident set size right now (Linux only, else None)."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def percentile(ordered: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index], 2)
+
+
+class _Series:
+    """Count, total and a bounded reservoir of recent timings."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: deque[float] = deque(maxlen=_RESERVOIR_SIZE)
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.samples.append(ms)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "totalMs": round(self.total_ms, 2),
+            "meanMs": round(self.total_ms / self.count, 2) if self.count else None,
+            "maxMs": round(self.max_ms, 2),
+            "p50Ms": percentile(ordered, 50),
+            "p95Ms": percentile(ordered, 95),
+            "p99Ms": percentile(ordered, 99),
+        }
+
+
+class _MethodStats:
+    def __init__(self):
+        self.latency = _Series()
+        self.errors = 0
+        self.cancelled = 0
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+        self.phases: dict[str, _Series] = {}
+
+    def summary(self) -> dict:
+        return {
+            **self.latency.summary(),
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "responseBytes": self.response_bytes,
+            "maxResponseBytes": self.max_response_bytes,
+            "phases": {name: series.summary() for name, series in sorted(self.phases.items())},
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, log_path: Path = METRICS_LOG_PATH):
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log_path = log_path
+        self._methods: dict[str, _MethodStats] = {}
+        self._started = time.time()
+
+    def record(self, method: str, latency_ms: float, status: str,
+               phases: dict[str, float], rss_delta: int | None) -> dict:
+        """Record a finished request; returns the sample for record_response().
+
+        `rss_delta` is the change in current RSS across the request. Requests
+        running at the same time contribute to it too, so it is kept on the
+        sample only and not aggregated per method.
+        """
+        with self._lock:
+            stats = self._methods.setdefault(method, _MethodStats())
+            stats.latency.add(latency_ms)
+            if status == "error":
+                stats.errors += 1
+            elif status == "cancelled":
+                stats.cancelled += 1
+            for name, ms in phases.items():
+                stats.phases.setdefault(name, _Series()).add(ms)
+        return {
+            "method": method,
+            "ms": round(latency_ms, 2),
+            "status": status,
+            "rssDeltaBytes": rss_delta,
+            "phases": {name: round(ms, 2) for name, ms in phases.items()},
+        }
+
+    def record_response(self, sample: dict, response_bytes: int, write_ms: float):
+        """Add the encoded response size, then append the sample to the JSONL log."""
+        method = sample["method"]
+        with self._lock:
+            stats = self._methods.setdefault(method, _MethodStats())
+            stats.response_bytes += response_bytes
+            stats.max_response_bytes = max(stats.max_response_bytes, response_bytes)
+            stats.phases.setdefault("write", _Series()).add(write_ms)
+        self._log({
+            "ts": round(time.time(), 3),
+            **sample,
+            "responseBytes": response_bytes,
+            "writeMs": round(write_ms, 2),
+        })
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            methods = {name: stats.summary() for name, stats in sorted(self._methods.items())}
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self._started)),
+            "rssBytes": current_rss_bytes(),
+            "peakRssBytes": peak_rss_bytes(),
+            "methods": methods,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._started = time.time()
+
+    def _log(self, entry: dict):
+        settings = load_settings().get("metrics", {})
+        if not settings.get("logToFile"):
+            return
+        max_bytes = settings.get("maxLogBytes", 5 * 1024 * 1024)
+        line = json.dumps(entry) + "\n"
+        with self._log_lock:
+            try:
+                # Rolling: keep the current file plus one rotated predecessor
+                if self._log_path.exists() and self._log_path.stat().st_size + len(line) > max_bytes:
+                    self._log_path.replace(self._log_path.with_suffix(".jsonl.1"))
+                with open(self._log_path, "a") as f:
+                    f.write(line)
+            except OSError as e:
+                print(f"[Metrics] Could not write {self._log_path}: {e}", file=sys.stderr)
@@ -3,17 +3,32 @@ Notebook handler — executes Python cells with an IceFrame instance pre-loaded.
 """
 import io
 import sys
+import threading
 import time
 import traceback
+import polars as pl
 from iceframe import IceFrame
+from handlers.context import RequestContext, current_request
 from handlers.iceframe_loader import get_iceframe
+from handlers.metrics import phase
+from handlers.results import to_columnar
+
+# Rows of a DataFrame `_` sent back as a structured table preview
+PREVIEW_ROWS = 100
 
 
 class NotebookHandler:
     def __init__(self):
         self._namespace: dict = {}
+        # Cells share one namespace and redirect the process-wide sys.stdout,
+        # so they must run one at a time even when requests are concurrent.
+        self._lock = threading.Lock()
 
     def execute_cell(self, params: dict) -> dict:
+        with self._lock:
+            return self._execute_cell(params)
+
+    def _execute_cell(self, params: dict) -> dict:
         catalog = params["catalog"]
         code = params["code"]
         ice = get_iceframe(catalog)
@@ -31,12 +46,19 @@ class NotebookHandler:
         start = time.time()
         error_msg = None
         result_data = None
+        table_preview = None
 
+        context = current_request() or RequestContext(None, "execute_cell")
         try:
-            exec(code, self._namespace)
+            # Cell code can't poll for cancellation, so a cancel interrupts it
+            with context.interruptible(), phase("exec"):
+                exec(code, self._namespace)
             # Check if last expression produced a value
             if "_" in self._namespace and self._namespace["_"] is not None:
-                result_data = str(self._namespace["_"])
+                value = self._namespace["_"]
+                result_data = str(value)
+                if isinstance(value, pl.DataFrame):
+                    table_preview = {**to_columnar(value.head(PREVIEW_ROWS)), "rowCount": value.height}
         except Exception:
             error_msg = traceback.format_exc()
         finally:
@@ -48,6 +70,7 @@ class NotebookHandler:
             "text": captured.getvalue(),
             "error": error_msg,
             "data": result_data,
+            "table": table_preview,
             "executionTimeMs": elapsed_ms,
         }
 
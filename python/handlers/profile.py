@@ -0,0 +1,48 @@
+"""
+Query profile — where an execute_sql call spent its time and what it read.
+
+Only built when the caller passes `profile: true`; the manifest pruning
+count re-evaluates the scan's partition filter against the manifest list,
+which costs an extra (usually cached) manifest list read per table.
+"""
+from pyiceberg.expressions.visitors import inclusive_projection, manifest_evaluator
+
+
+def scan_stats(tbl, scan, tasks: list) -> dict:
+    """Manifests and data files considered vs pruned for one planned table scan."""
+    snapshot = scan.snapshot()
+    manifests = snapshot.manifests(tbl.io) if snapshot is not None else []
+    schema = tbl.schema()
+    evaluators = {}
+    manifests_kept = 0
+    for manifest in manifests:
+        spec_id = manifest.partition_spec_id
+        if spec_id not in evaluators:
+            spec = tbl.metadata.specs()[spec_id]
+            partition_filter = inclusive_projection(schema, spec, scan.case_sensitive)(scan.row_filter)
+            evaluators[spec_id] = manifest_evaluator(spec, schema, partition_filter, scan.case_sensitive)
+        manifests_kept += bool(evaluators[spec_id](manifest))
+
+    summary = snapshot.summary if snapshot is not None and snapshot.summary is not None else {}
+    total_files = int(summary.get("total-data-files") or len(tasks))
+    delete_files = {d.file_path for task in tasks for d in task.delete_files}
+    return {
+        "manifests": len(manifests),
+        "manifestsPruned": len(manifests) - manifests_kept,
+        "dataFiles": total_files,
+        "dataFilesPruned": max(0, total_files - len(tasks)),
+        "deleteFiles": len(delete_files),
+        "bytesRead": sum(task.file.file_size_in_bytes for task in tasks),
+        "rowsInFiles": sum(task.file.record_count for task in tasks),
+    }
+
+
+def table_totals(tbl) -> dict:
+    """What a table holds, for scans planned by Polars (no pruning counts available)."""
+    snapshot = tbl.current_snapshot()
+    summary = snapshot.summary if snapshot is not None and snapshot.summary is not None else {}
+    return {
+        "dataFiles": int(summary.get("total-data-files") or 0),
+        "totalFileBytes": int(summary.get("total-files-size") or 0),
+        "totalRows": int(summary.get("total-records") or 0),
+    }
@@ -0,0 +1,474 @@
+"""
+Scan pushdown — derive Iceberg scan arguments from a SQL query.
+
+execute_sql reads each referenced table before Polars sees the query, so
+anything the scan can skip has to be worked out from the SQL text first:
+
+- projection: only columns the query mentions are read (all of them for
+  `*`, NATURAL joins or anything we can't attribute)
+- filters: top-level AND-ed comparisons in the outer WHERE clause become a
+  pyiceberg row_filter, so manifests, data files and Parquet row groups are
+  pruned from partition values and column stats before any rows are read
+
+Both are conservative. The query still runs unchanged on what was read, so a
+pushed filter only has to keep a superset of the matching rows; anything we
+aren't sure about (ORs, expressions, subqueries, CTEs, set operations,
+literals that would need a lossy cast) simply isn't pushed.
+"""
+import re
+from dataclasses import dataclass, field
+
+from pyiceberg.expressions import (
+    AlwaysTrue,
+    And,
+    BooleanExpression,
+    EqualTo,
+    GreaterThan,
+    GreaterThanOrEqual,
+    In,
+    IsNull,
+    LessThan,
+    LessThanOrEqual,
+    NotEqualTo,
+    NotIn,
+    NotNull,
+)
+from pyiceberg.expressions.visitors import bind
+from pyiceberg.schema import Schema
+from pyiceberg.types import (
+    BooleanType,
+    DateType,
+    DecimalType,
+    DoubleType,
+    FloatType,
+    IntegerType,
+    LongType,
+    StringType,
+    TimestampType,
+)
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<qident>"(?:[^"]|"")*"|`[^`]*`)
+  | (?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<op><=|>=|<>|!=|==|::|\|\||[=<>(),.*;+\-/%])
+  | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Words that can follow a table reference and therefore are never its alias
+_NOT_ALIAS = {
+    "where", "join", "inner", "left", "right", "full", "outer", "cross", "natural",
+    "semi", "anti", "on", "using", "group", "order", "limit", "offset", "having",
+    "qualify", "window", "union", "intersect", "except", "fetch",
+}
+
+# Keywords that end the outer WHERE clause
+_CLAUSE_END = {"group", "order", "limit", "offset", "having", "qualify", "window", "fetch"}
+
+# Anything that changes which rows of a base table reach the outer WHERE
+_NO_FILTER_KEYWORDS = {"with", "union", "intersect", "except"}
+
+_COMPARISONS = {
+    "=": EqualTo, "==": EqualTo, "!=": NotEqualTo, "<>": NotEqualTo,
+    "<": LessThan, "<=": LessThanOrEqual, ">": GreaterThan, ">=": GreaterThanOrEqual,
+}
+_FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+# Iceberg types each kind of SQL literal converts to without losing precision.
+# Floats aren't pushed to integer or decimal columns (pyiceberg would round the
+# bound), and strings only go to types whose parse matches Polars' own cast.
+_LITERAL_TYPES = {
+    "int": (IntegerType, LongType, FloatType, DoubleType, DecimalType),
+    "float": (FloatType, DoubleType),
+    "string": (StringType, DateType, TimestampType),
+    "bool": (BooleanType,),
+}
+
+
+@dataclass
+class Token:
+    kind: str
+    value: str
+
+    def is_word(self, *words: str) -> bool:
+        return self.kind == "ident" and self.value.lower() in words
+
+
+@dataclass
+class _Literal:
+    kind: str
+    value: object
+
+
+@dataclass
+class _Predicate:
+    """One pushable conjunct, not yet tied to a table."""
+    column: list[str]
+    build: object  # callable(column_name) -> BooleanExpression
+    kinds: tuple[str, ...]
+    null_accepting: bool
+    text: str
+
+
+@dataclass
+class ScanPushdown:
+    """What to hand to `Table.scan()` for one table reference."""
+    columns: list[str] | None = None  # None: every column
+    row_filter: BooleanExpression = field(default_factory=AlwaysTrue)
+    filters: list[str] = field(default_factory=list)
+
+    def describe(self) -> dict:
+        return {"columns": self.columns, "filters": self.filters}
+
+
+def tokenize(sql: str) -> list[Token]:
+    tokens = []
+    for match in _TOKEN_RE.finditer(sql):
+        kind = match.lastgroup
+        if kind in ("ws", "comment"):
+            continue
+        value = match.group()
+        if kind == "qident":
+            value = value[1:-1].replace('""', '"')
+        tokens.append(Token(kind, value))
+    return tokens
+
+
+def _name(token: Token) -> str | None:
+    """Identifier text of a bare or quoted identifier token."""
+    if token.kind in ("ident", "qident"):
+        return token.value
+    return None
+
+
+def read_dotted(tokens: list[Token], i: int) -> tuple[list[str], int]:
+    """Read `a.b.c` starting at i; returns the parts and the index after them."""
+    parts = []
+    while i < len(tokens):
+        name = _name(tokens[i])
+        if name is None:
+            break
+        parts.append(name)
+        if i + 2 < len(tokens) and tokens[i + 1].value == "." and _name(tokens[i + 2]) is not None:
+            i += 2
+            continue
+        i += 1
+        break
+    return parts, i
+
+
+def _read_literal(tokens: list[Token], i: int) -> tuple[_Literal | None, int]:
+    if i >= len(tokens):
+        return None, i
+    token = tokens[i]
+    if token.kind == "string":
+        return _Literal("string", token.value[1:-1].replace("''", "'")), i + 1
+    if token.is_word("date", "timestamp") and i + 1 < len(tokens) and tokens[i + 1].kind == "string":
+        return _read_literal(tokens, i + 1)
+    if token.is_word("true", "false"):
+        return _Literal("bool", token.value.lower() == "true"), i + 1
+    sign = 1
+    if token.value in ("-", "+") and i + 1 < len(tokens) and tokens[i + 1].kind == "number":
+        sign = -1 if token.value == "-" else 1
+        i += 1
+        token = tokens[i]
+    if token.kind == "number":
+        text = token.value
+        if re.fullmatch(r"\d+", text):
+            return _Literal("int", sign * int(text)), i + 1
+        return _Literal("float", sign * float(text)), i + 1
+    return None, i
+
+
+def _split_and(tokens: list[Token]) -> list[list[Token]]:
+    """Split on top-level AND (the AND inside BETWEEN doesn't count)."""
+    parts, current, depth, in_between = [], [], 0, False
+    for token in tokens:
+        if token.value == "(":
+            depth += 1
+        elif token.value == ")":
+            depth -= 1
+        elif depth == 0 and token.is_word("between"):
+            in_between = True
+        elif depth == 0 and token.is_word("and"):
+            if in_between:
+                in_between = False
+            else:
+                parts.append(current)
+                current = []
+                continue
+        current.append(token)
+    parts.append(current)
+    return parts
+
+
+def _unwrap(tokens: list[Token]) -> list[Token]:
+    """Strip parentheses that enclose the whole conjunct."""
+    while len(tokens) >= 2 and tokens[0].value == "(" and tokens[-1].value == ")":
+        depth = 0
+        for i, token in enumerate(tokens):
+            if token.value == "(":
+                depth += 1
+            elif token.value == ")":
+                depth -= 1
+                if depth == 0 and i < len(tokens) - 1:
+                    return tokens
+        tokens = tokens[1:-1]
+    return tokens
+
+
+def _conjuncts(tokens: list[Token]) -> list[list[Token]]:
+    result = []
+    for part in _split_and(tokens):
+        unwrapped = _unwrap(part)
+        if unwrapped is not part and len(_split_and(unwrapped)) > 1:
+            result.extend(_conjuncts(unwrapped))
+        else:
+            result.append(unwrapped)
+    return result
+
+
+def _text(tokens: list[Token]) -> str:
+    """Re-assemble a conjunct for display (whitespace normalized)."""
+    out = ""
+    for i, token in enumerate(tokens):
+        value = f'"{token.value}"' if token.kind == "qident" else token.value
+        if i and token.value not in (".", ",", ")") and tokens[i - 1].value not in (".", "("):
+            out += " "
+        out += value
+    return out
+
+
+def _parse_predicate(tokens: list[Token]) -> _Predicate | None:
+    """Recognize `col <op> literal` and friends; None for anything else."""
+    if not tokens:
+        return None
+    text = _text(tokens)
+
+    column, i = read_dotted(tokens, 0)
+    if column and i < len(tokens):
+        rest = tokens[i:]
+        # col IS [NOT] NULL
+        if rest[0].is_word("is"):
+            if len(rest) == 3 and rest[1].is_word("not") and rest[2].is_word("null"):
+                return _Predicate(column, NotNull, (), False, text)
+            if len(rest) == 2 and rest[1].is_word("null"):
+                return _Predicate(column, IsNull, (), True, text)
+            return None
+        # col [NOT] IN (lit, ...)
+        negated = rest[0].is_word("not")
+        j = 1 if negated else 0
+        if j < len(rest) and rest[j].is_word("in") and j + 1 < len(rest) and rest[j + 1].value == "(":
+            values, j = [], j + 2
+            while j < len(rest):
+                literal, j = _read_literal(rest, j)
+                if literal is None or j >= len(rest):
+                    return None
+                values.append(literal)
+                if rest[j].value == ")":
+                    j += 1
+                    break
+                if rest[j].value != ",":
+                    return None
+                j += 1
+            if j != len(rest) or not values or len({v.kind for v in values}) != 1:
+                return None
+            items = {v.value for v in values}
+            op = NotIn if negated else In
+            return _Predicate(column, lambda c: op(c, items), (values[0].kind,), False, text)
+        # col BETWEEN lit AND lit
+        if rest[0].is_word("between"):
+            low, j = _read_literal(rest, 1)
+            if low is None or j >= len(rest) or not rest[j].is_word("and"):
+                return None
+            high, j = _read_literal(rest, j + 1)
+            if high is None or j != len(rest):
+                return None
+            return _Predicate(
+                column,
+                lambda c: And(GreaterThanOrEqual(c, low.value), LessThanOrEqual(c, high.value)),
+                (low.kind, high.kind), False, text,
+            )
+        # col <op> lit
+        if rest[0].value in _COMPARISONS:
+            literal, j = _read_literal(rest, 1)
+            if literal is None or j != len(rest):
+                return None
+            op = _COMPARISONS[rest[0].value]
+            return _Predicate(column, lambda c: op(c, literal.value), (literal.kind,), False, text)
+        return None
+
+    # lit <op> col
+    literal, i = _read_literal(tokens, 0)
+    if literal is None or i >= len(tokens) or tokens[i].value not in _COMPARISONS:
+        return None
+    symbol = _FLIPPED.get(tokens[i].value, tokens[i].value)
+    column, j = read_dotted(tokens, i + 1)
+    if not column or j != len(tokens):
+        return None
+    op = _COMPARISONS[symbol]
+    return _Predicate(column, lambda c: op(c, literal.value), (literal.kind,), False, text)
+
+
+class QueryPushdown:
+    """Pushdown analysis of one query over the tables it references.
+
+    Args:
+        sql: the query, with catalog prefixes already stripped
+        refs: the table references execute_sql will load (e.g. "db.events")
+    """
+
+    def __init__(self, sql: str, refs: list[str]):
+        self._refs = list(refs)
+        self._tokens = tokenize(sql)
+        lowered = [t.value.lower() for t in self._tokens if t.kind == "ident"]
+
+        # alias / ref / bare table name (lowercased) -> ref
+        self._qualifiers: dict[str, str] = {}
+        for ref in self._refs:
+            self._qualifiers.setdefault(ref.lower(), ref)
+            self._qualifiers.setdefault(ref.split(".")[-1].lower(), ref)
+        self._read_aliases()
+
+        self._names = {
+            t.value.lower() for t in self._tokens if t.kind in ("ident", "qident")
+        }
+        self._outer_join = any(w in ("left", "right", "full") for w in lowered)
+        self._all_columns: set[str] | None = set()  # refs needing every column; None = all refs
+        if "natural" in lowered:
+            self._all_columns = None
+        else:
+            self._find_stars()
+
+        self._predicates: list[_Predicate] = []
+        # Number of AND-ed conditions in the outer WHERE (0 without one); None
+        # when the query's shape rules out filter pushdown altogether
+        self.where_conjuncts: int | None = None
+        if lowered.count("select") == 1 and not _NO_FILTER_KEYWORDS & set(lowered):
+            where = self._where_clause()
+            conjuncts = _conjuncts(where) if where else []
+            self.where_conjuncts = len(conjuncts)
+            for conjunct in conjuncts:
+                predicate = _parse_predicate(conjunct)
+                if predicate is not None:
+                    self._predicates.append(predicate)
+
+    def _read_aliases(self):
+        tokens = self._tokens
+        for i, token in enumerate(tokens):
+            if not token.is_word("from", "join"):
+                continue
+            parts, j = read_dotted(tokens, i + 1)
+            ref = self._qualifiers.get(".".join(parts).lower())
+            if ref is None:
+                continue
+            if j < len(tokens) and tokens[j].is_word("as"):
+                j += 1
+            if j < len(tokens):
+                alias = _name(tokens[j])
+                if alias is not None and alias.lower() not in _NOT_ALIAS:
+                    self._qualifiers[alias.lower()] = ref
+
+    def _find_stars(self):
+        tokens = self._tokens
+        for i, token in enumerate(tokens):
+            if token.value != "*" or i == 0:
+                continue
+            prev = tokens[i - 1]
+            if prev.value == ",":
+                # `SELECT a, *` — but not `f(a, *)`-style arguments
+                depth = 0
+                for earlier in reversed(tokens[:i]):
+                    if earlier.value == ")":
+                        depth += 1
+                    elif earlier.value == "(":
+                        if depth == 0:
+                            break
+                        depth -= 1
+                    elif depth == 0 and earlier.is_word("select"):
+                        self._all_columns = None
+                        return
+                continue
+            if prev.is_word("select", "distinct", "all"):
+                self._all_columns = None
+                return
+            if prev.value == ".":
+                qualifier = [t.value for t in tokens[max(0, i - 5):i - 1] if t.value != "."]
+                ref = None
+                for n in range(len(qualifier)):
+                    ref = self._qualifiers.get(".".join(qualifier[n:]).lower())
+                    if ref is not None:
+                        break
+                if ref is None:
+                    self._all_columns = None
+                    return
+                self._all_columns.add(ref)
+
+    def _where_clause(self) -> list[Token]:
+        tokens, depth, start = self._tokens, 0, None
+        for i, token in enumerate(tokens):
+            if token.value == "(":
+                depth += 1
+            elif token.value == ")":
+                depth -= 1
+            elif depth == 0 and start is None and token.is_word("where"):
+                start = i + 1
+            elif depth == 0 and start is not None and (
+                token.value == ";" or token.is_word(*_CLAUSE_END)
+            ):
+                return tokens[start:i]
+        return tokens[start:] if start is not None else []
+
+    def _resolve(self, column: list[str], schemas: dict[str, Schema]) -> tuple[str, str] | None:
+        """Map a (possibly qualified) column reference to (ref, schema column name)."""
+        name = column[-1].lower()
+        if len(column) > 1:
+            ref = self._qualifiers.get(".".join(column[:-1]).lower())
+            candidates = [ref] if ref in schemas else []
+        else:
+            candidates = list(schemas)
+        matches = []
+        for ref in candidates:
+            fields = [f.name for f in schemas[ref].fields if f.name.lower() == name]
+            if len(fields) == 1:
+                matches.append((ref, fields[0]))
+        return matches[0] if len(matches) == 1 else None
+
+    def plan(self, schemas: dict[str, Schema]) -> dict[str, ScanPushdown]:
+        """Scan arguments for every ref, given each table's Iceberg schema."""
+        plans = {}
+        for ref, schema in schemas.items():
+            plan = ScanPushdown()
+            if self._all_columns is not None and ref not in self._all_columns:
+                names = [f.name for f in schema.fields]
+                used = [n for n in names if n.lower() in self._names]
+                # Nothing referenced (e.g. count(*)): one column still yields the row count
+                plan.columns = used or names[:1]
+            plans[ref] = plan
+
+        for predicate in self._predicates:
+            if predicate.null_accepting and self._outer_join:
+                # IS NULL can match rows an outer join null-extends after the scan
+                continue
+            resolved = self._resolve(predicate.column, schemas)
+            if resolved is None:
+                continue
+            ref, name = resolved
+            field_type = schemas[ref].find_field(name).field_type
+            if any(not isinstance(field_type, _LITERAL_TYPES[kind]) for kind in predicate.kinds):
+                continue
+            expr = predicate.build(name)
+            try:
+                bind(schemas[ref], expr, case_sensitive=True)
+            except Exception:
+                continue
+            plan = plans[ref]
+            plan.row_filter = expr if not plan.filters else And(plan.row_filter, expr)
+            plan.filters.append(predicate.text)
+        return plans
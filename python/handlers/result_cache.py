@@ -0,0 +1,182 @@
+"""
+Result cache — finished execute_sql results reused across identical queries.
+
+Keyed by the normalized SQL text plus the (catalog, table, snapshot id,
+schema id) of every table the query references, so a result is only reused
+while none of its inputs has a new commit. Bounded by settings
+`cache.resultCacheBytes` (0 disables it) with LRU eviction.
+
+With `cache.persistResults` entries are also written, in the background,
+as Parquet under ~/.icetop/result-cache/ and found again after a restart; the directory is
+held to the same byte budget, oldest files first.
+
+Queries calling non-deterministic functions (random(), now(), uuid(), ...)
+are never cached: the same SQL over the same snapshots gives a different
+result each time.
+"""
+import hashlib
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+
+from handlers.pushdown import tokenize
+from handlers.settings import CONFIG_DIR, DEFAULT_SETTINGS, load_settings
+
+RESULT_CACHE_DIR = CONFIG_DIR / "result-cache"
+
+# Keywords whose case doesn't change a query. Other unquoted identifiers keep
+# theirs: column names are case-sensitive in Polars SQL.
+_SQL_KEYWORDS = {
+    "select", "distinct", "from", "where", "and", "or", "not", "in", "is", "null",
+    "like", "ilike", "between", "exists", "as", "on", "using", "join", "inner",
+    "left", "right", "full", "outer", "cross", "natural", "semi", "anti", "group",
+    "by", "order", "asc", "desc", "nulls", "first", "last", "limit", "offset",
+    "having", "qualify", "window", "union", "intersect", "except", "all", "with",
+    "case", "when", "then", "else", "end", "cast", "true", "false", "over",
+    "partition", "rows", "range", "fetch", "interval",
+}
+
+# Functions whose result differs between two runs of the same query
+_NON_DETERMINISTIC = {
+    "random", "rand", "uuid", "uuidv4", "gen_random_uuid",
+    "now", "current_timestamp", "current_date", "current_time",
+    "localtimestamp", "localtime", "today",
+}
+
+
+def normalize_sql(sql: str) -> str:
+    """`sql` as single-spaced tokens: comments dropped, keywords lowercased,
+    quoted identifiers requoted alike and a trailing semicolon removed."""
+    pieces = []
+    for token in tokenize(sql):
+        if token.kind == "qident":
+            pieces.append('"' + token.value.replace('"', '""') + '"')
+        elif token.kind == "ident" and token.value.lower() in _SQL_KEYWORDS:
+            pieces.append(token.value.lower())
+        else:
+            pieces.append(token.value)
+    while pieces and pieces[-1] == ";":
+        pieces.pop()
+    return " ".join(pieces)
+
+
+def is_deterministic(sql: str) -> bool:
+    """False if `sql` calls a function whose result changes between runs."""
+    return not any(
+        token.kind == "ident" and token.value.lower() in _NON_DETERMINISTIC
+        for token in tokenize(sql)
+    )
+
+
+def result_key(sql: str, tables: dict, ranges: dict | None = None) -> str:
+    """Cache key for `sql` over `tables` (`{ref: (catalog, pyiceberg Table)}`).
+
+    `ranges` (`{ref: (from_snapshot_id, to_snapshot_id)}`) marks tables read
+    incrementally, whose rows depend on the range rather than the current
+    snapshot alone.
+    """
+    parts = [normalize_sql(sql)]
+    for ref in sorted(tables):
+        catalog, tbl = tables[ref]
+        metadata = tbl.metadata
+        part = f"{catalog}.{ref}@{metadata.current_snapshot_id}/{metadata.current_schema_id}"
+        if ranges and ref in ranges:
+            part += "+appends({}..{}]".format(*ranges[ref])
+        parts.append(part)
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[pl.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        # Parquet files are written off the request path, one at a time
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache")
+
+    @staticmethod
+    def _settings() -> dict:
+        return {**DEFAULT_SETTINGS["cache"], **load_settings().get("cache", {})}
+
+    def get(self, key: str) -> pl.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+        settings = self._settings()
+        if not settings["persistResults"]:
+            return None
+        path = RESULT_CACHE_DIR / f"{key}.parquet"
+        try:
+            df = pl.read_parquet(path)
+            path.touch()
+        except (OSError, pl.exceptions.PolarsError):
+            return None
+        self._remember(key, df, int(settings["resultCacheBytes"]))
+        return df
+
+    def put(self, key: str, df: pl.DataFrame) -> bool:
+        """Store a result; returns False if it doesn't fit the budget."""
+        settings = self._settings()
+        budget = int(settings["resultCacheBytes"])
+        if not self._remember(key, df, budget):
+            return False
+        if settings["persistResults"]:
+            self._writer.submit(self._persist, key, df, budget)
+        return True
+
+    def _remember(self, key: str, df: pl.DataFrame, budget: int) -> bool:
+        size = df.estimated_size()
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            fits = size <= budget
+            while self._entries and self._bytes + (size if fits else 0) > budget:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+            if not fits:
+                return False
+            self._entries[key] = (df, size)
+            self._bytes += size
+            return True
+
+    @staticmethod
+    def _persist(key: str, df: pl.DataFrame, budget: int):
+        path = RESULT_CACHE_DIR / f"{key}.parquet"
+        # Unique temp name, so two writes of one key can't clobber each other
+        tmp = RESULT_CACHE_DIR / f"{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            df.write_parquet(tmp)
+            tmp.replace(path)
+            files = sorted(RESULT_CACHE_DIR.glob("*.parquet"), key=lambda p: p.stat().st_mtime)
+            total = sum(p.stat().st_size for p in files)
+            for old in files:
+                if total <= budget:
+                    break
+                if old == path:
+                    continue
+                total -= old.stat().st_size
+                old.unlink()
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            print(f"[ResultCache] Could not persist result {key}: {e}", file=sys.stderr)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        for path in RESULT_CACHE_DIR.glob("*.parquet"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    @property
+    def bytes_held(self) -> int:
+        return self._bytes
@@ -0,0 +1,170 @@
+"""
+Result transport — how a query's DataFrame leaves the backend.
+
+Three formats, shared by execute_sql, the agent tools and notebook previews:
+
+- "rows":     JSON `rows: [{col: val}]` inside the RPC response (default)
+- "columnar": JSON `data: [[col0 values], [col1 values]]` — no per-row dicts
+- "arrow":    Arrow IPC stream in a side-channel file under ~/.icetop/results/;
+              the response carries only a handle and the schema, and the
+              reader releases the file when it's done with it.
+
+Both JSON formats go through to_json_safe() first, which casts temporal,
+decimal and binary columns in Polars so the encoder never falls back to
+per-value conversion.
+"""
+import re
+import time
+import uuid
+from pathlib import Path
+
+import polars as pl
+
+RESULTS_DIR = Path.home() / ".icetop" / "results"
+ARROW_SUFFIX = ".arrows"
+
+# Side-channel files nobody released (e.g. the app crashed) are swept after this
+_STALE_AFTER_S = 6 * 60 * 60
+
+_HANDLE_RE = re.compile(r"^[0-9a-f]{32}$")
+
+RESULT_FORMATS = ("rows", "columnar", "arrow")
+
+# ISO-8601 layouts matching what SafeEncoder produced via .isoformat()
+_DATETIME_FMT = "%Y-%m-%dT%H:%M:%S%.f"
+_DATETIME_TZ_FMT = "%Y-%m-%dT%H:%M:%S%.f%:z"
+
+
+def describe_columns(df: pl.DataFrame) -> list[dict]:
+    """Column names and Polars dtypes, as sent alongside every result."""
+    return [{"name": col, "type": str(dtype)} for col, dtype in df.schema.items()]
+
+
+def _json_safe_expr(name: str, dtype: pl.DataType) -> pl.Expr | None:
+    """Vectorized cast for one column, or None if it's already JSON-native."""
+    col = pl.col(name)
+    if dtype == pl.Date:
+        return col.dt.to_string("%Y-%m-%d")
+    if dtype == pl.Time:
+        return col.dt.to_string("%H:%M:%S%.f")
+    if isinstance(dtype, pl.Datetime):
+        return col.dt.to_string(_DATETIME_TZ_FMT if dtype.time_zone else _DATETIME_FMT)
+    if isinstance(dtype, pl.Duration):
+        return col.dt.to_string("iso")
+    if isinstance(dtype, pl.Decimal):
+        return col.cast(pl.Float64)
+    if dtype in (pl.Float32, pl.Float64):
+        # NaN/inf aren't valid JSON — the renderer's JSON.parse would reject the line
+        return pl.when(col.is_finite()).then(col)
+    if isinstance(dtype, (pl.Categorical, pl.Enum)):
+        return col.cast(pl.String)
+    return None
+
+
+def to_json_safe(df: pl.DataFrame) -> pl.DataFrame:
+    """Return `df` with every top-level column in a JSON-native dtype.
+
+    Nested (list/struct) columns are left as they are; SafeEncoder still
+    covers anything inside them.
+    """
+    exprs = []
+    binary_cols = []
+    for name, dtype in df.schema.items():
+        if dtype == pl.Binary:
+            binary_cols.append(name)
+            continue
+        expr = _json_safe_expr(name, dtype)
+        if expr is not None:
+            exprs.append(expr.alias(name))
+    if exprs:
+        df = df.with_columns(exprs)
+    for name in binary_cols:
+        try:
+            decoded = df.get_column(name).cast(pl.String)
+        except pl.exceptions.PolarsError:
+            # Not valid UTF-8 — decode per value with replacement chars, as before
+            decoded = df.get_column(name).map_elements(
+                lambda b: b.decode("utf-8", errors="replace"), return_dtype=pl.String
+            )
+        df = df.with_columns(decoded.alias(name))
+    return df
+
+
+def to_rows(df: pl.DataFrame) -> list[dict]:
+    return to_json_safe(df).to_dicts()
+
+
+def to_columnar(df: pl.DataFrame) -> dict:
+    """`{columns, data}` where `data[i]` holds every value of `columns[i]`."""
+    safe = to_json_safe(df)
+    return {
+        "columns": describe_columns(df),
+        "data": [series.to_list() for series in safe.get_columns()],
+    }
+
+
+def encode_result(df: pl.DataFrame, result_format: str = "rows") -> dict:
+    """Encode `df` in one of RESULT_FORMATS, timing the encoding itself."""
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Unknown resultFormat: {result_format}")
+
+    start = time.perf_counter()
+    if result_format == "columnar":
+        result = to_columnar(df)
+    else:
+        result = {"columns": describe_columns(df)}
+        if result_format == "arrow":
+            result["arrow"] = write_arrow_result(df)
+        else:
+            result["rows"] = to_rows(df)
+    result["rowCount"] = df.height
+    result["resultFormat"] = result_format
+    result["serializationTimeMs"] = int((time.perf_counter() - start) * 1000)
+    return result
+
+
+def arrow_result_path(handle: str) -> Path:
+    if not _HANDLE_RE.match(handle or ""):
+        raise ValueError(f"Invalid result handle: {handle!r}")
+    return RESULTS_DIR / f"{handle}{ARROW_SUFFIX}"
+
+
+def write_arrow_result(df: pl.DataFrame) -> dict:
+    """Write `df` as an uncompressed Arrow IPC stream and return its handle."""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    handle = uuid.uuid4().hex
+    path = arrow_result_path(handle)
+    # Oldest compat level: plain (large) utf8/binary instead of view types,
+    # which Arrow readers outside Polars (e.g. apache-arrow JS) may not support
+    df.write_ipc_stream(path, compression="uncompressed", compat_level=pl.CompatLevel.oldest())
+    return {
+        "handle": handle,
+        "path": str(path),
+        "format": "arrow-ipc-stream",
+        "bytes": path.stat().st_size,
+    }
+
+
+def release_arrow_result(handle: str) -> bool:
+    """Delete a side-channel result file. Returns False if it was already gone."""
+    try:
+        arrow_result_path(handle).unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def sweep_arrow_results(max_age_s: float = _STALE_AFTER_S) -> int:
+    """Remove side-channel files older than `max_age_s`; returns how many were removed."""
+    if not RESULTS_DIR.exists():
+        return 0
+    cutoff = time.time() - max_age_s
+    removed = 0
+    for path in RESULTS_DIR.glob(f"*{ARROW_SUFFIX}"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
@@ -0,0 +1,67 @@
+"""
+Sampled scans — exploratory queries over a fraction of each table's files.
+
+execute_sql's `sample` parameter (0 < fraction < 1) makes every eagerly
+read table scan only some of its planned data files. Files are chosen by
+their manifest record counts evenly across the partitions, in an order
+fixed by a hash of the file path (and `sampleSeed`): the same query over
+the same snapshot reads the same files.
+
+Sampling is file-granular, so a partition with few large files is sampled
+coarsely; the report gives the fraction actually read next to the requested
+one, plus the row count of the unsampled scan.
+"""
+import hashlib
+
+
+def _order(path: str, seed: int) -> str:
+    return hashlib.sha256(f"{seed}:{path}".encode()).hexdigest()
+
+
+def sample_fraction(value) -> float | None:
+    """Validate execute_sql's `sample` parameter (None or 1 = no sampling)."""
+    if value is None:
+        return None
+    try:
+        fraction = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid sample fraction: {value!r}")
+    if not 0 < fraction <= 1:
+        raise ValueError(f"sample must be in (0, 1], got {fraction}")
+    return None if fraction == 1 else fraction
+
+
+def sample_tasks(tasks: list, fraction: float, seed: int = 0) -> tuple[list, dict]:
+    """Pick files holding about `fraction` of the planned rows, spread over all partitions.
+
+    Systematic sampling: files are laid end to end — partition by partition,
+    in hash order within each — by record count, and a file is chosen when
+    one of `round(fraction * files)` evenly spaced points falls inside it.
+    Returns the chosen FileScanTasks and a report for the response.
+    """
+    ordered = sorted(tasks, key=lambda task: (
+        task.file.spec_id, repr(task.file.partition), _order(task.file.file_path, seed),
+    ))
+    total_rows = sum(task.file.record_count for task in ordered)
+    points = max(1, round(fraction * len(ordered)))
+    step = total_rows / points if total_rows else 0
+    start = int(_order("start", seed), 16) % 1000 / 1000 * step
+    chosen = []
+    position = 0
+    next_point = start
+    for task in ordered:
+        position += task.file.record_count
+        if step and next_point < position:
+            chosen.append(task)
+            while next_point < position:
+                next_point += step
+
+    sampled_rows = sum(task.file.record_count for task in chosen)
+    return chosen, {
+        "requestedFraction": fraction,
+        "fraction": sampled_rows / total_rows if total_rows else 0.0,
+        "filesSampled": len(chosen),
+        "filesTotal": len(tasks),
+        "rowsSampled": sampled_rows,
+        "estimatedTotalRows": total_rows,
+    }
@@ -1,7 +1,9 @@
 """
 Settings handler — manages application configuration in ~/.icetop/config.json.
 """
+import copy
 import json
+import threading
 from pathlib import Path
 
 CONFIG_DIR = Path.home() / ".icetop"
@@ -21,29 +23,103 @@ DEFAULT_SETTINGS = {
     "pyicebergConfigPath": str(Path.home() / ".pyiceberg.yaml"),
     "pythonPath": "python3",
     "theme": "dark",
+    "metrics": {
+        # Append one JSON line per request to ~/.icetop/metrics.jsonl
+        "logToFile": False,
+        "maxLogBytes": 5 * 1024 * 1024,
+    },
+    "sql": {
+        # "eager" reads tables before running the query; "lazy" hands Polars
+        # lazy Iceberg scans (best for LIMIT / highly selective queries)
+        "engine": "eager",
+        # Above this estimated input size queries run on Polars' streaming
+        # engine and spill to ~/.icetop/spill (0 = half of RAM, -1 = never)
+        "memoryCeilingBytes": 0,
+    },
+    "catalogTree": {
+        # Crawl each browsed catalog's namespace/table tree in the background
+        "crawl": True,
+        # Namespaces listed at once during a crawl
+        "concurrency": 8,
+        # Namespaces nested deeper than this are not crawled
+        "maxDepth": 16,
+        # Re-crawl trees older than this when browsed (0 = only on request)
+        "refreshSeconds": 300,
+    },
+    "cache": {
+        # In-memory budget for scanned tables reused across SQL queries (0 = off)
+        "tableCacheBytes": 1024 * 1024 * 1024,
+        # Finished query results, reused while their tables are unchanged (0 = off)
+        "resultCacheBytes": 256 * 1024 * 1024,
+        # Also keep them as Parquet in ~/.icetop/result-cache across restarts
+        "persistResults": False,
+        # Also keep scanned tables as Arrow files in ~/.icetop/cache across
+        # restarts, memory-mapped on reuse (disk budget below)
+        "diskCache": False,
+        "diskCacheBytes": 20 * 1024 * 1024 * 1024,
+        # Loaded table metadata is reused this long before being revalidated
+        "metadataTtlSeconds": 30,
+        # Server-side result cursors (execute_sql with cursor: true)
+        "maxCursors": 16,
+        "cursorIdleSeconds": 15 * 60,
+    },
 }
 
+_cache_lock = threading.Lock()
+_cached: tuple[tuple | None, dict] | None = None
+
+
+def load_settings() -> dict:
+    """Return config.json merged over DEFAULT_SETTINGS.
+
+    Backend modules call this on hot paths, so the parsed file is cached and
+    re-read only when its mtime changes. Callers must not mutate the result.
+    """
+    global _cached
+    try:
+        stat = CONFIG_PATH.stat()
+        file_key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+    with _cache_lock:
+        if _cached is not None and _cached[0] == file_key:
+            return _cached[1]
+
+    merged = copy.deepcopy(DEFAULT_SETTINGS)
+    if file_key is not None:
+        try:
+            with open(CONFIG_PATH) as f:
+                saved = json.load(f)
+            # Merge with defaults to pick up new fields (one level deep for sections)
+            for key, value in saved.items():
+                if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                    merged[key] = {**merged[key], **value}
+                else:
+                    merged[key] = value
+        except (json.JSONDecodeError, IOError):
+            merged = copy.deepcopy(DEFAULT_SETTINGS)
+
+    with _cache_lock:
+        _cached = (file_key, merged)
+    return merged
+
+
+def _invalidate_settings():
+    global _cached
+    with _cache_lock:
+        _cached = None
+
 
 class SettingsHandler:
     def __init__(self):
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
     def get(self, params: dict) -> dict:
-        if CONFIG_PATH.exists():
-            try:
-                with open(CONFIG_PATH) as f:
-                    saved = json.load(f)
-                # Merge with defaults to pick up new fields
-                merged = {**DEFAULT_SETTINGS, **saved}
-                merged["llm"] = {**DEFAULT_SETTINGS["llm"], **saved.get("llm", {})}
-                merged["database"] = {**DEFAULT_SETTINGS["database"], **saved.get("database", {})}
-                return merged
-            except (json.JSONDecodeError, IOError):
-                return DEFAULT_SETTINGS
-        return DEFAULT_SETTINGS
+        return copy.deepcopy(load_settings())
 
     def update(self, params: dict) -> dict:
         settings = params.get("settings", params)
         with open(CONFIG_PATH, "w") as f:
             json.dump(settings, f, indent=2)
+        _invalidate_settings()
         return {"status": "ok"}
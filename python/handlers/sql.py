@@ -5,16 +5,283 @@ Polars has a built-in SQL engine that's simpler than DataFusion for our
 use case. We read Iceberg tables into Polars DataFrames, register them
 in a Polars SQLContext, then execute SQL directly.
 """
+import contextvars
+import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 import polars as pl
+import pyarrow as pa
+from polars.io.plugins import register_io_source
+from pyiceberg.io.pyarrow import ArrowScan, schema_to_pyarrow
+from handlers.context import RequestCancelled, check_cancelled, current_request
+from handlers.cursors import DEFAULT_PAGE_SIZE, CursorStore, ResultCursor
 from handlers.iceframe_loader import get_iceframe, list_catalog_names
+from handlers.incremental import AppendRange, resolve_range
+from handlers.metadata_answers import answer_from_metadata
+from handlers.metrics import phase
+from handlers.profile import scan_stats, table_totals
+from handlers.pushdown import QueryPushdown, ScanPushdown
+from handlers.result_cache import ResultCache, is_deterministic, result_key
+from handlers.sampling import sample_fraction, sample_tasks
+from handlers.results import RESULT_FORMATS, describe_columns, encode_result, release_arrow_result, sweep_arrow_results
+from handlers.settings import CONFIG_DIR, load_settings
+from handlers.table_cache import TableCache, scan_key
+from handlers.table_metadata import load_table
+from handlers.table_metadata import stats as table_metadata_stats
+
+# How often a background collect() checks whether its request was cancelled
+_CANCEL_POLL_S = 0.05
+
+SQL_ENGINES = ("eager", "lazy")
+
+# Where Polars' streaming engine spills when a query runs out-of-core
+SPILL_DIR = CONFIG_DIR / "spill"
+
+# Decoded Arrow data is typically this many times the Parquet bytes on disk
+_DECODED_EXPANSION = 4
+
+# Rows per `sql:batch` notification in streaming mode
+DEFAULT_STREAM_BATCH_ROWS = 1000
+
+# Tables of one query load concurrently on this many threads (shared by all
+# queries, on top of the server's scan pool)
+_IO_WORKERS = 4
+_io_pool: ThreadPoolExecutor | None = None
+_io_pool_lock = threading.Lock()
+
+
+class _LoadAborted(Exception):
+    """A sibling table load failed, so this one stopped early."""
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    with _io_pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=_IO_WORKERS, thread_name_prefix="sql-io")
+        return _io_pool
+
+
+def _run_parallel(tasks: dict, abort: threading.Event) -> dict:
+    """Run `{key: fn}` on the I/O pool and return `{key: result}`.
+
+    Fails fast: the first exception sets `abort` (which running loads poll
+    between batches), cancels loads that haven't started, waits for the rest
+    to stop and is re-raised. Each task runs in a copy of the caller's
+    context, so phases and cancellation still see the current request.
+    """
+    pool = _get_io_pool()
+    futures = {pool.submit(contextvars.copy_context().run, fn): key for key, fn in tasks.items()}
+    done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+    errors = [f.exception() for f in done if not f.cancelled() and f.exception() is not None]
+    if errors:
+        abort.set()
+        for future in pending:
+            future.cancel()
+        wait(pending)
+        # Prefer the root cause (or a cancel) over siblings that merely stopped
+        raise next((e for e in errors if not isinstance(e, _LoadAborted)), errors[0])
+    return {key: future.result() for future, key in futures.items()}
+
+
+def _plan_scan(tbl, pushdown: ScanPushdown, stats: dict | None = None,
+               appends: AppendRange | None = None, sample: float | None = None,
+               sample_seed: int = 0, sample_report: dict | None = None):
+    """Plan one table scan: returns (scan, projection, tasks), tasks None when there's nothing to read.
+
+    Pruning stats are taken before sampling, so files left out by the sample
+    show up as `dataFilesSampledOut` rather than as pruned.
+    """
+    selected_fields = tuple(pushdown.columns) if pushdown.columns else ("*",)
+    if appends is None:
+        scan = tbl.scan(row_filter=pushdown.row_filter, selected_fields=selected_fields)
+    else:
+        scan = tbl.incremental_append_scan(
+            from_snapshot_id_exclusive=appends.from_snapshot_id,
+            to_snapshot_id_inclusive=appends.to_snapshot_id,
+            row_filter=pushdown.row_filter,
+            selected_fields=selected_fields,
+        )
+    projection = scan.projection()
+    if appends is not None and appends.empty:
+        return scan, projection, None
+    with phase("plan"):
+        tasks = list(scan.plan_files())
+    if stats is not None:
+        if appends is None:
+            stats.update(scan_stats(tbl, scan, tasks))
+        else:
+            stats.update({
+                "dataFiles": len(tasks),
+                "bytesRead": sum(task.file.file_size_in_bytes for task in tasks),
+                "rowsInFiles": sum(task.file.record_count for task in tasks),
+            })
+    if sample is not None:
+        planned = len(tasks)
+        tasks, report = sample_tasks(tasks, sample, sample_seed)
+        if sample_report is not None:
+            sample_report.update(report)
+        if stats is not None:
+            stats.update({
+                "dataFilesSampledOut": planned - len(tasks),
+                "bytesRead": sum(task.file.file_size_in_bytes for task in tasks),
+                "rowsInFiles": sum(task.file.record_count for task in tasks),
+            })
+    return scan, projection, tasks
+
+
+def _read_table(tbl, pushdown: ScanPushdown, abort: threading.Event | None = None,
+                stats: dict | None = None, appends: AppendRange | None = None,
+                sample: float | None = None, sample_seed: int = 0,
+                sample_report: dict | None = None) -> pl.DataFrame:
+    """Scan an Iceberg table record batch by record batch.
+
+    Only the pushed-down columns are read, and the row filter lets pyiceberg
+    prune manifests, files and row groups. Checks for cancellation (and for
+    `abort`, set when another table of the same query failed) between
+    batches so a cancelled query stops reading and lets go of what it read.
+    Pass `stats` to have it filled with pruning and I/O counts (see
+    handlers/profile.py). With `appends` only the files added by its append
+    snapshots are read (see handlers/incremental.py); with `sample` only
+    that fraction of the planned files, described in `sample_report` (see
+    handlers/sampling.py).
+    """
+    scan, projection, tasks = _plan_scan(tbl, pushdown, stats, appends, sample, sample_seed, sample_report)
+    if tasks is None:
+        return pl.from_arrow(schema_to_pyarrow(projection).empty_table())
+    reader = ArrowScan(tbl.metadata, tbl.io, projection, scan.row_filter, scan.case_sensitive).to_record_batches(tasks)
+    batches = []
+    try:
+        with phase("scan"):
+            for batch in reader:
+                check_cancelled()
+                if abort is not None and abort.is_set():
+                    raise _LoadAborted()
+                batches.append(batch)
+            if not batches:
+                return pl.from_arrow(schema_to_pyarrow(projection).empty_table())
+            # Files written by different engines may differ in e.g. string vs large_string
+            return pl.from_arrow(pa.concat_tables(
+                [pa.Table.from_batches([batch]) for batch in batches], promote_options="permissive"
+            ))
+    finally:
+        batches.clear()
+        reader.close()
+
+
+def _stream_sampled_table(tbl, pushdown: ScanPushdown, stats: dict | None, appends: AppendRange | None,
+                          sample: float, sample_seed: int, sample_report: dict | None) -> pl.LazyFrame:
+    """A lazy scan of the sampled files only, for samples too big to read eagerly.
+
+    Batches are produced as the streaming engine pulls them, so the sample
+    runs under the memory ceiling like an unsampled lazy scan.
+    """
+    scan, projection, tasks = _plan_scan(tbl, pushdown, stats, appends, sample, sample_seed, sample_report)
+    empty = pl.from_arrow(schema_to_pyarrow(projection).empty_table())
+    if tasks is None:
+        return empty.lazy()
+    schema = empty.schema
+
+    def batches(with_columns, predicate, n_rows, batch_size):
+        reader = ArrowScan(tbl.metadata, tbl.io, projection, scan.row_filter,
+                           scan.case_sensitive).to_record_batches(tasks)
+        try:
+            for batch in reader:
+                df = pl.from_arrow(batch)
+                if with_columns is not None:
+                    df = df.select(with_columns)
+                if predicate is not None:
+                    df = df.filter(predicate)
+                if n_rows is not None:
+                    df = df.head(n_rows)
+                    n_rows -= df.height
+                yield df
+                if n_rows is not None and n_rows <= 0:
+                    break
+        finally:
+            reader.close()
+
+    return register_io_source(batches, schema=schema, explain_name="SAMPLED ICEBERG SCAN")
+
+
+def _collect(lf: pl.LazyFrame, engine: str = "auto") -> pl.DataFrame:
+    """Collect a LazyFrame on Polars' thread pool so a cancel can abort it mid-query."""
+    context = current_request()
+    if context is None:
+        return lf.collect(engine=engine)
+    query = lf.collect(background=True, engine=engine)
+    while True:
+        df = query.fetch()
+        if df is not None:
+            return df
+        if context.wait(_CANCEL_POLL_S):
+            query.cancel()
+            raise RequestCancelled(f"Request {context.request_id} was cancelled")
+
+
+def _memory_ceiling() -> int:
+    """Settings `sql.memoryCeilingBytes`; 0 means half of physical memory, -1 disables."""
+    ceiling = int(load_settings().get("sql", {}).get("memoryCeilingBytes", 0))
+    if ceiling == 0:
+        try:
+            return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2
+        except (AttributeError, ValueError, OSError):  # Windows
+            return -1
+    return ceiling
+
+
+def _estimate_input_bytes(tbl, columns: list[str] | None, appends: AppendRange | None = None) -> int:
+    """In-memory size of scanning `tbl`, from its current snapshot summary.
+
+    Ignores file pruning by filters, so it errs on the large side. For an
+    incremental scan only the files its appends added count.
+    """
+    snapshot = tbl.current_snapshot()
+    if appends is not None:
+        on_disk = appends.added_bytes
+    elif snapshot is None or snapshot.summary is None:
+        return 0
+    else:
+        on_disk = int(snapshot.summary.get("total-files-size") or 0)
+    if columns:
+        on_disk = on_disk * len(columns) // max(1, len(tbl.schema().fields))
+    return on_disk * _DECODED_EXPANSION
+
+
+def _output_schema(sql: str, tables: dict) -> pl.Schema:
+    """Result schema of `sql` over empty frames shaped like `tables` ({alias: Table})."""
+    ctx = pl.SQLContext({
+        alias: pl.from_arrow(schema_to_pyarrow(tbl.schema()).empty_table())
+        for alias, tbl in tables.items()
+    })
+    return ctx.execute(sql).collect_schema()
+
+
+def _iter_batches(lf: pl.LazyFrame, batch_size: int):
+    """Yield result chunks as the streaming engine produces them."""
+    if hasattr(lf, "collect_batches"):
+        yield from lf.collect_batches(chunk_size=batch_size)
+    else:
+        # Older Polars: no incremental output, but the renderer still gets batches
+        yield from _collect(lf).iter_slices(batch_size)
 
 
 class SQLHandler:
-    def __init__(self):
+    def __init__(self, notify=None):
+        # notify(notification, params) writes through the server's serialized writer
+        self._notify = notify
         self._history: list[dict] = []
+        self._history_lock = threading.Lock()
+        self._table_cache = TableCache()
+        self._result_cache = ResultCache()
+        self._cursors = CursorStore()
+        sweep_arrow_results()
+        # Polars reads this when the streaming engine first needs to spill
+        SPILL_DIR.mkdir(parents=True, exist_ok=True)
+        os.environ.setdefault("POLARS_TEMP_DIR", str(SPILL_DIR))
 
     @staticmethod
     def _strip_catalog_prefix(query: str, catalog: str) -> str:
@@ -58,6 +325,38 @@ class SQLHandler:
     def execute(self, params: dict) -> dict:
         catalog = params["catalog"]
         query = params["query"]
+        # "rows" (default), "columnar" or "arrow" — see handlers/results.py
+        result_format = params.get("resultFormat", "rows")
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown resultFormat: {result_format}")
+        # Streaming mode: rows go out as `sql:batch` notifications while the
+        # query runs; the response is only the summary
+        stream = bool(params.get("stream"))
+        batch_size = int(params.get("batchSize", DEFAULT_STREAM_BATCH_ROWS))
+        if stream and (result_format == "arrow" or params.get("cursor")):
+            raise ValueError("stream can't be combined with cursor or resultFormat 'arrow'")
+        # Skip the result cache lookup (the fresh result still replaces the entry)
+        bypass_cache = bool(params.get("bypassCache"))
+        # Return (and keep in history) a per-phase / per-table breakdown
+        want_profile = bool(params.get("profile"))
+        # Answer COUNT/MIN/MAX-only queries from manifest stats when exact
+        use_metadata = params.get("metadataAnswers", True) is not False
+        # {ref: {"fromSnapshotId", "toSnapshotId"?}}: read only rows appended
+        # in that range (see handlers/incremental.py)
+        incremental = params.get("incremental") or {}
+        if not isinstance(incremental, dict):
+            raise ValueError("incremental must map table refs to snapshot ranges")
+        # "eager": scan each table up front (pushdown + table cache);
+        # "lazy": register lazy Iceberg scans and let Polars plan the reads
+        engine = params.get("engine") or load_settings().get("sql", {}).get("engine", "eager")
+        if engine not in SQL_ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        # Read about this fraction of each table's files (see handlers/sampling.py);
+        # the files are picked here, so sampled queries always read eagerly
+        sample = sample_fraction(params.get("sample"))
+        sample_seed = int(params.get("sampleSeed") or 0)
+        if sample is not None:
+            engine = "eager"
 
         # Step 1: Strip the selected catalog prefix from the query
         known_catalogs = list_catalog_names()
@@ -83,26 +382,29 @@ class SQLHandler:
 
         start = time.time()
 
+        pushdown = {}
+        cache_report = {}
+        table_loads = {}
+        execution_mode = "in-memory"
+        result_cache_hit = False
+        metadata_answer = False
+        append_ranges: dict[str, AppendRange] = {}
+        sample_reports = {}
+        table_profiles = {}
+        polars_plan = None
+        estimated_bytes = None
+        memory_ceiling = None
+        df = None
+        batches = None
         if table_refs:
             # Use Polars SQL context instead of DataFusion
             ctx = pl.SQLContext()
 
-            # Step 3: Read each table and register with flat alias
-            alias_map = {}
-            for ref in table_refs:
-                alias = self._make_alias(ref)
-                alias_map[ref] = alias
-                # Determine which catalog to use for this table
-                effective_catalog = ref_catalog_map.get(ref, catalog)
-                ice = get_iceframe(effective_catalog)
-                print(f"[SQL] Loading table '{ref}' from catalog '{effective_catalog}' as '{alias}'", file=sys.stderr)
-                try:
-                    tbl_df = ice.read_table(ref)
-                    ctx.register(alias, tbl_df.lazy())
-                    print(f"[SQL] Registered '{alias}' ({tbl_df.height} rows, {len(tbl_df.columns)} cols)", file=sys.stderr)
-                except Exception as e:
-                    print(f"[SQL] ERROR loading '{ref}' from catalog '{effective_catalog}': {e}", file=sys.stderr)
-                    raise RuntimeError(f"Could not load table '{effective_catalog}.{ref}': {e}")
+            # Step 3: Load every table's metadata, then read only what the
+            # query needs (see handlers/pushdown.py). Both stages run the
+            # tables concurrently, across catalogs too.
+            alias_map = {ref: self._make_alias(ref) for ref in table_refs}
+            catalog_for = {ref: ref_catalog_map.get(ref, catalog) for ref in table_refs}
 
             # Step 4: Rewrite SQL to use flat aliases
             rewritten_sql = cleaned_query
@@ -114,41 +416,375 @@ class SQLHandler:
                 )
             print(f"[SQL] Rewritten: {rewritten_sql}", file=sys.stderr)
 
-            # Step 5: Execute via Polars SQL context
-            result_lf = ctx.execute(rewritten_sql)
-            df = result_lf.collect()
+            abort = threading.Event()
+
+            def load_metadata(ref):
+                started = time.perf_counter()
+                try:
+                    with phase("catalog_load"):
+                        # Always revalidated: queries must see the latest commit
+                        tbl = load_table(catalog_for[ref], ref, max_age=0)
+                except Exception as e:
+                    print(f"[SQL] ERROR loading '{ref}' from catalog '{catalog_for[ref]}': {e}", file=sys.stderr)
+                    raise RuntimeError(f"Could not load table '{catalog_for[ref]}.{ref}': {e}")
+                return tbl, int((time.perf_counter() - started) * 1000)
+
+            loaded = _run_parallel({ref: (lambda r=ref: load_metadata(r)) for ref in table_refs}, abort)
+            tables = {ref: tbl for ref, (tbl, _) in loaded.items()}
+            for ref, (_, metadata_ms) in loaded.items():
+                table_loads[ref] = {"catalog": catalog_for[ref], "metadataMs": metadata_ms}
+
+            for requested, spec in incremental.items():
+                ref = requested if requested in tables else self._resolve_catalog_for_ref(requested, catalog)[1]
+                if ref not in tables:
+                    raise ValueError(f"incremental names '{requested}', which the query doesn't read")
+                append_ranges[ref] = resolve_range(tables[ref], spec)
+                print(f"[SQL] Incremental scan of '{ref}': {append_ranges[ref].describe()}", file=sys.stderr)
+
+            # Identical SQL over unchanged snapshots: reuse the stored result
+            # The cleaned query: each table's catalog is already part of the key
+            cache_key = result_key(
+                cleaned_query,
+                {ref: (catalog_for[ref], tbl) for ref, tbl in tables.items()},
+                {ref: (r.from_snapshot_id, r.to_snapshot_id) for ref, r in append_ranges.items()},
+            )
+            # Sampled results aren't kept: their per-table report has to come from
+            # planning. Nor are results of random()/now()/... queries.
+            cacheable = sample is None and is_deterministic(cleaned_query)
+            if not bypass_cache and cacheable:
+                with phase("result_cache"):
+                    df = self._result_cache.get(cache_key)
+            result_cache_hit = df is not None
+            if result_cache_hit:
+                print(f"[SQL] Result cache hit ({df.height} rows)", file=sys.stderr)
+                if stream:
+                    schema = df.clear()
+                    batches = df.iter_slices(batch_size)
+                    df = None
+            else:
+                analysis = QueryPushdown(cleaned_query, table_refs)
+                pushdown = analysis.plan({ref: tbl.schema() for ref, tbl in tables.items()})
+                if len(tables) == 1 and use_metadata and not append_ranges and sample is None:
+                    # COUNT/MIN/MAX over one table: try the manifests first
+                    ref, tbl = next(iter(tables.items()))
+                    with phase("metadata_answer"):
+                        df = answer_from_metadata(
+                            cleaned_query, tbl, pushdown[ref], analysis.where_conjuncts,
+                            lambda: _output_schema(rewritten_sql, {alias_map[ref]: tbl}),
+                        )
+                metadata_answer = df is not None
+                if metadata_answer:
+                    print(f"[SQL] Answered from table metadata ({df.height} rows)", file=sys.stderr)
+                    if stream:
+                        schema = df.clear()
+                        batches = df.iter_slices(batch_size)
+                        df = None
+            if not result_cache_hit and not metadata_answer:
+                estimated_bytes = sum(
+                    _estimate_input_bytes(tbl, pushdown[ref].columns, append_ranges.get(ref))
+                    for ref, tbl in tables.items()
+                )
+                if sample is not None:
+                    estimated_bytes = int(estimated_bytes * sample)
+                memory_ceiling = _memory_ceiling()
+                if 0 < memory_ceiling < estimated_bytes:
+                    # Too big to hold: stream from lazy scans, spilling to SPILL_DIR
+                    # (sampled queries stream just their sampled files)
+                    print(f"[SQL] Estimated input {estimated_bytes} bytes exceeds the memory ceiling "
+                          f"({memory_ceiling}); using the streaming engine", file=sys.stderr)
+                    execution_mode = "streaming"
+                    if sample is None:
+                        engine = "lazy"
+
+                if sample is not None and execution_mode == "streaming":
+                    sample_reports = {ref: {} for ref in table_refs}
+                    for ref, tbl in tables.items():
+                        stats = {} if want_profile else None
+                        lf = _stream_sampled_table(tbl, pushdown[ref], stats, append_ranges.get(ref),
+                                                   sample, sample_seed, sample_reports[ref])
+                        ctx.register(alias_map[ref], lf)
+                        if want_profile:
+                            table_profiles[ref] = {"engine": "lazy", **stats}
+                        table_loads[ref]["engine"] = "lazy"
+                        print(f"[SQL] Registered '{alias_map[ref]}' as a streamed sample", file=sys.stderr)
+                elif engine == "lazy":
+                    # Polars plans the scan itself: its projection, predicate and
+                    # slice pushdown reach the Parquet reader (deletes applied)
+                    pushdown = {}
+                    for ref, tbl in tables.items():
+                        appends = append_ranges.get(ref)
+                        if appends is None:
+                            lf = pl.scan_iceberg(tbl)
+                        elif appends.empty:
+                            lf = pl.from_arrow(schema_to_pyarrow(tbl.schema()).empty_table()).lazy()
+                        else:
+                            lf = pl.scan_iceberg(
+                                tbl,
+                                from_snapshot_id_exclusive=appends.from_snapshot_id,
+                                to_snapshot_id_inclusive=appends.to_snapshot_id,
+                            )
+                        ctx.register(alias_map[ref], lf)
+                        if want_profile:
+                            table_profiles[ref] = {"engine": "lazy", **table_totals(tbl)}
+                        table_loads[ref]["engine"] = "lazy"
+                        print(f"[SQL] Registered '{alias_map[ref]}' as a lazy Iceberg scan", file=sys.stderr)
+                else:
+                    for ref in table_refs:
+                        print(f"[SQL] Loading table '{ref}' from catalog '{catalog_for[ref]}' as '{alias_map[ref]}' "
+                              f"(columns={pushdown[ref].columns or '*'}, filters={pushdown[ref].filters})", file=sys.stderr)
+
+                    def load_data(ref):
+                        tbl = tables[ref]
+                        started = time.perf_counter()
+                        appends = append_ranges.get(ref)
+                        # Incremental and sampled reads are small and change with every
+                        # refresh or fraction: not worth evicting full scans from the
+                        # table cache for
+                        key = None if appends or sample is not None else scan_key(
+                            catalog_for[ref], ref, tbl, pushdown[ref].columns, pushdown[ref].row_filter
+                        )
+                        tbl_df = self._table_cache.get(key) if key else None
+                        report = {"hit": tbl_df is not None}
+                        if tbl_df is None:
+                            try:
+                                tbl_df = _read_table(tbl, pushdown[ref], abort, scan_profiles.get(ref), appends,
+                                                     sample, sample_seed, sample_reports.get(ref))
+                            except Exception as e:
+                                if isinstance(e, _LoadAborted):
+                                    raise
+                                print(f"[SQL] ERROR loading '{ref}' from catalog '{catalog_for[ref]}': {e}", file=sys.stderr)
+                                raise RuntimeError(f"Could not load table '{catalog_for[ref]}.{ref}': {e}")
+                            report["cached"] = bool(key) and self._table_cache.put(key, tbl_df)
+                        report["bytes"] = tbl_df.estimated_size()
+                        return tbl_df, report, int((time.perf_counter() - started) * 1000)
+
+                    # Filled by _read_table for tables that are actually scanned
+                    scan_profiles = {ref: {} for ref in table_refs} if want_profile else {}
+                    sample_reports = {ref: {} for ref in table_refs} if sample is not None else {}
+                    scanned = _run_parallel({ref: (lambda r=ref: load_data(r)) for ref in table_refs}, abort)
+                    for ref, (tbl_df, report, scan_ms) in scanned.items():
+                        if want_profile:
+                            table_profiles[ref] = {
+                                "engine": "eager",
+                                "tableCacheHit": report["hit"],
+                                **scan_profiles[ref],
+                                "rowsLoaded": tbl_df.height,
+                                "bytesInMemory": report["bytes"],
+                            }
+                        cache_report[ref] = report
+                        table_loads[ref].update({"scanMs": scan_ms, "rows": tbl_df.height})
+                        ctx.register(alias_map[ref], tbl_df.lazy())
+                        source = "table cache" if report["hit"] else f"{scan_ms}ms scan"
+                        print(f"[SQL] Registered '{alias_map[ref]}' ({tbl_df.height} rows, "
+                              f"{len(tbl_df.columns)} cols, {source})", file=sys.stderr)
+
+                # Step 5: Execute via Polars SQL context
+                with phase("sql_execute"):
+                    result_lf = ctx.execute(rewritten_sql)
+                    if want_profile:
+                        with phase("explain"):
+                            polars_plan = result_lf.explain()
+                    if stream:
+                        schema = pl.DataFrame(schema=result_lf.collect_schema())
+                        batches = _iter_batches(result_lf, batch_size)
+                    else:
+                        df = _collect(result_lf, "streaming" if execution_mode == "streaming" else "auto")
+                if df is not None and cacheable:
+                    self._result_cache.put(cache_key, df)
         else:
             # No table refs (e.g. SELECT 1+1), try DataFusion directly
             ice = get_iceframe(catalog)
-            df = ice.query_datafusion(cleaned_query)
-
-        elapsed_ms = int((time.time() - start) * 1000)
-        print(f"[SQL] Done in {elapsed_ms}ms, {df.height} rows", file=sys.stderr)
-
-        rows = df.to_dicts()
-        columns = [
-            {"name": col, "type": str(df.schema[col])}
-            for col in df.columns
-        ]
-
-        result = {
-            "columns": columns,
-            "rows": rows,
-            "rowCount": len(rows),
-            "executionTimeMs": elapsed_ms,
+            with phase("sql_execute"):
+                df = ice.query_datafusion(cleaned_query)
+            if stream:
+                schema = df.clear()
+                batches = df.iter_slices(batch_size)
+                df = None
+
+        if batches is not None:
+            with phase("stream"):
+                result = self._stream(schema, batches, result_format)
+            row_count = result["rowCount"]
+            elapsed_ms = int((time.time() - start) * 1000)
+            print(f"[SQL] Streamed {row_count} rows in {result['batchCount']} batches, {elapsed_ms}ms", file=sys.stderr)
+        else:
+            row_count = df.height
+            elapsed_ms = int((time.time() - start) * 1000)
+            print(f"[SQL] Done in {elapsed_ms}ms, {row_count} rows", file=sys.stderr)
+            if params.get("cursor"):
+                # Keep the frame server-side; the grid pages through fetch_rows
+                cursor = self._cursors.open(df, query)
+                result = self._page(cursor, 0, params.get("pageSize", DEFAULT_PAGE_SIZE), result_format)
+            else:
+                with phase("serialize"):
+                    result = encode_result(df, result_format)
+        result["executionTimeMs"] = elapsed_ms
+        result["resultCache"] = {"hit": result_cache_hit, "bytesHeld": self._result_cache.bytes_held}
+        result["metadataAnswer"] = metadata_answer
+        result["engine"] = engine
+        result["executionMode"] = execution_mode
+        result["estimatedInputBytes"] = estimated_bytes
+        result["memoryCeilingBytes"] = memory_ceiling
+        result["tableLoads"] = table_loads
+        result["incremental"] = {ref: r.describe() for ref, r in append_ranges.items()}
+        result["sample"] = None
+        if sample is not None:
+            result["sample"] = {"fraction": sample, "seed": sample_seed, "tables": sample_reports}
+        result["pushdown"] = {ref: plan.describe() for ref, plan in pushdown.items()}
+        result["tableCache"] = {
+            "tables": cache_report,
+            "bytesHeld": self._table_cache.bytes_held,
+        }
+        profile = None
+        if want_profile:
+            context = current_request()
+            # Polars reads lazy scans itself, so their I/O isn't known here
+            measured = all(t["engine"] == "eager" for t in table_profiles.values())
+            profile = {
+                "phasesMs": {name: round(ms, 2) for name, ms in (context.phases if context else {}).items()},
+                "tables": table_profiles,
+                # Record counts of the data files read (table cache hits read none)
+                "rowsScanned": sum(t.get("rowsInFiles", 0) for t in table_profiles.values()) if measured else None,
+                # Rows left after the pushed-down row filter, before the query ran
+                "rowsLoaded": sum(t["rowsLoaded"] for t in table_profiles.values()) if measured else None,
+                "rowsReturned": row_count,
+                "bytesRead": sum(t.get("bytesRead", 0) for t in table_profiles.values()) if measured else None,
+                "plan": polars_plan,
+            }
+            result["profile"] = profile
+
+        with self._history_lock:
+            self._history.insert(0, {
+                "query": query,
+                "catalog": catalog,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "rowCount": row_count,
+                "executionTimeMs": elapsed_ms,
+                "serializationTimeMs": result["serializationTimeMs"],
+                "cacheHit": result_cache_hit,
+                "metadataAnswer": metadata_answer,
+                "profile": profile,
+                "error": None,
+            })
+            self._history = self._history[:100]
+
+        return result
+
+    def _stream(self, schema: pl.DataFrame, batches, result_format: str) -> dict:
+        """Send each batch as a `sql:batch` notification; return the summary response."""
+        context = current_request()
+        request_id = context.request_id if context else None
+        start = time.perf_counter()
+        first_batch_ms = None
+        serialization_ms = 0
+        total = 0
+        seq = 0
+        for batch in batches:
+            check_cancelled()
+            if batch.height == 0:
+                continue
+            encoded = encode_result(batch, result_format)
+            serialization_ms += encoded["serializationTimeMs"]
+            if seq > 0:
+                # Column metadata only travels with the first batch (and the summary)
+                del encoded["columns"]
+            if self._notify:
+                self._notify("sql:batch", {"requestId": request_id, "seq": seq, "offset": total, **encoded})
+            if first_batch_ms is None:
+                first_batch_ms = int((time.perf_counter() - start) * 1000)
+            total += batch.height
+            seq += 1
+        return {
+            "columns": describe_columns(schema),
+            "rowCount": total,
+            "resultFormat": result_format,
+            "streamed": True,
+            "batchCount": seq,
+            "firstBatchMs": first_batch_ms,
+            "serializationTimeMs": serialization_ms,
         }
 
-        self._history.insert(0, {
-            "query": query,
-            "catalog": catalog,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "rowCount": len(rows),
-            "executionTimeMs": elapsed_ms,
-            "error": None,
-        })
-        self._history = self._history[:100]
+    # ── Cursors ──
 
+    @staticmethod
+    def _page(cursor: ResultCursor, offset: int, limit: int, result_format: str) -> dict:
+        """Encode `limit` rows of the cursor's current view starting at `offset`."""
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must be non-negative")
+        with phase("serialize"):
+            result = encode_result(cursor.view.slice(offset, limit), result_format)
+        result.update(cursor.describe())
+        result["offset"] = offset
         return result
 
+    def fetch_rows(self, params: dict) -> dict:
+        cursor = self._cursors.get(params["cursor"])
+        with cursor.lock:
+            return self._page(
+                cursor,
+                params.get("offset", 0),
+                params.get("limit", DEFAULT_PAGE_SIZE),
+                params.get("resultFormat", "rows"),
+            )
+
+    def sort_result(self, params: dict) -> dict:
+        """Re-sort a cursor by `keys: [{column, descending}]` (empty = original order)."""
+        cursor = self._cursors.get(params["cursor"])
+        keys = params.get("keys") or []
+        for key in keys:
+            if key.get("column") not in cursor.base.columns:
+                raise ValueError(f"Unknown sort column: {key.get('column')}")
+        with cursor.lock:
+            cursor.sort = [{"column": k["column"], "descending": bool(k.get("descending"))} for k in keys]
+            with phase("sort"):
+                cursor.refresh_view()
+            return self._page(cursor, 0, params.get("limit", DEFAULT_PAGE_SIZE), params.get("resultFormat", "rows"))
+
+    def filter_result(self, params: dict) -> dict:
+        """Filter a cursor by a SQL boolean expression over its columns (empty = no filter)."""
+        cursor = self._cursors.get(params["cursor"])
+        expr = (params.get("expr") or "").strip() or None
+        with cursor.lock:
+            previous = cursor.filter
+            cursor.filter = expr
+            try:
+                with phase("filter"):
+                    cursor.refresh_view()
+            except (pl.exceptions.PolarsError, ValueError) as e:
+                cursor.filter = previous
+                raise ValueError(f"Invalid filter expression: {e}")
+            return self._page(cursor, 0, params.get("limit", DEFAULT_PAGE_SIZE), params.get("resultFormat", "rows"))
+
+    def close_cursor(self, params: dict) -> dict:
+        return {"closed": self._cursors.close(params["cursor"])}
+
+    # ── Caches ──
+
+    def cache_status(self, params: dict) -> dict:
+        """Table cache (memory and disk tiers) and result cache usage."""
+        return {
+            "tableCache": self._table_cache.stats(),
+            "resultCache": {"bytesHeld": self._result_cache.bytes_held},
+            "tableMetadata": table_metadata_stats(),
+        }
+
+    def cache_clear(self, params: dict) -> dict:
+        """Empty the table cache, the result cache or both ("tables", "results", "all"),
+        including their files on disk."""
+        target = params.get("target") or "all"
+        if target not in ("tables", "results", "all"):
+            raise ValueError(f"Unknown cache target: {target}")
+        if target in ("tables", "all"):
+            self._table_cache.clear(disk=True)
+        if target in ("results", "all"):
+            self._result_cache.clear()
+        print(f"[SQL] Cleared cache: {target}", file=sys.stderr)
+        return self.cache_status({})
+
+    def release_result(self, params: dict) -> dict:
+        """Delete the side-channel file of a `resultFormat: "arrow"` result."""
+        return {"released": release_arrow_result(params["handle"])}
+
     def get_history(self, params: dict) -> list[dict]:
-        return self._history
+        with self._history_lock:
+            return list(self._history)
@@ -0,0 +1,122 @@
+"""
+Table cache — scanned Iceberg data kept in memory between SQL queries.
+
+Entries are keyed by what determines the scan's output: catalog, table,
+snapshot id, schema id, the projected columns and the pushed-down filter
+(see handlers/pushdown.py). The snapshot and schema ids come from the
+table metadata execute_sql loads anyway, so a new commit or schema change
+simply misses and the table's older entries are dropped.
+
+Memory is bounded by settings `cache.tableCacheBytes` (0 disables the
+cache); least recently used entries are evicted first. With
+`cache.diskCache` entries are also written to disk and found there after a
+restart (see handlers/disk_cache.py).
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import polars as pl
+
+from handlers.disk_cache import DiskCache
+from handlers.settings import DEFAULT_SETTINGS, load_settings
+
+DEFAULT_TABLE_CACHE_BYTES = DEFAULT_SETTINGS["cache"]["tableCacheBytes"]
+
+
+def scan_key(catalog: str, ref: str, tbl, columns: list[str] | None, row_filter) -> tuple:
+    """Cache key for scanning `tbl` (a pyiceberg Table) with the given pushdown."""
+    metadata = tbl.metadata
+    return (
+        catalog,
+        ref,
+        metadata.current_snapshot_id,
+        metadata.current_schema_id,
+        tuple(columns) if columns else None,
+        repr(row_filter),
+    )
+
+
+class TableCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[pl.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk = DiskCache()
+
+    @staticmethod
+    def budget() -> int:
+        return int(load_settings().get("cache", {}).get("tableCacheBytes", DEFAULT_TABLE_CACHE_BYTES))
+
+    @property
+    def bytes_held(self) -> int:
+        return self._bytes
+
+    def get(self, key: tuple) -> pl.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        df = self.disk.get(key)
+        with self._lock:
+            if df is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, df)
+        return df
+
+    def put(self, key: tuple, df: pl.DataFrame) -> bool:
+        """Store `df` under `key` (and on disk when enabled); returns False if
+        it doesn't fit the memory budget."""
+        self.disk.put(key, df)
+        return self._remember(key, df)
+
+    def _remember(self, key: tuple, df: pl.DataFrame) -> bool:
+        budget = self.budget()
+        size = df.estimated_size()
+        with self._lock:
+            # A table that moved to a new snapshot/schema never hits its old entries again
+            stale = [k for k in self._entries if k[:2] == key[:2] and k[2:4] != key[2:4]]
+            for k in stale:
+                self._drop(k)
+            if key in self._entries:
+                self._drop(key)
+            fits = size <= budget
+            # Also shrinks the cache when the budget was lowered in settings
+            while self._entries and self._bytes + (size if fits else 0) > budget:
+                evicted = next(iter(self._entries))
+                self._drop(evicted)
+                print(f"[TableCache] Evicted {evicted[0]}.{evicted[1]}", file=sys.stderr)
+            if not fits:
+                return False
+            self._entries[key] = (df, size)
+            self._bytes += size
+            return True
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if disk:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "entries": len(self._entries),
+                "bytesHeld": self._bytes,
+                "budgetBytes": self.budget(),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+        stats["disk"] = self.disk.stats()
+        return stats
+
+    def _drop(self, key: tuple):
+        _, size = self._entries.pop(key)
+        self._bytes -= size
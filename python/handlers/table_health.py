@@ -0,0 +1,222 @@
+"""
+Table health — compaction debt read from a table's manifests.
+
+table_health() aggregates the file listing get_files uses (see
+handlers/data_files.py) with Polars, plus the manifest list and the
+snapshot summaries of the current snapshot's lineage:
+
+- data file size histogram, and files below the target file size
+  (`write.target-file-size-bytes`, or the caller's targetFileSize)
+- position/equality delete files and how they compare to the data
+- files, bytes and records per partition, and how uneven they are
+  (skew = largest partition / median partition)
+- data and delete manifests, and manifests below
+  `commit.manifest.target-size-bytes`
+- totals after each snapshot, for growth over time
+
+No data file is opened, so the cost is one read of each manifest — and
+none when get_files already listed the same snapshot.
+"""
+import polars as pl
+from pyiceberg.manifest import ManifestContent
+from pyiceberg.table.snapshots import ancestors_of
+
+from handlers.data_files import file_entries
+
+# Iceberg defaults for the properties that set the targets
+DEFAULT_TARGET_FILE_SIZE = 512 << 20
+DEFAULT_TARGET_MANIFEST_SIZE = 8 << 20
+
+# Files under this share of the target are what rewrite_data_files picks up
+# by default (its min-file-size-bytes)
+COMPACTION_THRESHOLD = 0.75
+
+# Lower edges of the size histogram buckets
+_HISTOGRAM_EDGES = [0, 1 << 20, 8 << 20, 32 << 20, 64 << 20, 128 << 20, 256 << 20, 512 << 20, 1 << 30]
+
+# Partitions listed in the report, largest first
+_TOP_PARTITIONS = 10
+
+# Most recent snapshots in the growth series
+_GROWTH_POINTS = 100
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024:
+            return f"{n}{unit}"
+        n //= 1024
+    return f"{n}TiB"
+
+
+def _property_bytes(tbl, name: str, default: int) -> int:
+    try:
+        return int(tbl.properties.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _spread(column: pl.Series) -> dict:
+    if column.is_empty():
+        return {"min": 0, "median": 0, "max": 0}
+    return {"min": int(column.min()), "median": float(column.median()), "max": int(column.max())}
+
+
+def _skew(column: pl.Series) -> float | None:
+    median = column.median() if not column.is_empty() else None
+    return round(float(column.max()) / median, 2) if median else None
+
+
+def _histogram(data: pl.DataFrame) -> list[dict]:
+    bucket = pl.sum_horizontal([
+        (pl.col("file_size_in_bytes") >= edge).cast(pl.Int8) for edge in _HISTOGRAM_EDGES[1:]
+    ])
+    counts = data.group_by(bucket.alias("bucket")).agg(
+        files=pl.len(), bytes=pl.col("file_size_in_bytes").sum(),
+    )
+    by_bucket = {row["bucket"]: row for row in counts.iter_rows(named=True)}
+    histogram = []
+    for i, low in enumerate(_HISTOGRAM_EDGES):
+        high = _HISTOGRAM_EDGES[i + 1] if i + 1 < len(_HISTOGRAM_EDGES) else None
+        row = by_bucket.get(i, {"files": 0, "bytes": 0})
+        histogram.append({
+            "label": f"{_format_bytes(low)}–{_format_bytes(high)}" if high else f"≥ {_format_bytes(low)}",
+            "minBytes": low,
+            "maxBytes": high,
+            "files": int(row["files"]),
+            "bytes": int(row["bytes"]),
+        })
+    return histogram
+
+
+def _manifests(tbl, snapshot) -> dict:
+    manifests = snapshot.manifests(tbl.io) if snapshot is not None else []
+    target = _property_bytes(tbl, "commit.manifest.target-size-bytes", DEFAULT_TARGET_MANIFEST_SIZE)
+    frame = pl.DataFrame(
+        {
+            "deletes": [m.content == ManifestContent.DELETES for m in manifests],
+            "bytes": [m.manifest_length for m in manifests],
+            "entries": [(m.added_files_count or 0) + (m.existing_files_count or 0) for m in manifests],
+        },
+        schema={"deletes": pl.Boolean, "bytes": pl.Int64, "entries": pl.Int64},
+    )
+    return {
+        "dataManifests": frame.filter(~pl.col("deletes")).height,
+        "deleteManifests": frame.filter(pl.col("deletes")).height,
+        "totalBytes": int(frame["bytes"].sum()),
+        "avgFilesPerManifest": round(float(frame["entries"].mean()), 1) if frame.height else 0.0,
+        "targetSizeBytes": target,
+        "smallManifests": frame.filter(pl.col("bytes") < target).height,
+    }
+
+
+def _growth(tbl, snapshot) -> dict:
+    lineage = list(ancestors_of(snapshot, tbl.metadata)) if snapshot is not None else []
+    lineage.reverse()
+
+    def total(s, key: str) -> int:
+        value = s.summary.get(key) if s.summary is not None else None
+        return int(value) if value is not None else 0
+
+    points = [
+        {
+            "snapshotId": str(s.snapshot_id),
+            "timestamp": str(s.timestamp_ms),
+            "operation": s.summary.operation.value if s.summary is not None else "unknown",
+            "dataFiles": total(s, "total-data-files"),
+            "deleteFiles": total(s, "total-delete-files"),
+            "bytes": total(s, "total-files-size"),
+            "records": total(s, "total-records"),
+        }
+        for s in lineage[-_GROWTH_POINTS:]
+    ]
+    growth = {"snapshots": len(lineage), "points": points}
+    if len(points) >= 2:
+        days = (int(points[-1]["timestamp"]) - int(points[0]["timestamp"])) / 86_400_000
+        if days > 0:
+            growth["dataFilesPerDay"] = round((points[-1]["dataFiles"] - points[0]["dataFiles"]) / days, 1)
+            growth["bytesPerDay"] = round((points[-1]["bytes"] - points[0]["bytes"]) / days)
+    return growth
+
+
+def table_health(catalog: str, ref: str, tbl, target_file_size: int | None = None) -> dict:
+    """Compaction-debt report for `tbl`'s current snapshot."""
+    snapshot = tbl.current_snapshot()
+    entries = file_entries(catalog, ref, tbl)
+    files = pl.from_arrow(entries.table)
+    data = files.filter(pl.col("content") == 0)
+    deletes = files.filter(pl.col("content") != 0)
+
+    target = int(target_file_size or _property_bytes(tbl, "write.target-file-size-bytes", DEFAULT_TARGET_FILE_SIZE))
+    threshold = int(target * COMPACTION_THRESHOLD)
+    size = pl.col("file_size_in_bytes")
+    data_bytes = int(data["file_size_in_bytes"].sum())
+    data_records = int(data["record_count"].sum())
+
+    partitions = (
+        data.group_by("partition_id")
+        .agg(
+            files=pl.len(),
+            bytes=size.sum(),
+            records=pl.col("record_count").sum(),
+            smallFiles=(size < threshold).sum(),
+        )
+        .join(
+            deletes.group_by("partition_id").agg(deleteFiles=pl.len()),
+            on="partition_id", how="left",
+        )
+        .with_columns(pl.col("deleteFiles").fill_null(0))
+        .sort("bytes", descending=True)
+    )
+    delete_counts = deletes.group_by("content").agg(files=pl.len(), bytes=size.sum(), records=pl.col("record_count").sum())
+    by_content = {row["content"]: row for row in delete_counts.iter_rows(named=True)}
+    delete_records = int(deletes["record_count"].sum())
+
+    return {
+        "snapshotId": str(snapshot.snapshot_id) if snapshot is not None else None,
+        "dataFiles": {
+            "count": data.height,
+            "bytes": data_bytes,
+            "records": data_records,
+            "avgFileBytes": round(data_bytes / data.height) if data.height else 0,
+            "medianFileBytes": float(data["file_size_in_bytes"].median() or 0),
+        },
+        "fileSizeHistogram": _histogram(data),
+        "smallFiles": {
+            "targetFileSizeBytes": target,
+            "belowTarget": data.filter(size < target).height,
+            "belowTargetBytes": int(data.filter(size < target)["file_size_in_bytes"].sum()),
+            # What rewrite_data_files would pick up with its defaults
+            "compactionThresholdBytes": threshold,
+            "compactionCandidates": data.filter(size < threshold).height,
+        },
+        "deletes": {
+            "positionDeleteFiles": int(by_content.get(1, {}).get("files", 0)),
+            "equalityDeleteFiles": int(by_content.get(2, {}).get("files", 0)),
+            "deleteBytes": int(deletes["file_size_in_bytes"].sum()),
+            "deleteRecords": delete_records,
+            "fileRatio": round(deletes.height / data.height, 4) if data.height else 0.0,
+            "recordRatio": round(delete_records / data_records, 4) if data_records else 0.0,
+            "partitionsWithDeletes": partitions.filter(pl.col("deleteFiles") > 0).height,
+        },
+        "partitions": {
+            "count": partitions.height,
+            "filesPerPartition": _spread(partitions["files"]),
+            "bytesPerPartition": _spread(partitions["bytes"]),
+            "fileSkew": _skew(partitions["files"]),
+            "byteSkew": _skew(partitions["bytes"]),
+            "top": [
+                {
+                    "partition": entries.partitions[row["partition_id"]],
+                    "files": row["files"],
+                    "bytes": row["bytes"],
+                    "records": row["records"],
+                    "smallFiles": row["smallFiles"],
+                    "deleteFiles": row["deleteFiles"],
+                }
+                for row in partitions.head(_TOP_PARTITIONS).iter_rows(named=True)
+            ],
+        },
+        "manifests": _manifests(tbl, snapshot),
+        "growth": _growth(tbl, snapshot),
+    }
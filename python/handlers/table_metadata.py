@@ -0,0 +1,153 @@
+"""
+Table metadata cache — loaded pyiceberg Table objects shared across handlers.
+
+describe_table, get_files, the agent's table tools and execute_sql all go
+through load_table(), which keeps each (catalog, table) it loads:
+
+- within `cache.metadataTtlSeconds` of being loaded or revalidated, the
+  cached Table is returned as is
+- after that it is revalidated: where the catalog can report a table's
+  current metadata location cheaply (SQL catalogs: one indexed row), an
+  unchanged location keeps the Table; otherwise it is loaded again
+- concurrent loads of the same table share one fetch
+- invalidate() drops entries, e.g. when the user hits refresh
+
+Callers get the shared object and must not mutate it (no `refresh()`).
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from handlers.iceframe_loader import get_iceframe
+from handlers.settings import DEFAULT_SETTINGS, load_settings
+
+# Most tables kept; least recently used are dropped first
+_MAX_ENTRIES = 256
+
+
+@dataclass
+class _Entry:
+    ice: object
+    table: object
+    checked_at: float
+
+
+_lock = threading.Lock()
+_entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+_inflight: dict[tuple[str, str], Future] = {}
+_hits = 0
+_revalidated = 0
+_loads = 0
+
+
+def _ttl() -> float:
+    cache = load_settings().get("cache", {})
+    return float(cache.get("metadataTtlSeconds", DEFAULT_SETTINGS["cache"]["metadataTtlSeconds"]))
+
+
+def _metadata_location(catalog, identifier: tuple) -> str | None:
+    """The table's current metadata location if the catalog can tell cheaply, else None."""
+    try:
+        from pyiceberg.catalog import Catalog
+        from pyiceberg.catalog.sql import IcebergTables, SqlCatalog
+        from sqlalchemy import select
+        from sqlalchemy.orm import Session
+    except ImportError:
+        return None
+    if not isinstance(catalog, SqlCatalog):
+        return None
+    with Session(catalog.engine) as session:
+        return session.scalar(select(IcebergTables.metadata_location).where(
+            IcebergTables.catalog_name == catalog.name,
+            IcebergTables.table_namespace == Catalog.namespace_to_string(Catalog.namespace_from(identifier)),
+            IcebergTables.table_name == Catalog.table_name_from(identifier),
+        ))
+
+
+class _Abandoned(Exception):
+    """Set on a shared load whose owner was cancelled; its waiters load the table themselves."""
+
+
+def load_table(catalog: str, ref: str, max_age: float | None = None):
+    """Return the pyiceberg Table `ref` of `catalog`, from the cache when still current.
+
+    `max_age` overrides the configured TTL (0 = always revalidate).
+    """
+    global _hits, _revalidated, _loads
+    key = (catalog, ref)
+    ice = get_iceframe(catalog)
+    ttl = _ttl() if max_age is None else max_age
+    while True:
+        with _lock:
+            entry = _entries.get(key)
+            if entry is not None and entry.ice is not ice:
+                entry = None  # catalog config changed since
+            if entry is not None and time.monotonic() - entry.checked_at < ttl:
+                _entries.move_to_end(key)
+                _hits += 1
+                return entry.table
+            future = _inflight.get(key)
+            owner = future is None
+            if owner:
+                future = _inflight[key] = Future()
+        if owner:
+            break
+        try:
+            return future.result()
+        except _Abandoned:
+            continue
+
+    try:
+        table = None
+        if entry is not None:
+            location = _metadata_location(ice.catalog, entry.table.name())
+            if location is not None and location == entry.table.metadata_location:
+                table = entry.table
+        revalidated = table is not None
+        if table is None:
+            table = ice.get_table(ref)
+        with _lock:
+            _entries[key] = _Entry(ice, table, time.monotonic())
+            _entries.move_to_end(key)
+            while len(_entries) > _MAX_ENTRIES:
+                _entries.popitem(last=False)
+            if revalidated:
+                _revalidated += 1
+            else:
+                _loads += 1
+            _inflight.pop(key, None)
+        future.set_result(table)
+        return table
+    except BaseException as e:
+        with _lock:
+            _inflight.pop(key, None)
+        if not future.done():
+            # Only the catalog's errors are shared; a cancelled request's
+            # waiters retry the load instead of failing with it
+            future.set_exception(e if isinstance(e, Exception) else _Abandoned())
+        raise
+
+
+def invalidate(catalog: str | None = None, ref: str | None = None) -> int:
+    """Drop cached tables: one table, a whole catalog, or everything. Returns how many."""
+    with _lock:
+        keys = [k for k in _entries if (catalog is None or k[0] == catalog) and (ref is None or k[1] == ref)]
+        for key in keys:
+            del _entries[key]
+    if keys:
+        print(f"[TableMetadata] Invalidated {len(keys)} cached table(s)", file=sys.stderr)
+    return len(keys)
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "entries": len(_entries),
+            "hits": _hits,
+            "revalidated": _revalidated,
+            "loads": _loads,
+            "ttlSeconds": _ttl(),
+        }
@@ -3,16 +3,20 @@
 IceTop Python Backend Server
 JSON-RPC over stdin/stdout
 """
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import sys
 import json
+import importlib
+import threading
 import traceback
 import datetime
 import decimal
-from handlers.catalog import CatalogHandler
-from handlers.sql import SQLHandler
-from handlers.chat import ChatHandler
-from handlers.notebook import NotebookHandler
-from handlers.settings import SettingsHandler
+from concurrent.futures import ThreadPoolExecutor
+from handlers.context import RequestCancelled, RequestContext, bind_request, unbind_request
+from handlers.metrics import MetricsRegistry, current_rss_bytes
 
 
 class SafeEncoder(json.JSONEncoder):
@@ -31,39 +35,241 @@ class SafeEncoder(json.JSONEncoder):
         return str(obj)  # Fallback: convert anything to string
 
 
+# ── Concurrency classes ──
+# Each method runs on the worker pool of its class, so a long scan or an LLM
+# turn never blocks the sidebar's metadata calls. "inline" methods are answered
+# directly on the stdin reader thread (the health check must never queue).
+POOL_SIZES = {
+    "fast": 8,   # catalog metadata, settings, history
+    "scan": 2,   # SQL, notebook cells, file listings — CPU and memory heavy
+    "llm": 2,    # agent turns — mostly waiting on the provider
+}
+
+METHOD_CLASSES = {
+    "ping": "inline",
+    "cancel": "inline",
+    "execute_sql": "scan",
+    "execute_cell": "scan",
+    "get_files": "scan",
+    "table_health": "scan",
+    "sort_result": "scan",
+    "filter_result": "scan",
+    "chat": "llm",
+}
+
+
+# ── Lazy handlers ──
+# Handler modules pull in Polars, PyIceberg and IceFrame, so they're imported
+# on first use: ping, get_settings and list_catalogs answer without the data
+# stack. Keep handlers.catalog and handlers.settings free of heavy top-level
+# imports for that reason.
+HANDLER_CLASSES = {
+    "catalog": ("handlers.catalog", "CatalogHandler"),
+    "sql": ("handlers.sql", "SQLHandler"),
+    "chat": ("handlers.chat", "ChatHandler"),
+    "notebook": ("handlers.notebook", "NotebookHandler"),
+    "settings": ("handlers.settings", "SettingsHandler"),
+}
+
+HANDLER_METHODS = {
+    "list_catalogs": ("catalog", "list_catalogs"),
+    "list_namespaces": ("catalog", "list_namespaces"),
+    "list_tables": ("catalog", "list_tables"),
+    "list_children": ("catalog", "list_children"),
+    "describe_table": ("catalog", "describe_table"),
+    "get_snapshots": ("catalog", "get_snapshots"),
+    "get_files": ("catalog", "get_files"),
+    "table_health": ("catalog", "table_health"),
+    "invalidate_table": ("catalog", "invalidate_table"),
+    "crawl_catalog": ("catalog", "crawl_catalog"),
+    "execute_sql": ("sql", "execute"),
+    "get_query_history": ("sql", "get_history"),
+    "release_result": ("sql", "release_result"),
+    "fetch_rows": ("sql", "fetch_rows"),
+    "sort_result": ("sql", "sort_result"),
+    "filter_result": ("sql", "filter_result"),
+    "close_cursor": ("sql", "close_cursor"),
+    "cache_status": ("sql", "cache_status"),
+    "cache_clear": ("sql", "cache_clear"),
+    "chat": ("chat", "send"),
+    "chat_reset": ("chat", "reset"),
+    "chat_reload": ("chat", "reload"),
+    "execute_cell": ("notebook", "execute_cell"),
+    "list_packages": ("notebook", "list_packages"),
+    "get_settings": ("settings", "get"),
+    "update_settings": ("settings", "update"),
+}
+
+# Warmed in the background after the first ping, in this order, so the
+# report attributes import time to each heavy dependency separately
+PREWARM_MODULES = ["pyarrow", "polars", "pyiceberg", "iceframe"]
+PREWARM_HANDLERS = ["catalog", "sql", "notebook", "chat"]
+
+
+class MessageWriter:
+    """Serializes JSON lines onto stdout.
+
+    Responses from worker threads and notifications (e.g. ``chat:progress``)
+    share one stream, so every line is written and flushed under a lock.
+    The stream is captured at construction time because notebook cells
+    temporarily redirect ``sys.stdout``.
+    """
+
+    def __init__(self, stream=None):
+        self._stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def write(self, message: dict) -> int:
+        line = json.dumps(message, cls=SafeEncoder) + "\n"
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+        return len(line)
+
+
 class Server:
-    def __init__(self):
+    def __init__(self, stream=None):
         self.handlers = {}
+        self.writer = MessageWriter(stream)
+        self.metrics = MetricsRegistry()
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"rpc-{name}")
+            for name, size in POOL_SIZES.items()
+        }
+        # In-flight (and queued) requests by id, so `cancel` can reach them
+        self._active: dict = {}
+        self._active_lock = threading.Lock()
+        self._instances: dict = {}
+        self._instance_locks = {key: threading.Lock() for key in HANDLER_CLASSES}
+        self._import_times: list[dict] = []
+        self._import_lock = threading.Lock()
+        self._prewarm_started = False
+        self._first_ping_ms: int | None = None
         self._register_handlers()
 
-    def _register_handlers(self):
-        catalog = CatalogHandler()
-        sql = SQLHandler()
-        chat = ChatHandler()
-        notebook = NotebookHandler()
-        settings = SettingsHandler()
+    def notify(self, notification: str, params: dict):
+        """Write a JSON-RPC notification (no id), interleaved safely with responses."""
+        self.writer.write({"notification": notification, "params": params})
 
+    def _register_handlers(self):
         self.handlers = {
-            "ping": lambda params: {"status": "ok"},
-            "list_catalogs": catalog.list_catalogs,
-            "list_namespaces": catalog.list_namespaces,
-            "list_tables": catalog.list_tables,
-            "list_children": catalog.list_children,
-            "describe_table": catalog.describe_table,
-            "get_snapshots": catalog.get_snapshots,
-            "get_files": catalog.get_files,
-            "execute_sql": sql.execute,
-            "get_query_history": sql.get_history,
-            "chat": chat.send,
-            "chat_reset": chat.reset,
-            "chat_reload": chat.reload,
-            "execute_cell": notebook.execute_cell,
-            "list_packages": notebook.list_packages,
-            "get_settings": settings.get,
-            "update_settings": settings.update,
+            "ping": self.ping,
+            "cancel": self.cancel,
+            "get_startup_report": self.get_startup_report,
+            "get_metrics": self.get_metrics,
         }
+        for method, (key, attr) in HANDLER_METHODS.items():
+            self.handlers[method] = self._lazy_method(key, attr)
+
+    def _lazy_method(self, key: str, attr: str):
+        def call(params: dict):
+            return getattr(self._get_handler(key), attr)(params)
+        return call
 
-    def handle_request(self, request: dict) -> dict:
+    def _handler_kwargs(self, key: str) -> dict:
+        if key in ("catalog", "chat", "sql"):
+            return {"notify": self.notify}
+        return {}
+
+    def _get_handler(self, key: str):
+        """Import and instantiate a handler on first use (one lock per handler)."""
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        with self._instance_locks[key]:
+            if key not in self._instances:
+                module_name, class_name = HANDLER_CLASSES[key]
+                module = self._timed_import(module_name)
+                self._instances[key] = getattr(module, class_name)(**self._handler_kwargs(key))
+        return self._instances[key]
+
+    def _timed_import(self, module_name: str, source: str | None = None):
+        """Import a module, recording how long it took if it wasn't loaded yet."""
+        already_loaded = module_name in sys.modules
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        if not already_loaded:
+            with self._import_lock:
+                self._import_times.append({
+                    "module": module_name,
+                    "ms": round((time.perf_counter() - start) * 1000, 1),
+                    "source": source or threading.current_thread().name,
+                })
+        return module
+
+    def _prewarm(self):
+        """Import the data stack and build handlers before the user needs them."""
+        for module_name in PREWARM_MODULES:
+            try:
+                self._timed_import(module_name, source="prewarm")
+            except Exception as e:
+                print(f"[Startup] Could not prewarm {module_name}: {e}", file=sys.stderr)
+        try:
+            loader = self._timed_import("handlers.iceframe_loader", source="prewarm")
+            loader.ensure_iceframe()
+            for key in PREWARM_HANDLERS:
+                self._get_handler(key)
+            sdk_module = self._timed_import("handlers.agent", source="prewarm").provider_sdk_module()
+        except Exception as e:
+            print(f"[Startup] Prewarm stopped early: {e}", file=sys.stderr)
+            return
+        if sdk_module:
+            try:
+                self._timed_import(sdk_module, source="prewarm")
+            except Exception as e:
+                print(f"[Startup] Could not prewarm {sdk_module}: {e}", file=sys.stderr)
+        print(f"[Startup] Prewarm done at {self._uptime_ms()}ms", file=sys.stderr)
+
+    @staticmethod
+    def _uptime_ms() -> int:
+        return int((time.perf_counter() - _PROCESS_START) * 1000)
+
+    def ping(self, params: dict) -> dict:
+        """Health check. The first ping also starts background prewarming."""
+        if not self._prewarm_started:
+            self._prewarm_started = True
+            self._first_ping_ms = self._uptime_ms()
+            threading.Thread(target=self._prewarm, name="prewarm", daemon=True).start()
+        return {"status": "ok"}
+
+    def get_startup_report(self, params: dict) -> dict:
+        """Cold-start timings: first ping, loaded handlers and import time per module."""
+        with self._import_lock:
+            imports = list(self._import_times)
+        return {
+            "firstPingMs": self._first_ping_ms,
+            "uptimeMs": self._uptime_ms(),
+            "loadedHandlers": sorted(self._instances),
+            "imports": imports,
+        }
+
+    def cancel(self, params: dict) -> dict:
+        """Cancel an in-flight or queued request by id.
+
+        The handler stops at its next safe point (between record batches,
+        between agent tool calls) and the request answers with code -32800.
+        """
+        request_id = params["requestId"]
+        with self._active_lock:
+            context = self._active.get(request_id)
+        if context is None:
+            return {"cancelled": False}
+        context.cancel()
+        return {"cancelled": True}
+
+    def get_metrics(self, params: dict) -> dict:
+        """Per-method counts, latency percentiles, response bytes, RSS and phase timings."""
+        snapshot = self.metrics.snapshot()
+        if params.get("reset"):
+            self.metrics.reset()
+        return snapshot
+
+    def handle_request(self, request: dict, context: RequestContext | None = None) -> dict:
+        """Run one request and record its metrics sample on `context.sample`.
+
+        Response size and the JSONL log entry are added by _dispatch once the
+        response has been encoded.
+        """
         req_id = request.get("id")
         method = request.get("method", "")
         params = request.get("params", {})
@@ -75,32 +281,92 @@ class Server:
                 "error": {"code": -32601, "message": f"Method not found: {method}"},
             }
 
+        context = context or RequestContext(req_id, method)
+        token = bind_request(context)
+        status = "ok"
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
         try:
+            context.check()
             result = handler(params)
             return {"id": req_id, "result": result}
+        except RequestCancelled:
+            status = "cancelled"
+            return {
+                "id": req_id,
+                "error": {"code": -32800, "message": f"Request cancelled: {method}"},
+            }
         except Exception as e:
+            status = "error"
             return {
                 "id": req_id,
                 "error": {"code": -32000, "message": str(e), "data": traceback.format_exc()},
             }
+        finally:
+            unbind_request(token)
+            rss_after = current_rss_bytes()
+            context.sample = self.metrics.record(
+                method,
+                (time.perf_counter() - start) * 1000,
+                status,
+                dict(context.phases),
+                rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            )
+
+    def _dispatch(self, request: dict, context: RequestContext):
+        """Handle one request and write its response (runs on a worker thread)."""
+        try:
+            response = self.handle_request(request, context)
+        finally:
+            with self._active_lock:
+                if self._active.get(context.request_id) is context:
+                    del self._active[context.request_id]
+        start = time.perf_counter()
+        try:
+            response_bytes = self.writer.write(response)
+        except Exception as e:
+            response_bytes = self.writer.write({
+                "id": response.get("id"),
+                "error": {"code": -32603, "message": f"Could not encode response: {e}"},
+            })
+        if context.sample is not None:
+            self.metrics.record_response(context.sample, response_bytes, (time.perf_counter() - start) * 1000)
+
+    def submit(self, request: dict):
+        """Route a request to its concurrency class; responses go out in completion order."""
+        method = request.get("method", "")
+        context = RequestContext(request.get("id"), method)
+        if context.request_id is not None:
+            with self._active_lock:
+                self._active[context.request_id] = context
+
+        concurrency = METHOD_CLASSES.get(method, "fast")
+        if concurrency == "inline":
+            self._dispatch(request, context)
+        else:
+            self._pools[concurrency].submit(self._dispatch, request, context)
+
+    def shutdown(self):
+        """Wait for in-flight requests to finish writing their responses."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
 
     def run(self):
-        """Main event loop: read JSON-RPC requests from stdin, write responses to stdout."""
+        """Main event loop: read JSON-RPC requests from stdin, dispatch them to worker pools."""
         for line in sys.stdin:
             line = line.strip()
             if not line:
                 continue
             try:
                 request = json.loads(line)
-                response = self.handle_request(request)
             except json.JSONDecodeError as e:
-                response = {
+                self.writer.write({
                     "id": None,
                     "error": {"code": -32700, "message": f"Parse error: {e}"},
-                }
-
-            sys.stdout.write(json.dumps(response, cls=SafeEncoder) + "\n")
-            sys.stdout.flush()
+                })
+                continue
+            self.submit(request)
+        self.shutdown()
 
 
 if __name__ == "__main__":
@@ -2,8 +2,9 @@ import React, { useState, useEffect, useMemo } from 'react';
 import { useCatalogStore } from '../../stores/catalogStore';
 import {
   Table2, Columns3, Layers, Settings2, History,
-  Loader2, ChevronRight, Search, FileText
+  Loader2, ChevronRight, Search, FileText, RefreshCw, Activity
 } from 'lucide-react';
+import type { TableHealth } from '../../types/catalog';
 import './Metadata.scss';
 
 interface ColumnInfo {
@@ -34,8 +35,20 @@ interface TableFileInfo {
   partition: Record<string, string>;
 }
 
+// Files fetched per page of the Files tab
+const FILES_PAGE_SIZE = 100;
 
-type MetaTab = 'schema' | 'partitions' | 'properties' | 'snapshots' | 'files';
+type MetaTab = 'schema' | 'partitions' | 'properties' | 'snapshots' | 'files' | 'health';
+
+const formatBytes = (n: number) => {
+  const units = ['B', 'KiB', 'MiB', 'GiB', 'TiB'];
+  let i = 0;
+  while (n >= 1024 && i < units.length - 1) {
+    n /= 1024;
+    i++;
+  }
+  return `${n.toFixed(i === 0 ? 0 : 1)} ${units[i]}`;
+};
 
 export const MetadataPanel: React.FC = () => {
   const catalogs = useCatalogStore((s) => s.catalogs);
@@ -47,6 +60,13 @@ export const MetadataPanel: React.FC = () => {
   const [meta, setMeta] = useState<TableMeta | null>(null);
   const [snapshots, setSnapshots] = useState<SnapshotInfo[]>([]);
   const [files, setFiles] = useState<TableFileInfo[]>([]);
+  const [filesTotal, setFilesTotal] = useState(0);
+  const [filesInSnapshot, setFilesInSnapshot] = useState(0);
+  const [fileOffset, setFileOffset] = useState(0);
+  const [filesLoading, setFilesLoading] = useState(false);
+  const [loadedTable, setLoadedTable] = useState<{ catalog: string; table: string } | null>(null);
+  const [health, setHealth] = useState<TableHealth | null>(null);
+  const [healthLoading, setHealthLoading] = useState(false);
   const [globalFilter, setGlobalFilter] = useState('');
   const [fileSort, setFileSort] = useState<{ key: keyof TableFileInfo; direction: 'asc' | 'desc' } | null>(null);
   const [groupByKeys, setGroupByKeys] = useState<string[]>([]);
@@ -58,25 +78,31 @@ export const MetadataPanel: React.FC = () => {
     }
   }, [catalogs]);
 
-  const loadMetadata = async () => {
+  // `refresh` drops the backend's cached table metadata first
+  const loadMetadata = async (refresh = false) => {
     if (!selectedCatalog || !tableName.trim()) return;
     setLoading(true);
     setError(null);
     setMeta(null);
     setSnapshots([]);
     setFiles([]);
+    setFilesTotal(0);
+    setFilesInSnapshot(0);
+    setFileOffset(0);
+    setHealth(null);
     setGroupByKeys([]);
 
     try {
+      if (refresh) {
+        await useCatalogStore.getState().invalidateTable(selectedCatalog, tableName.trim());
+      }
       const result = await (window as any).icetop.catalog.describeTable(
         selectedCatalog,
         tableName.trim()
       );
       setMeta(result);
       setSnapshots(result.snapshots || []);
-
-      const fileResult = await useCatalogStore.getState().getFiles(selectedCatalog, tableName.trim());
-      setFiles(fileResult || []);
+      setLoadedTable({ catalog: selectedCatalog, table: tableName.trim() });
     } catch (err: any) {
       setError(err.message || 'Failed to load table metadata');
     }
@@ -84,6 +110,41 @@ export const MetadataPanel: React.FC = () => {
     setLoading(false);
   };
 
+  // Files are paged, sorted and filtered by the backend (get_files)
+  useEffect(() => {
+    if (!meta || !loadedTable) return;
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      setFilesLoading(true);
+      const page = await useCatalogStore.getState().getFiles(loadedTable.catalog, loadedTable.table, {
+        offset: fileOffset,
+        limit: FILES_PAGE_SIZE,
+        sortBy: fileSort?.key,
+        descending: fileSort?.direction === 'desc',
+        search: globalFilter || undefined,
+      });
+      if (cancelled) return;
+      setFiles(page?.files || []);
+      setFilesTotal(page?.total || 0);
+      setFilesInSnapshot(page?.totalFiles || 0);
+      setFilesLoading(false);
+    }, 250);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [meta, loadedTable, fileOffset, fileSort, globalFilter]);
+
+  // Health is computed on first visit to its tab
+  useEffect(() => {
+    if (activeTab !== 'health' || !meta || !loadedTable || health || healthLoading) return;
+    setHealthLoading(true);
+    useCatalogStore.getState().tableHealth(loadedTable.catalog, loadedTable.table).then((result) => {
+      setHealth(result);
+      setHealthLoading(false);
+    });
+  }, [activeTab, meta, loadedTable, health]);
+
   const handleKeyDown = (e: React.KeyboardEvent) => {
     if (e.key === 'Enter') loadMetadata();
   };
@@ -117,6 +178,7 @@ export const MetadataPanel: React.FC = () => {
     { id: 'properties', label: 'Properties', icon: Settings2 },
     { id: 'snapshots', label: 'Snapshots', icon: History },
     { id: 'files', label: 'Files', icon: FileText },
+    { id: 'health', label: 'Health', icon: Activity },
   ];
 
   const formatTimestamp = (ms: string) => {
@@ -133,6 +195,7 @@ export const MetadataPanel: React.FC = () => {
       direction = 'desc';
     }
     setFileSort({ key, direction });
+    setFileOffset(0);
   };
 
   const partitionKeys = useMemo(() => {
@@ -145,38 +208,17 @@ export const MetadataPanel: React.FC = () => {
     return Array.from(keys).sort();
   }, [files]);
 
-  const processedFiles = useMemo(() => {
-    const lowerFilter = globalFilter.toLowerCase();
-    let result = files.filter(f => {
-      const pStr = f.partition ? JSON.stringify(f.partition).toLowerCase() : '';
-      return f.file_path.toLowerCase().includes(lowerFilter) || pStr.includes(lowerFilter);
-    });
-    if (fileSort !== null) {
-      result.sort((a, b) => {
-        let valA: any = a[fileSort.key];
-        let valB: any = b[fileSort.key];
-        if (fileSort.key === 'partition') {
-          valA = a.partition ? JSON.stringify(a.partition) : '';
-          valB = b.partition ? JSON.stringify(b.partition) : '';
-        }
-        if (valA < valB) return fileSort.direction === 'asc' ? -1 : 1;
-        if (valA > valB) return fileSort.direction === 'asc' ? 1 : -1;
-        return 0;
-      });
-    }
-    return result;
-  }, [files, globalFilter, fileSort]);
-
+  // Grouping applies to the current page
   const groupedFiles = useMemo(() => {
     if (groupByKeys.length === 0) return null;
-    const groups: Record<string, typeof processedFiles> = {};
-    processedFiles.forEach(f => {
+    const groups: Record<string, TableFileInfo[]> = {};
+    files.forEach(f => {
       const gKey = groupByKeys.map(k => `${k}=${f.partition?.[k] ?? 'null'}`).join(', ');
       if (!groups[gKey]) groups[gKey] = [];
       groups[gKey].push(f);
     });
     return groups;
-  }, [processedFiles, groupByKeys]);
+  }, [files, groupByKeys]);
 
   const renderFilesTable = (fileList: TableFileInfo[]) => (
     <table className="metadata-panel__table" style={{ margin: 0 }}>
@@ -246,12 +288,20 @@ export const MetadataPanel: React.FC = () => {
         />
         <button
           className="btn btn--primary metadata-panel__load-btn"
-          onClick={loadMetadata}
+          onClick={() => loadMetadata()}
           disabled={loading || !tableName.trim()}
         >
           {loading ? <Loader2 size={14} className="spin" /> : <Search size={14} />}
           <span>Load</span>
         </button>
+        <button
+          className="btn btn--ghost btn--sm"
+          onClick={() => loadMetadata(true)}
+          disabled={loading || !tableName.trim()}
+          title="Reload from the catalog"
+        >
+          <RefreshCw size={14} />
+        </button>
       </div>
 
       {/* Error */}
@@ -298,7 +348,7 @@ export const MetadataPanel: React.FC = () => {
                     <span className="metadata-panel__badge">{snapshots.length}</span>
                   )}
                   {tab.id === 'files' && (
-                    <span className="metadata-panel__badge">{files.length}</span>
+                    <span className="metadata-panel__badge">{filesInSnapshot}</span>
                   )}
                 </button>
               );
@@ -314,7 +364,10 @@ export const MetadataPanel: React.FC = () => {
                 type="text"
                 placeholder="Filter current view by text..."
                 value={globalFilter}
-                onChange={(e) => setGlobalFilter(e.target.value)}
+                onChange={(e) => {
+                  setGlobalFilter(e.target.value);
+                  setFileOffset(0);
+                }}
                 style={{ width: '100%', maxWidth: '100%' }}
               />
             </div>
@@ -444,12 +497,127 @@ export const MetadataPanel: React.FC = () => {
               </div>
             )}
 
+            {/* Health tab */}
+            {activeTab === 'health' && (
+              <div className="metadata-panel__health">
+                {!health ? (
+                  <div className="metadata-panel__empty-tab">
+                    <p className="text-muted">
+                      {healthLoading ? 'Reading manifests…' : 'Health report unavailable for this table.'}
+                    </p>
+                  </div>
+                ) : (
+                  <>
+                    <table className="metadata-panel__table">
+                      <tbody>
+                        <tr>
+                          <td>Data files</td>
+                          <td>
+                            {health.dataFiles.count.toLocaleString()} ({formatBytes(health.dataFiles.bytes)}, median {formatBytes(health.dataFiles.medianFileBytes)})
+                          </td>
+                        </tr>
+                        <tr>
+                          <td>Below target size ({formatBytes(health.smallFiles.targetFileSizeBytes)})</td>
+                          <td>
+                            {health.smallFiles.belowTarget.toLocaleString()} files, {health.smallFiles.compactionCandidates.toLocaleString()} below {formatBytes(health.smallFiles.compactionThresholdBytes)}
+                          </td>
+                        </tr>
+                        <tr>
+                          <td>Delete files</td>
+                          <td>
+                            {health.deletes.positionDeleteFiles.toLocaleString()} position, {health.deletes.equalityDeleteFiles.toLocaleString()} equality
+                            {' '}({(health.deletes.fileRatio * 100).toFixed(1)}% of data files, {(health.deletes.recordRatio * 100).toFixed(1)}% of records, {health.deletes.partitionsWithDeletes} partitions)
+                          </td>
+                        </tr>
+                        <tr>
+                          <td>Partitions</td>
+                          <td>
+                            {health.partitions.count.toLocaleString()}
+                            {health.partitions.fileSkew !== null && ` — file skew ${health.partitions.fileSkew}×`}
+                            {health.partitions.byteSkew !== null && `, byte skew ${health.partitions.byteSkew}×`}
+                          </td>
+                        </tr>
+                        <tr>
+                          <td>Manifests</td>
+                          <td>
+                            {health.manifests.dataManifests} data, {health.manifests.deleteManifests} delete ({formatBytes(health.manifests.totalBytes)}, {health.manifests.smallManifests} small, {health.manifests.avgFilesPerManifest} files each)
+                          </td>
+                        </tr>
+                        <tr>
+                          <td>Snapshots</td>
+                          <td>
+                            {health.growth.snapshots.toLocaleString()}
+                            {health.growth.dataFilesPerDay !== undefined && ` — ${health.growth.dataFilesPerDay.toLocaleString()} files/day`}
+                            {health.growth.bytesPerDay !== undefined && `, ${formatBytes(health.growth.bytesPerDay)}/day`}
+                          </td>
+                        </tr>
+                      </tbody>
+                    </table>
+
+                    <h4 style={{ margin: '16px 0 8px' }}>File sizes</h4>
+                    <table className="metadata-panel__table">
+                      <tbody>
+                        {health.fileSizeHistogram.map((bucket) => (
+                          <tr key={bucket.label}>
+                            <td style={{ whiteSpace: 'nowrap' }}>{bucket.label}</td>
+                            <td style={{ width: '60%' }}>
+                              <div style={{
+                                height: '8px',
+                                borderRadius: '4px',
+                                background: 'var(--primary-color, #38bdf8)',
+                                width: `${health.dataFiles.count ? (bucket.files / health.dataFiles.count) * 100 : 0}%`,
+                              }} />
+                            </td>
+                            <td>{bucket.files.toLocaleString()}</td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+
+                    {health.partitions.top.length > 0 && (
+                      <>
+                        <h4 style={{ margin: '16px 0 8px' }}>Largest partitions</h4>
+                        <table className="metadata-panel__table">
+                          <thead>
+                            <tr>
+                              <th>Partition</th>
+                              <th>Files</th>
+                              <th>Size</th>
+                              <th>Small files</th>
+                              <th>Delete files</th>
+                            </tr>
+                          </thead>
+                          <tbody>
+                            {health.partitions.top.map((p, i) => (
+                              <tr key={i}>
+                                <td><code>{JSON.stringify(p.partition)}</code></td>
+                                <td>{p.files.toLocaleString()}</td>
+                                <td>{formatBytes(p.bytes)}</td>
+                                <td>{p.smallFiles.toLocaleString()}</td>
+                                <td>{p.deleteFiles.toLocaleString()}</td>
+                              </tr>
+                            ))}
+                          </tbody>
+                        </table>
+                      </>
+                    )}
+                  </>
+                )}
+              </div>
+            )}
+
             {/* Files tab */}
             {activeTab === 'files' && (
               <div className="metadata-panel__files">
                 {files.length === 0 ? (
                   <div className="metadata-panel__empty-tab">
-                    <p className="text-muted">No files available or fetching failed.</p>
+                    <p className="text-muted">
+                      {filesLoading
+                        ? 'Loading files…'
+                        : globalFilter
+                          ? 'No files match the filter.'
+                          : 'No files available or fetching failed.'}
+                    </p>
                   </div>
                 ) : (
                   <div className="metadata-panel__files-content">
@@ -491,8 +659,31 @@ export const MetadataPanel: React.FC = () => {
                         ))}
                       </div>
                     ) : (
-                      renderFilesTable(processedFiles)
+                      renderFilesTable(files)
                     )}
+
+                    {/* Pager */}
+                    <div className="metadata-panel__pager" style={{ display: 'flex', alignItems: 'center', gap: '8px', padding: '12px 0', fontSize: '13px' }}>
+                      <button
+                        className="btn btn--ghost btn--sm"
+                        onClick={() => setFileOffset(Math.max(0, fileOffset - FILES_PAGE_SIZE))}
+                        disabled={filesLoading || fileOffset === 0}
+                      >
+                        Previous
+                      </button>
+                      <span className="text-muted">
+                        {(fileOffset + 1).toLocaleString()}–{(fileOffset + files.length).toLocaleString()} of {filesTotal.toLocaleString()}
+                        {filesTotal !== filesInSnapshot && ` (filtered from ${filesInSnapshot.toLocaleString()})`}
+                      </span>
+                      <button
+                        className="btn btn--ghost btn--sm"
+                        onClick={() => setFileOffset(fileOffset + FILES_PAGE_SIZE)}
+                        disabled={filesLoading || fileOffset + files.length >= filesTotal}
+                      >
+                        Next
+                      </button>
+                      {filesLoading && <Loader2 size={14} className="spin" />}
+                    </div>
                   </div>
                 )}
               </div>
@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import type { CatalogNode, TableSchema, Snapshot, TableFile } from '../types/catalog';
+import type { CatalogNode, TableSchema, Snapshot, FilesPage, FilesQuery, TableHealth } from '../types/catalog';
 
 interface CatalogStore {
   catalogs: CatalogNode[];
@@ -22,7 +22,9 @@ interface CatalogStore {
   loadChildren: (catalog: string, namespace: string) => Promise<void>;
   describeTable: (catalog: string, table: string) => Promise<TableSchema | null>;
   getSnapshots: (catalog: string, table: string) => Promise<Snapshot[]>;
-  getFiles: (catalog: string, table: string) => Promise<TableFile[]>;
+  getFiles: (catalog: string, table: string, query?: FilesQuery) => Promise<FilesPage | null>;
+  tableHealth: (catalog: string, table: string, targetFileSize?: number) => Promise<TableHealth | null>;
+  invalidateTable: (catalog: string, table?: string) => Promise<void>;
 }
 
 const updateNodeInTree = (
@@ -41,6 +43,26 @@ const updateNodeInTree = (
   });
 };
 
+const findNode = (nodes: CatalogNode[], fqn: string): CatalogNode | null => {
+  for (const node of nodes) {
+    if (node.fullyQualifiedName === fqn) return node;
+    const found = node.children ? findNode(node.children, fqn) : null;
+    if (found) return found;
+  }
+  return null;
+};
+
+// Keep the expanded state and loaded children of nodes that are still there
+const mergeChildren = (existing: CatalogNode[] | undefined, fresh: CatalogNode[]): CatalogNode[] => {
+  const previous = new Map((existing || []).map((node) => [node.fullyQualifiedName, node]));
+  return fresh.map((node) => {
+    const old = previous.get(node.fullyQualifiedName);
+    return old && old.type === node.type
+      ? { ...node, children: old.children, isExpanded: old.isExpanded }
+      : node;
+  });
+};
+
 export const useCatalogStore = create<CatalogStore>((set, get) => ({
   catalogs: [],
   activeCatalog: '',
@@ -116,7 +138,7 @@ export const useCatalogStore = create<CatalogStore>((set, get) => ({
       set((state) => ({
         catalogs: updateNodeInTree(state.catalogs, fqn, (node) => ({
           ...node,
-          children,
+          children: mergeChildren(node.children, children),
           isLoading: false,
           isExpanded: true,
         })),
@@ -164,7 +186,7 @@ export const useCatalogStore = create<CatalogStore>((set, get) => ({
       set((state) => ({
         catalogs: updateNodeInTree(state.catalogs, fqn, (node) => ({
           ...node,
-          children,
+          children: mergeChildren(node.children, children),
           isLoading: false,
           isExpanded: true,
         })),
@@ -196,11 +218,43 @@ export const useCatalogStore = create<CatalogStore>((set, get) => ({
     }
   },
 
-  getFiles: async (catalog, table) => {
+  getFiles: async (catalog, table, query) => {
     try {
-      return await (window as any).icetop.catalog.getFiles(catalog, table);
+      return await (window as any).icetop.catalog.getFiles(catalog, table, query);
     } catch {
-      return [];
+      return null;
+    }
+  },
+
+  tableHealth: async (catalog, table, targetFileSize) => {
+    try {
+      return await (window as any).icetop.catalog.tableHealth(catalog, table, targetFileSize);
+    } catch {
+      return null;
+    }
+  },
+
+  invalidateTable: async (catalog, table) => {
+    try {
+      await (window as any).icetop.catalog.invalidateTable(catalog, table);
+    } catch {
+      // Nothing cached to drop is fine
     }
   },
 }));
+
+// Reload open tree nodes whose children changed in a background crawl
+if (typeof window !== 'undefined' && (window as any).icetop?.catalog?.onChanged) {
+  (window as any).icetop.catalog.onChanged((params: { catalog: string; namespaces: string[] }) => {
+    const store = useCatalogStore.getState();
+    for (const namespace of params.namespaces) {
+      const node = findNode(store.catalogs, namespace ? `${params.catalog}.${namespace}` : params.catalog);
+      if (!node || !node.isExpanded) continue;
+      if (namespace) {
+        store.loadChildren(params.catalog, namespace);
+      } else {
+        store.loadNamespaces(params.catalog);
+      }
+    }
+  });
+}
@@ -38,3 +38,103 @@ export interface TableFile {
   file_size_in_bytes: number;
   partition: Record<string, string>;
 }
+
+// get_files paging, sorting and filters (all server-side)
+export interface FilesQuery {
+  offset?: number;
+  limit?: number;
+  sortBy?: 'file_path' | 'file_format' | 'record_count' | 'file_size_in_bytes' | 'partition';
+  descending?: boolean;
+  partition?: Record<string, string>;
+  pathContains?: string;
+  search?: string;
+  minSize?: number;
+  maxSize?: number;
+}
+
+export interface SizeBucket {
+  label: string;
+  minBytes: number;
+  maxBytes: number | null;
+  files: number;
+  bytes: number;
+}
+
+export interface Spread {
+  min: number;
+  median: number;
+  max: number;
+}
+
+export interface PartitionHealth {
+  partition: Record<string, string>;
+  files: number;
+  bytes: number;
+  records: number;
+  smallFiles: number;
+  deleteFiles: number;
+}
+
+export interface GrowthPoint {
+  snapshotId: string;
+  timestamp: string;
+  operation: string;
+  dataFiles: number;
+  deleteFiles: number;
+  bytes: number;
+  records: number;
+}
+
+// table_health: compaction debt computed from manifests
+export interface TableHealth {
+  snapshotId: string | null;
+  dataFiles: { count: number; bytes: number; records: number; avgFileBytes: number; medianFileBytes: number };
+  fileSizeHistogram: SizeBucket[];
+  smallFiles: {
+    targetFileSizeBytes: number;
+    belowTarget: number;
+    belowTargetBytes: number;
+    compactionThresholdBytes: number;
+    compactionCandidates: number;
+  };
+  deletes: {
+    positionDeleteFiles: number;
+    equalityDeleteFiles: number;
+    deleteBytes: number;
+    deleteRecords: number;
+    fileRatio: number;
+    recordRatio: number;
+    partitionsWithDeletes: number;
+  };
+  partitions: {
+    count: number;
+    filesPerPartition: Spread;
+    bytesPerPartition: Spread;
+    fileSkew: number | null;  // largest / median partition
+    byteSkew: number | null;
+    top: PartitionHealth[];
+  };
+  manifests: {
+    dataManifests: number;
+    deleteManifests: number;
+    totalBytes: number;
+    avgFilesPerManifest: number;
+    targetSizeBytes: number;
+    smallManifests: number;
+  };
+  growth: {
+    snapshots: number;
+    points: GrowthPoint[];
+    dataFilesPerDay?: number;
+    bytesPerDay?: number;
+  };
+}
+
+export interface FilesPage {
+  files: TableFile[];
+  total: number;       // files matching the filters
+  totalFiles: number;  // data files in the snapshot
+  offset: number;
+  limit: number;
+  snapshotId: string | null;
+}
@@ -2,6 +2,8 @@
 // Notebook types
 // ============================================================
 
+import type { ColumnarResult } from './sql';
+
 export interface NotebookCell {
   id: string;
   type: 'code' | 'markdown';
@@ -14,6 +16,8 @@ export interface CellOutput {
   text: string;
   error: string | null;
   data: unknown | null;
+  /** Structured preview when the cell's `_` is a Polars DataFrame */
+  table?: ColumnarResult | null;
   executionTimeMs: number;
 }
 
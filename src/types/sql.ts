@@ -12,11 +12,168 @@ export interface SQLTab {
   error: string | null;
 }
 
+export type ResultFormat = 'rows' | 'columnar' | 'arrow';
+
+/** `eager` scans tables before the query runs; `lazy` lets Polars plan the Iceberg scans. */
+export type SQLEngine = 'eager' | 'lazy';
+
 export interface QueryResult {
   columns: QueryColumn[];
   rows: Record<string, unknown>[];
   rowCount: number;
   executionTimeMs: number;
+  resultFormat?: ResultFormat;
+  serializationTimeMs?: number;
+  /** Served from the snapshot-keyed result cache (`bypassCache` skips the lookup). */
+  resultCache?: { hit: boolean; bytesHeld: number };
+  /** Set when run with the `sample` option: what each table's sampled scan read. */
+  sample?: { fraction: number; seed: number; tables: Record<string, TableSample> } | null;
+  /** Per table ref read with the `incremental` option: what the snapshot range covered. */
+  incremental?: Record<string, IncrementalScan>;
+  /** Computed from manifest stats without reading data (`metadataAnswers: false` disables it). */
+  metadataAnswer?: boolean;
+  engine?: SQLEngine;
+  /** Only with `profile: true`. */
+  profile?: QueryProfile;
+  /** `streaming` when the estimated input exceeded the memory ceiling. */
+  executionMode?: 'in-memory' | 'streaming';
+  estimatedInputBytes?: number | null;
+  memoryCeilingBytes?: number | null;
+  /** Per table ref: what was pushed into the Iceberg scan. */
+  pushdown?: Record<string, ScanPushdown>;
+  tableCache?: TableCacheReport;
+  /** Per table ref: where it came from and how long metadata and data took. */
+  tableLoads?: Record<string, TableLoad>;
+  /** Set when executed with `cursor: true`: `rows` is one page of the result. */
+  cursor?: string;
+  totalRows?: number;
+  baseRows?: number;
+  offset?: number;
+  sort?: SortKey[];
+  filter?: string | null;
+  /** Set when executed with `stream: true`: rows arrived as `sql:batch` notifications. */
+  streamed?: boolean;
+  batchCount?: number;
+  firstBatchMs?: number | null;
+}
+
+/** Payload of a `sql:batch` notification. `columns` is only sent with seq 0. */
+export interface SQLBatch {
+  requestId: string;
+  seq: number;
+  offset: number;
+  columns?: QueryColumn[];
+  rows?: Record<string, unknown>[];
+  data?: unknown[][];
+  rowCount: number;
+  resultFormat: ResultFormat;
+}
+
+export interface SortKey {
+  column: string;
+  descending?: boolean;
+}
+
+export interface ScanPushdown {
+  /** Columns read, or null for all of them. */
+  columns: string[] | null;
+  /** WHERE conjuncts used to prune files and row groups. */
+  filters: string[];
+}
+
+export interface QueryProfile {
+  phasesMs: Record<string, number>;
+  tables: Record<string, TableScanProfile>;
+  /** Record count of the data files read; null when Polars did the reading. */
+  rowsScanned: number | null;
+  /** Rows left after the pushed-down row filter; null when Polars did the reading. */
+  rowsLoaded: number | null;
+  rowsReturned: number;
+  bytesRead: number | null;
+  /** Optimized Polars plan (`LazyFrame.explain()`). */
+  plan: string | null;
+}
+
+export interface TableScanProfile {
+  engine: SQLEngine;
+  tableCacheHit?: boolean;
+  manifests?: number;
+  manifestsPruned?: number;
+  dataFiles?: number;
+  dataFilesPruned?: number;
+  dataFilesSampledOut?: number;
+  deleteFiles?: number;
+  bytesRead?: number;
+  rowsInFiles?: number;
+  rowsLoaded?: number;
+  bytesInMemory?: number;
+  totalFileBytes?: number;
+  totalRows?: number;
+}
+
+export interface TableSample {
+  requestedFraction: number;
+  /** Share of the planned rows actually read (sampling is per data file). */
+  fraction: number;
+  filesSampled: number;
+  filesTotal: number;
+  rowsSampled: number;
+  /** Rows the unsampled scan would read, from manifest record counts. */
+  estimatedTotalRows: number;
+}
+
+/** Rows appended after `fromSnapshotId` up to and including `toSnapshotId`. */
+export interface IncrementalScan {
+  fromSnapshotId: string;
+  toSnapshotId: string;
+  appendSnapshots: number;
+  /** Non-append snapshots in the range; their changes are not reflected. */
+  skipped: { snapshotId: string; operation: string | null }[];
+  addedFileBytes: number;
+}
+
+export interface TableLoad {
+  catalog: string;
+  metadataMs: number;
+  engine?: SQLEngine;
+  scanMs?: number;
+  rows?: number;
+}
+
+/** `cache_status` / `cache_clear` response. */
+export interface CacheStatus {
+  tableCache: {
+    entries: number;
+    bytesHeld: number;
+    budgetBytes: number;
+    hits: number;
+    misses: number;
+    /** Opt-in on-disk tier (settings `cache.diskCache`). */
+    disk: {
+      enabled: boolean;
+      directory: string;
+      files: number;
+      bytesOnDisk: number;
+      budgetBytes: number;
+      hits: number;
+    };
+  };
+  resultCache: { bytesHeld: number };
+  /** Loaded table metadata shared by the catalog, SQL and agent handlers. */
+  tableMetadata: { entries: number; hits: number; revalidated: number; loads: number; ttlSeconds: number };
+}
+
+export interface TableCacheReport {
+  /** Per table ref: served from the in-memory table cache or scanned. */
+  tables: Record<string, { hit: boolean; bytes?: number; cached?: boolean }>;
+  bytesHeld: number;
+}
+
+/** Column-major result: `data[i]` holds every value of `columns[i]`. */
+export interface ColumnarResult {
+  columns: QueryColumn[];
+  data: unknown[][];
+  rowCount: number;
 }
 
 export interface QueryColumn {
@@ -31,5 +188,9 @@ export interface QueryHistoryItem {
   timestamp: string;
   rowCount: number;
   executionTimeMs: number;
+  serializationTimeMs?: number;
+  cacheHit?: boolean;
+  metadataAnswer?: boolean;
+  profile?: QueryProfile | null;
   error: string | null;
 }